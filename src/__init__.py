@@ -86,11 +86,23 @@ def setup_plugin():
             app_state.update_config_value("last_date", today)
 
     _check_and_reset_daily_timer(app_state)
-    from .hooks import on_reviewer_did_start, on_state_did_change, on_theme_change
+    from .hooks import (
+        on_deck_browser_will_render_content,
+        on_profile_will_close,
+        on_reviewer_did_start,
+        on_state_did_change,
+        on_theme_change,
+        on_webview_will_set_content,
+    )
 
     gui_hooks.reviewer_did_show_question.append(on_reviewer_did_start)
     gui_hooks.state_did_change.append(on_state_did_change)
     gui_hooks.theme_did_change.append(on_theme_change)
+    gui_hooks.profile_will_close.append(on_profile_will_close)
+    gui_hooks.webview_will_set_content.append(on_webview_will_set_content)
+    gui_hooks.deck_browser_will_render_content.append(
+        on_deck_browser_will_render_content
+    )
     add_menu_item()
 
 
@@ -0,0 +1,27 @@
+from .ambient import AMBIENT_BREATHING, AMBIENT_LONG_BREAK, AmbientLayer, AmbientMixer
+from .decoder import CueDecoder
+from .engine import (
+    AudioEngine,
+    BufferCache,
+    Voice,
+    get_audio_engine,
+    set_ambient_active,
+    shutdown_audio_engine,
+)
+from .pcm import PcmBuffer, output_format
+
+__all__ = [
+    "AMBIENT_BREATHING",
+    "AMBIENT_LONG_BREAK",
+    "get_audio_engine",
+    "output_format",
+    "set_ambient_active",
+    "shutdown_audio_engine",
+    "AmbientLayer",
+    "AmbientMixer",
+    "AudioEngine",
+    "BufferCache",
+    "CueDecoder",
+    "PcmBuffer",
+    "Voice",
+]
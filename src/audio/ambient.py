@@ -0,0 +1,449 @@
+import dataclasses
+import math
+import wave
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+from aqt import QIODevice, QObject, Qt, QThread, QTimer, pyqtSignal, pyqtSlot
+from PyQt6.QtMultimedia import QAudioDevice, QAudioFormat, QAudioSink
+
+from ..config.enums import AmbientSound
+from . import synth
+
+try:
+    import numpy as np
+except ImportError:  # Anki 不自带 NumPy，此时没有背景音
+    np = None
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from ..config.types import AppConfig
+
+# 播放背景音的原因，任一原因有效时播放
+AMBIENT_BREATHING = "breathing"
+AMBIENT_LONG_BREAK = "long_break"
+
+CHUNK_FRAMES = 1024  # 每次混音的帧数
+RING_SECONDS = 0.25  # 环形缓冲区的容量（秒）
+FEED_INTERVAL_MS = 20
+FADE_SECONDS = 1.5  # 开始、停止和调整音量时的渐变时长
+
+# 布朗噪声: 泄漏积分的截止频率（避免直流漂移）和输出的均方根
+BROWN_CUTOFF_HZ = 20.0
+BROWN_RMS = 0.25
+
+# 雨声: 沙沙声加上随机的雨滴（雨滴为衰减的正弦波）
+RAIN_HISS_GAIN = 0.05
+RAIN_DROPS_PER_SECOND = 30.0
+RAIN_DROP_HZ = (1800.0, 2600.0, 3400.0, 4700.0)
+RAIN_DROP_SECONDS = 0.012
+RAIN_DROP_GAIN = 0.12
+
+
+@dataclasses.dataclass(frozen=True)
+class AmbientLayer:
+    """混音中的一层背景音"""
+
+    sound: AmbientSound
+    path: str = ""  # 自定义循环的 WAV 文件
+    gain: float = 1.0
+
+
+def ambient_layers(config: "AppConfig") -> tuple[AmbientLayer, ...]:
+    """按配置得到要播放的背景音，关闭或无法播放时为空"""
+    match config.ambient_sound:
+        case AmbientSound.OFF:
+            return ()
+        case AmbientSound.CUSTOM if not config.ambient_sound_path:
+            return ()
+    if np is None:
+        print("警告: 未安装 NumPy，无法播放背景音")
+        return ()
+    return (AmbientLayer(config.ambient_sound, config.ambient_sound_path),)
+
+
+# --- 声源 ---
+# 每个声源是一个无限生成器，按块产生输出采样率下的单声道浮点信号
+
+
+def _brown_noise(rate: int) -> Iterator["NDArray"]:
+    """
+    布朗噪声: y[n] = leak * y[n-1] + w[n]。
+    把递推展开为 leak^n * (y0 + Σ w[k] / leak^k)，整块向量化计算。
+    """
+    assert np is not None
+    rng = np.random.default_rng()
+    leak = math.exp(-2 * math.pi * BROWN_CUTOFF_HZ / rate)
+    powers = leak ** np.arange(1, CHUNK_FRAMES + 1)
+    scale = BROWN_RMS * math.sqrt(1 - leak * leak)
+    state = 0.0
+    while True:
+        white = rng.standard_normal(CHUNK_FRAMES)
+        brown = powers * (state + np.cumsum(white / powers))
+        state = brown[-1]
+        yield brown * scale
+
+
+def _rain(rate: int) -> Iterator["NDArray"]:
+    """雨声: 高通的白噪声加上随机出现的雨滴，雨滴的尾音延续到下一块"""
+    assert np is not None
+    rng = np.random.default_rng()
+    t = np.arange(max(1, round(RAIN_DROP_SECONDS * rate))) / rate
+    decay = np.exp(-t / (RAIN_DROP_SECONDS / 4))
+    drops = [decay * np.sin(2 * np.pi * hz * t) for hz in RAIN_DROP_HZ]
+    drop_frames = len(t)
+    drops_per_chunk = RAIN_DROPS_PER_SECOND * CHUNK_FRAMES / rate
+
+    previous = 0.0
+    tail = np.zeros(drop_frames)
+    while True:
+        white = rng.standard_normal(CHUNK_FRAMES)
+        hiss = np.diff(white, prepend=previous)
+        previous = white[-1]
+
+        mixed = np.zeros(CHUNK_FRAMES + drop_frames)
+        mixed[:drop_frames] += tail
+        for __ in range(rng.poisson(drops_per_chunk)):
+            start = rng.integers(CHUNK_FRAMES)
+            drop = drops[rng.integers(len(drops))]
+            mixed[start : start + drop_frames] += rng.uniform(0.3, 1.0) * drop
+        tail = mixed[CHUNK_FRAMES:].copy()
+        yield hiss * RAIN_HISS_GAIN + mixed[:CHUNK_FRAMES] * RAIN_DROP_GAIN
+
+
+def _decode_wav_frames(data: bytes, width: int, channels: int) -> "NDArray":
+    """把 WAV 的整数 PCM 转换为单声道浮点信号"""
+    assert np is not None
+    match width:
+        case 1:
+            samples = (np.frombuffer(data, np.uint8) - 128.0) / 128.0
+        case 2:
+            samples = np.frombuffer(data, "<i2") / 32768.0
+        case 3:
+            raw = np.frombuffer(data, np.uint8).reshape(-1, 3).astype(np.int32)
+            # 最高字节按有符号数解释
+            high = raw[:, 2] - ((raw[:, 2] & 0x80) << 1)
+            samples = (raw[:, 0] | (raw[:, 1] << 8) | (high << 16)) / 8388608.0
+        case 4:
+            samples = np.frombuffer(data, "<i4") / 2147483648.0
+        case _:
+            raise ValueError(f"不支持的采样位数: {width * 8}")
+    return samples.reshape(-1, channels).mean(axis=1)
+
+
+def _wav_loop(path: str, rate: int) -> Iterator["NDArray"]:
+    """按块读取 WAV 文件并无缝循环，内存占用与文件长度无关"""
+    with wave.open(path, "rb") as wav:
+        if wav.getnframes() == 0:
+            raise ValueError(f"音频文件为空: {path}")
+        width = wav.getsampwidth()
+        channels = wav.getnchannels()
+
+        def chunks() -> Iterator["NDArray"]:
+            while True:
+                data = wav.readframes(CHUNK_FRAMES)
+                if not data:
+                    # 读到末尾后回到开头，下一块紧接在最后一块之后
+                    wav.rewind()
+                    continue
+                yield _decode_wav_frames(data, width, channels)
+
+        yield from _resample(chunks(), wav.getframerate(), rate)
+
+
+def _resample(
+    chunks: Iterator["NDArray"], source_rate: int, rate: int
+) -> Iterator["NDArray"]:
+    """把任意长度的块线性插值为输出采样率下 CHUNK_FRAMES 帧的块"""
+    assert np is not None
+    step = source_rate / rate
+    offsets = step * np.arange(CHUNK_FRAMES)
+    pending = np.zeros(0)
+    position = 0.0  # 下一个输出帧在 pending 中的位置
+    for chunk in chunks:
+        pending = np.concatenate((pending, chunk))
+        while position + offsets[-1] < len(pending) - 1:
+            yield np.interp(position + offsets, np.arange(len(pending)), pending)
+            position += step * CHUNK_FRAMES
+        consumed = int(position)
+        pending = pending[consumed:]
+        position -= consumed
+
+
+def _open_source(layer: AmbientLayer, rate: int) -> Iterator["NDArray"]:
+    match layer.sound:
+        case AmbientSound.BROWN_NOISE:
+            return _brown_noise(rate)
+        case AmbientSound.RAIN:
+            return _rain(rate)
+        case _:
+            return _wav_loop(layer.path, rate)
+
+
+# --- 混音 ---
+
+
+class PcmRing:
+    """
+    固定容量的字节环形缓冲区。
+    读取时返回底层数组的 memoryview 切片，写入音频设备时不复制。
+    """
+
+    def __init__(self, capacity: int):
+        assert np is not None
+        self._data = np.zeros(capacity, np.uint8)
+        self._view = memoryview(self._data)
+        self._read = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    @property
+    def readable(self) -> int:
+        return self._size
+
+    @property
+    def free(self) -> int:
+        return self.capacity - self._size
+
+    def write(self, data: "NDArray") -> int:
+        """写入字节数组，返回写入的字节数（空间不足时截断）"""
+        count = min(len(data), self.free)
+        start = (self._read + self._size) % self.capacity
+        first = min(count, self.capacity - start)
+        self._data[start : start + first] = data[:first]
+        self._data[: count - first] = data[first:count]
+        self._size += count
+        return count
+
+    def peek(self, max_bytes: int) -> memoryview:
+        """从读位置开始的一段连续数据（到缓冲区末尾为止）"""
+        count = min(self._size, self.capacity - self._read, max_bytes)
+        return self._view[self._read : self._read + count]
+
+    def consume(self, count: int) -> None:
+        count = min(count, self._size)
+        self._read = (self._read + count) % self.capacity
+        self._size -= count
+
+    def clear(self) -> None:
+        self._read = 0
+        self._size = 0
+
+
+class _MixerWorker(QObject):
+    """在工作线程中混音并向 QAudioSink 推送数据"""
+
+    def __init__(self):
+        super().__init__()
+        self._device = QAudioDevice()
+        self._format = QAudioFormat()
+        self._layers: tuple[AmbientLayer, ...] = ()
+        self._sources: list[tuple[AmbientLayer, Iterator[NDArray]]] = []
+        self._sink: QAudioSink | None = None
+        self._output: QIODevice | None = None
+        self._ring: PcmRing | None = None
+        self._chunk_bytes = 0
+        self._feed_timer: QTimer | None = None
+        # 当前增益和目标增益，每块按 FADE_SECONDS 的速度逼近目标
+        self._gain = 0.0
+        self._target_gain = 0.0
+
+    @pyqtSlot(object, object, object, float)
+    def play(
+        self,
+        device: QAudioDevice,
+        audio_format: QAudioFormat,
+        layers: tuple[AmbientLayer, ...],
+        volume: float,
+    ) -> None:
+        self._target_gain = volume
+        output_changed = device.id() != self._device.id() or (
+            audio_format != self._format
+        )
+        if output_changed or self._sink is None:
+            self._open_output(device, audio_format)
+        if output_changed or layers != self._layers:
+            self._layers = layers
+            rate = audio_format.sampleRate()
+            self._sources = [(layer, _open_source(layer, rate)) for layer in layers]
+
+    @pyqtSlot()
+    def fade_out(self) -> None:
+        self._target_gain = 0.0
+
+    @pyqtSlot()
+    def close(self) -> None:
+        self._close_output()
+        self._sources = []
+        self._layers = ()
+
+    def _open_output(self, device: QAudioDevice, audio_format: QAudioFormat) -> None:
+        # 音频设备和计时器必须在工作线程中创建
+        self._close_output()
+        self._device = device
+        self._format = audio_format
+        self._chunk_bytes = CHUNK_FRAMES * audio_format.bytesPerFrame()
+        chunks = max(
+            2, math.ceil(RING_SECONDS * audio_format.sampleRate() / CHUNK_FRAMES)
+        )
+        self._ring = PcmRing(chunks * self._chunk_bytes)
+        self._sink = QAudioSink(device, audio_format, self)
+        self._output = self._sink.start()
+        if self._feed_timer is None:
+            self._feed_timer = QTimer(self)
+            self._feed_timer.setTimerType(Qt.TimerType.PreciseTimer)
+            self._feed_timer.setInterval(FEED_INTERVAL_MS)
+            self._feed_timer.timeout.connect(self._feed)
+        self._feed_timer.start()
+        self._feed()
+
+    def _close_output(self) -> None:
+        if self._feed_timer is not None:
+            self._feed_timer.stop()
+        if self._sink is not None:
+            self._sink.stop()
+            self._sink.deleteLater()
+        self._sink = None
+        self._output = None
+        self._ring = None
+        self._gain = 0.0
+
+    def _feed(self) -> None:
+        """补满环形缓冲区，再把设备能接收的部分写入设备"""
+        if self._sink is None or self._output is None or self._ring is None:
+            return
+        fading_out = self._gain == 0.0 and self._target_gain == 0.0
+        if not fading_out:
+            while self._ring.free >= self._chunk_bytes:
+                self._ring.write(self._mix_chunk())
+
+        free = self._sink.bytesFree()
+        while free > 0:
+            view = self._ring.peek(free)
+            if not view:
+                break
+            written = self._output.write(view)
+            if written <= 0:
+                break
+            self._ring.consume(written)
+            free -= written
+
+        if fading_out and self._ring.readable == 0:
+            # 渐弱完成并且缓冲区已播完，释放音频设备
+            self._close_output()
+
+    def _mix_chunk(self) -> "NDArray":
+        assert np is not None
+        mixed = np.zeros(CHUNK_FRAMES)
+        for layer, source in list(self._sources):
+            try:
+                mixed += next(source) * layer.gain
+            except (OSError, EOFError, ValueError, wave.Error) as e:
+                print(f"警告: 无法播放背景音 {layer.path or layer.sound.value}: {e}")
+                self._sources.remove((layer, source))
+
+        step = CHUNK_FRAMES / (FADE_SECONDS * self._format.sampleRate())
+        if self._gain < self._target_gain:
+            gain = min(self._gain + step, self._target_gain)
+        else:
+            gain = max(self._gain - step, self._target_gain)
+        mixed *= np.linspace(self._gain, gain, CHUNK_FRAMES, endpoint=False)
+        self._gain = gain
+        samples = synth.encode(np.clip(mixed, -1.0, 1.0), self._format)
+        return samples.reshape(-1).view(np.uint8)
+
+
+class AmbientMixer(QObject):
+    """
+    背景音混音器，在长休息和呼吸训练时播放布朗噪声、雨声或自定义循环。
+
+    声源按块生成，在工作线程中混音后写入固定容量的环形缓冲区，
+    再以 memoryview 切片推送给 QAudioSink。内存占用与循环文件的长度无关，
+    主线程只发送信号，不会因音频而阻塞。
+    """
+
+    _play = pyqtSignal(object, object, object, float)
+    _fade_out = pyqtSignal()
+    _close = pyqtSignal()
+
+    def __init__(
+        self, device: QAudioDevice, audio_format: QAudioFormat, parent: QObject
+    ):
+        super().__init__(parent)
+        self._device = device
+        self._format = audio_format
+        self._reasons: set[str] = set()
+        self._layers: tuple[AmbientLayer, ...] = ()
+        self._volume = 0.0
+        self._playing = False
+
+        self._thread = QThread(self)
+        self._thread.setObjectName("pomodoro-ambient-mixer")
+        self._worker = _MixerWorker()
+        self._worker.moveToThread(self._thread)
+        self._thread.finished.connect(self._worker.deleteLater)
+        self._play.connect(self._worker.play)
+        self._fade_out.connect(self._worker.fade_out)
+        self._close.connect(self._worker.close)
+        self._thread.start()
+
+        # 同一轮事件循环中的停止和开始合并处理，
+        # 呼吸训练结束后直接进入长休息时背景音不会中断
+        self._sync_timer = QTimer(self)
+        self._sync_timer.setSingleShot(True)
+        self._sync_timer.setInterval(0)
+        self._sync_timer.timeout.connect(self._sync)
+
+    @property
+    def is_playing(self) -> bool:
+        return self._playing
+
+    def set_active(
+        self,
+        reason: str,
+        layers: tuple[AmbientLayer, ...] = (),
+        volume: float = 1.0,
+    ) -> None:
+        """
+        开始或停止一个原因的背景音，任一原因有效时播放。
+
+        Args:
+            reason: 播放原因，如 AMBIENT_BREATHING
+            layers: 要播放的背景音，为空表示这个原因不再需要背景音
+            volume: 音量（0 到 1）
+        """
+        if layers:
+            self._reasons.add(reason)
+            self._layers = layers
+            self._volume = volume
+        else:
+            self._reasons.discard(reason)
+        self._sync_timer.start()
+
+    def set_output(self, device: QAudioDevice, audio_format: QAudioFormat) -> None:
+        """切换输出设备，正在播放时在新设备上继续"""
+        self._device = device
+        self._format = audio_format
+        if self._playing:
+            self._sync()
+
+    def _sync(self) -> None:
+        if self._reasons:
+            self._play.emit(self._device, self._format, self._layers, self._volume)
+            self._playing = True
+        elif self._playing:
+            self._fade_out.emit()
+            self._playing = False
+
+    def shutdown(self) -> None:
+        """停止播放并结束工作线程"""
+        self._sync_timer.stop()
+        self._reasons.clear()
+        self._playing = False
+        self._close.emit()
+        self._thread.quit()
+        self._thread.wait()
@@ -0,0 +1,108 @@
+from collections import deque
+
+from aqt import QObject, QThread, QUrl, pyqtSignal, pyqtSlot
+from PyQt6.QtMultimedia import QAudioDecoder, QAudioFormat
+
+from .pcm import PcmBuffer
+
+
+class _DecodeWorker(QObject):
+    """在工作线程中依次解码音频文件"""
+
+    decoded = pyqtSignal(QUrl, object)  # 地址, PcmBuffer
+    failed = pyqtSignal(QUrl, str)  # 地址, 错误信息
+
+    def __init__(self):
+        super().__init__()
+        self._queue: deque[tuple[QUrl, QAudioFormat]] = deque()
+        self._decoder: QAudioDecoder | None = None
+        self._current: QUrl | None = None
+        self._format = QAudioFormat()
+        self._chunks: list[bytes] = []
+
+    @pyqtSlot(QUrl, QAudioFormat)
+    def enqueue(self, url: QUrl, audio_format: QAudioFormat) -> None:
+        self._queue.append((url, audio_format))
+        if self._current is None:
+            self._start_next()
+
+    def _ensure_decoder(self) -> QAudioDecoder:
+        # 解码器必须在工作线程中创建
+        if self._decoder is None:
+            self._decoder = QAudioDecoder(self)
+            self._decoder.bufferReady.connect(self._on_buffer_ready)
+            self._decoder.finished.connect(self._on_finished)
+            self._decoder.error.connect(self._on_error)
+        return self._decoder
+
+    def _start_next(self) -> None:
+        if not self._queue:
+            self._current = None
+            return
+        self._current, self._format = self._queue.popleft()
+        self._chunks = []
+        decoder = self._ensure_decoder()
+        decoder.setAudioFormat(self._format)
+        decoder.setSource(self._current)
+        decoder.start()
+
+    def _on_buffer_ready(self) -> None:
+        assert self._decoder is not None
+        while self._decoder.bufferAvailable():
+            buffer = self._decoder.read()
+            if buffer.isValid():
+                self._chunks.append(buffer.constData().asstring(buffer.byteCount()))
+
+    def _on_finished(self) -> None:
+        if self._current is not None:
+            self._on_buffer_ready()
+            self.decoded.emit(
+                self._current,
+                PcmBuffer(
+                    data=b"".join(self._chunks),
+                    sample_rate=self._format.sampleRate(),
+                    channels=self._format.channelCount(),
+                    sample_format=self._format.sampleFormat(),
+                ),
+            )
+        self._start_next()
+
+    def _on_error(self, error: QAudioDecoder.Error) -> None:
+        assert self._decoder is not None
+        if self._current is not None:
+            self.failed.emit(self._current, self._decoder.errorString())
+        self._decoder.stop()
+        self._start_next()
+
+
+class CueDecoder(QObject):
+    """
+    把提示音解码为 PCM。
+    解码在独立的工作线程中进行，结果通过信号回到创建者所在的线程。
+    """
+
+    decoded = pyqtSignal(QUrl, object)  # 地址, PcmBuffer
+    failed = pyqtSignal(QUrl, str)  # 地址, 错误信息
+    _enqueue = pyqtSignal(QUrl, QAudioFormat)
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self._thread = QThread(self)
+        self._thread.setObjectName("pomodoro-audio-decoder")
+        self._worker = _DecodeWorker()
+        self._worker.moveToThread(self._thread)
+        self._thread.finished.connect(self._worker.deleteLater)
+
+        self._enqueue.connect(self._worker.enqueue)
+        self._worker.decoded.connect(self.decoded)
+        self._worker.failed.connect(self.failed)
+        self._thread.start()
+
+    def decode(self, url: QUrl, audio_format: QAudioFormat) -> None:
+        """把一个文件加入解码队列"""
+        self._enqueue.emit(url, audio_format)
+
+    def shutdown(self) -> None:
+        """停止工作线程"""
+        self._thread.quit()
+        self._thread.wait()
@@ -0,0 +1,512 @@
+import time
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from aqt import QApplication, QBuffer, QIODevice, QObject, QTimer, QUrl
+from PyQt6.QtMultimedia import (
+    QAudio,
+    QAudioDevice,
+    QAudioFormat,
+    QAudioOutput,
+    QAudioSink,
+    QMediaDevices,
+    QMediaPlayer,
+)
+
+from ..breathing_easing import EasingTable
+from ..config.enums import BreathingEasing, BreathingPhase
+from . import synth
+from .ambient import AmbientLayer, AmbientMixer, ambient_layers
+from .decoder import CueDecoder
+from .pcm import PcmBuffer, output_format
+
+if TYPE_CHECKING:
+    from ..config.types import AppConfig
+
+# 缓存中合成提示音的键前缀，其余的键是音频文件的地址
+SYNTH_KEY_PREFIX = "synth:"
+
+
+class BufferCache:
+    """按总字节数限制大小的 LRU 缓存，保存已解码的音频"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, PcmBuffer] = OrderedDict()
+        self._nbytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def cached_keys(self) -> list[str]:
+        return list(self._entries)
+
+    def get(self, key: str) -> PcmBuffer | None:
+        pcm = self._entries.get(key)
+        if pcm is not None:
+            self._entries.move_to_end(key)
+        return pcm
+
+    def put(self, key: str, pcm: PcmBuffer) -> None:
+        """加入缓存，超出上限时淘汰最久未使用的音频（单个过大的音频不缓存）"""
+        if pcm.nbytes > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._nbytes -= old.nbytes
+        self._entries[key] = pcm
+        self._nbytes += pcm.nbytes
+        while self._nbytes > self.max_bytes:
+            __, evicted = self._entries.popitem(last=False)
+            self._nbytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._nbytes = 0
+
+
+class QObjectABCMeta(ABCMeta, type(QObject)):
+    pass
+
+
+class Voice(QObject, metaclass=QObjectABCMeta):
+    """
+    一路正在播放的声音。
+    音量可以按幅度曲线变化（只用于合成的提示音），并记录从计划开始到真正发声的延迟。
+    """
+
+    # 幅度为 0 时的音量，避免提示音完全听不见
+    MIN_ENVELOPE_VOLUME = 0.4
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self.started_at = 0.0
+        self._envelope: EasingTable | None = None
+        self._envelope_duration = 0.0
+        self._pending_onset = False
+        # 本次播放的开始延迟（毫秒），尚未发声时为 None
+        self.onset_latency_ms: float | None = None
+        # 最近一次设置的音量
+        self.volume = 1.0
+
+    def _begin(
+        self, envelope: EasingTable | None, started_at: float | None, duration: float
+    ) -> None:
+        self.started_at = time.monotonic() if started_at is None else started_at
+        self._envelope = envelope
+        self._envelope_duration = duration
+        self._pending_onset = True
+        self.onset_latency_ms = None
+        self.apply_envelope(time.monotonic())
+
+    def _record_onset(self) -> None:
+        if self._pending_onset:
+            self._pending_onset = False
+            self.onset_latency_ms = (time.monotonic() - self.started_at) * 1000
+
+    @property
+    def has_moving_envelope(self) -> bool:
+        return (
+            self._envelope is not None
+            and not self._envelope.is_constant
+            and self._envelope_duration > 0
+        )
+
+    def apply_envelope(self, now: float) -> bool:
+        """按幅度曲线设置音量，返回包络是否还在变化"""
+        if self._envelope is None:
+            self.volume = 1.0
+            self._set_volume(self.volume)
+            return False
+        if self._envelope_duration > 0:
+            t = (now - self.started_at) / self._envelope_duration
+        else:
+            t = 1.0
+        level = self._envelope.at(t)
+        self.volume = (
+            self.MIN_ENVELOPE_VOLUME + (1.0 - self.MIN_ENVELOPE_VOLUME) * level
+        )
+        self._set_volume(self.volume)
+        return t < 1.0 and self.has_moving_envelope
+
+    @property
+    @abstractmethod
+    def is_active(self) -> bool:
+        """是否正在播放"""
+
+    @abstractmethod
+    def _set_volume(self, volume: float) -> None:
+        """设置输出音量"""
+
+    def stop(self) -> None:
+        self._envelope = None
+        self._pending_onset = False
+
+
+class SinkVoice(Voice):
+    """通过 QAudioSink 播放内存中的 PCM，没有打开和解码文件的延迟"""
+
+    def __init__(
+        self, device: QAudioDevice, audio_format: QAudioFormat, parent: QObject
+    ):
+        super().__init__(parent)
+        self._sink = self._create_sink(device, audio_format)
+        self._source = QBuffer(self)
+
+    def _create_sink(
+        self, device: QAudioDevice, audio_format: QAudioFormat
+    ) -> QAudioSink:
+        sink = QAudioSink(device, audio_format, self)
+        sink.stateChanged.connect(self._on_state_changed)
+        return sink
+
+    def set_output(self, device: QAudioDevice, audio_format: QAudioFormat) -> None:
+        """
+        在新的输出设备上重建 QAudioSink。正在播放的声音停止，
+        声部对象本身保持有效，调用方持有的引用可以继续使用。
+        """
+        self.stop()
+        self._sink.stateChanged.disconnect(self._on_state_changed)
+        self._sink.deleteLater()
+        self._sink = self._create_sink(device, audio_format)
+
+    def play(
+        self,
+        pcm: PcmBuffer,
+        envelope: EasingTable | None = None,
+        started_at: float | None = None,
+        duration: float = 0.0,
+    ) -> None:
+        self._sink.stop()
+        self._source.close()
+        self._source.setData(pcm.data)
+        self._source.open(QIODevice.OpenModeFlag.ReadOnly)
+        self._begin(envelope, started_at, duration)
+        self._sink.start(self._source)
+
+    def _on_state_changed(self, state: QAudio.State) -> None:
+        if state == QAudio.State.ActiveState:
+            self._record_onset()
+
+    @property
+    def is_active(self) -> bool:
+        return self._sink.state() == QAudio.State.ActiveState
+
+    def _set_volume(self, volume: float) -> None:
+        self._sink.setVolume(volume)
+
+    def stop(self) -> None:
+        super().stop()
+        self._sink.stop()
+
+
+class PlayerVoice(Voice):
+    """尚未解码的音频通过 QMediaPlayer 播放"""
+
+    def __init__(self, device: QAudioDevice, parent: QObject):
+        super().__init__(parent)
+        self._output = QAudioOutput(device, self)
+        self._player = QMediaPlayer(self)
+        self._player.setAudioOutput(self._output)
+        self._player.positionChanged.connect(self._on_position_changed)
+
+    def set_device(self, device: QAudioDevice) -> None:
+        self._output.setDevice(device)
+
+    def play(self, url: QUrl, started_at: float | None = None) -> None:
+        self._begin(None, started_at, 0.0)
+        self._player.setSource(url)
+        self._player.play()
+
+    def _on_position_changed(self, position: int) -> None:
+        if position > 0:
+            self._record_onset()
+
+    @property
+    def is_active(self) -> bool:
+        return self._player.playbackState() == QMediaPlayer.PlaybackState.PlayingState
+
+    def _set_volume(self, volume: float) -> None:
+        self._output.setVolume(volume)
+
+    def stop(self) -> None:
+        super().stop()
+        self._player.stop()
+
+
+class AudioEngine(QObject):
+    """
+    进程内共享的音频引擎，呼吸提示音和番茄钟的声音都通过它播放。
+
+    - 音频在工作线程中解码，已解码的音频保存在按字节数限制的 LRU 缓存中
+    - 少量 QAudioSink 组成的声部池，在首次播放时创建并一直复用
+    - 默认输出设备改变时重建声部，格式不同时重新解码缓存中的音频
+    - 背景音由独立的混音器在工作线程中播放，见 AmbientMixer
+    """
+
+    VOICES = 4
+    MAX_CACHE_BYTES = 16 * 1024 * 1024
+    # 音量包络的更新间隔（毫秒）
+    ENVELOPE_INTERVAL_MS = 50
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self._cache = BufferCache(self.MAX_CACHE_BYTES)
+        self._pending: dict[str, QUrl] = {}
+        self._decoder: CueDecoder | None = None
+
+        self._device = QMediaDevices.defaultAudioOutput()
+        self._format = output_format(self._device)
+        self._voices: list[SinkVoice] = []
+        self._player_voice: PlayerVoice | None = None
+        self._ambient: AmbientMixer | None = None
+
+        self._envelope_timer = QTimer(self)
+        self._envelope_timer.setInterval(self.ENVELOPE_INTERVAL_MS)
+        self._envelope_timer.timeout.connect(self._apply_envelopes)
+
+        self._media_devices = QMediaDevices(self)
+        self._media_devices.audioOutputsChanged.connect(self._on_outputs_changed)
+
+    @property
+    def audio_format(self) -> QAudioFormat:
+        """当前输出设备使用的格式，播放的 PCM 必须与之一致"""
+        return self._format
+
+    @property
+    def cache(self) -> BufferCache:
+        return self._cache
+
+    # --- 解码 ---
+
+    def preload(self, urls: Iterable[QUrl]) -> None:
+        """在后台把音频解码进缓存"""
+        for url in urls:
+            key = url.toString()
+            if key in self._cache or key in self._pending:
+                continue
+            self._pending[key] = url
+            self._ensure_decoder().decode(url, self._format)
+
+    def _ensure_decoder(self) -> CueDecoder:
+        if self._decoder is None:
+            self._decoder = CueDecoder(self)
+            self._decoder.decoded.connect(self._on_decoded)
+            self._decoder.failed.connect(self._on_decode_failed)
+        return self._decoder
+
+    def _on_decoded(self, url: QUrl, pcm: PcmBuffer) -> None:
+        key = url.toString()
+        self._pending.pop(key, None)
+        if pcm.audio_format() != self._format:
+            # 解码期间输出设备改变了
+            self.preload((url,))
+            return
+        self._cache.put(key, pcm)
+
+    def _on_decode_failed(self, url: QUrl, error: str) -> None:
+        self._pending.pop(url.toString(), None)
+        print(f"警告: 无法解码音频 {url.toLocalFile()}: {error}")
+
+    # --- 合成 ---
+
+    def synthesized_cue(
+        self, phase: BreathingPhase, duration: float, easing: BreathingEasing
+    ) -> PcmBuffer | None:
+        """
+        获取（必要时合成）一个阶段的提示音，按 (阶段, 时长, 曲线) 缓存。
+        无法合成（没有 NumPy）时返回 None。
+        """
+        # 时长按毫秒取整，频率渐变中的浮点误差不会产生不同的缓存项
+        key = f"{SYNTH_KEY_PREFIX}{phase.value}:{round(duration * 1000)}:{easing.value}"
+        pcm = self._cache.get(key)
+        if pcm is None:
+            if not synth.is_available():
+                return None
+            pcm = synth.synthesize_cue(phase, duration, easing, self._format)
+            self._cache.put(key, pcm)
+        return pcm
+
+    # --- 播放 ---
+
+    def play(self, url: QUrl, started_at: float | None = None) -> Voice:
+        """
+        以原始音量播放音频文件（如录制的语音提示）。已解码的音频立即通过声部池播放，
+        否则先用 QMediaPlayer 播放，同时在后台解码以便下次使用。
+
+        Args:
+            started_at: 计划开始时间（time.monotonic()），默认为现在；用于测量开始延迟
+        """
+        pcm = self._cache.get(url.toString())
+        if pcm is not None:
+            return self.play_buffer(pcm, started_at=started_at)
+
+        self.preload((url,))
+        if self._player_voice is None:
+            self._player_voice = PlayerVoice(self._device, self)
+        self._player_voice.play(url, started_at)
+        return self._player_voice
+
+    def play_buffer(
+        self,
+        pcm: PcmBuffer,
+        envelope: EasingTable | None = None,
+        started_at: float | None = None,
+        duration: float = 0.0,
+    ) -> Voice:
+        """
+        播放内存中的 PCM（格式需与 audio_format 一致）。
+
+        Args:
+            envelope: 按该幅度曲线调整音量，用于合成的提示音
+            started_at: 计划开始时间（time.monotonic()），默认为现在；
+                同时是音量包络的起点和测量开始延迟的基准
+            duration: 包络的时长（秒）
+        """
+        voice = self._acquire_voice()
+        voice.play(pcm, envelope, started_at, duration)
+        self._start_envelopes(voice)
+        return voice
+
+    def play_file(self, file_path: str) -> Voice | None:
+        """播放音频文件，用于一次性的提示音"""
+        if not file_path:
+            return None
+        return self.play(QUrl.fromLocalFile(file_path))
+
+    def prepare_voice(self) -> None:
+        """预先创建一个声部，第一次播放时不必再创建 QAudioSink"""
+        if not self._voices:
+            self._voices.append(SinkVoice(self._device, self._format, self))
+
+    def _acquire_voice(self) -> SinkVoice:
+        """取一个空闲的声部，都在播放时复用最早开始的那个"""
+        for voice in self._voices:
+            if not voice.is_active:
+                return voice
+        if len(self._voices) < self.VOICES:
+            voice = SinkVoice(self._device, self._format, self)
+            self._voices.append(voice)
+            return voice
+        return min(self._voices, key=lambda v: v.started_at)
+
+    def _start_envelopes(self, voice: Voice) -> None:
+        if voice.has_moving_envelope and not self._envelope_timer.isActive():
+            self._envelope_timer.start()
+
+    def _apply_envelopes(self) -> None:
+        now = time.monotonic()
+        voices: list[Voice] = [*self._voices]
+        if self._player_voice is not None:
+            voices.append(self._player_voice)
+        moving = [voice.apply_envelope(now) for voice in voices]
+        if not any(moving):
+            self._envelope_timer.stop()
+
+    def stop_all(self) -> None:
+        """停止所有提示音（背景音不受影响）"""
+        for voice in self._voices:
+            voice.stop()
+        if self._player_voice is not None:
+            self._player_voice.stop()
+        self._envelope_timer.stop()
+
+    # --- 背景音 ---
+
+    def set_ambient(
+        self, reason: str, layers: tuple[AmbientLayer, ...], volume: float
+    ) -> None:
+        """开始或停止一个原因的背景音，参数见 AmbientMixer.set_active()"""
+        if not layers and self._ambient is None:
+            return
+        if self._ambient is None:
+            self._ambient = AmbientMixer(self._device, self._format, self)
+        self._ambient.set_active(reason, layers, volume)
+
+    # --- 设备 ---
+
+    def _on_outputs_changed(self) -> None:
+        """默认输出设备改变（插拔耳机等）时切换到新设备"""
+        device = QMediaDevices.defaultAudioOutput()
+        if device.id() != self._device.id():
+            self.set_output_device(device)
+
+    def set_output_device(self, device: QAudioDevice) -> None:
+        """
+        切换输出设备。声部在原对象内重建 QAudioSink，
+        训练中持有的提示音声部不会失效。
+        """
+        self._device = device
+        audio_format = output_format(device)
+        for voice in self._voices:
+            voice.set_output(device, audio_format)
+        if self._player_voice is not None:
+            self._player_voice.set_device(device)
+
+        if self._ambient is not None:
+            self._ambient.set_output(device, audio_format)
+        if audio_format != self._format:
+            self._format = audio_format
+            # 合成的提示音在下次使用时按新格式重新生成
+            cached = [
+                QUrl(key)
+                for key in self._cache.cached_keys()
+                if not key.startswith(SYNTH_KEY_PREFIX)
+            ]
+            self._cache.clear()
+            self.preload(cached)
+
+    def shutdown(self) -> None:
+        """停止播放并结束解码和混音线程"""
+        self.stop_all()
+        if self._ambient is not None:
+            self._ambient.shutdown()
+            self._ambient = None
+        if self._decoder is not None:
+            self._decoder.shutdown()
+            self._decoder = None
+        self._pending.clear()
+
+
+_audio_engine_instance: AudioEngine | None = None
+
+
+def get_audio_engine() -> AudioEngine:
+    """获取音频引擎的单例实例（在首次使用时创建）"""
+    global _audio_engine_instance
+    if _audio_engine_instance is None:
+        app = QApplication.instance()
+        assert isinstance(app, QApplication)
+        _audio_engine_instance = AudioEngine(app)
+        # 没有经过 profile_will_close 直接退出时也要结束解码线程
+        app.aboutToQuit.connect(shutdown_audio_engine)
+    return _audio_engine_instance
+
+
+def set_ambient_active(reason: str, active: bool, config: "AppConfig") -> None:
+    """
+    按配置开始或停止一个原因的背景音（原因见 audio/ambient.py）。
+    没有背景音且引擎尚未创建时不会创建引擎。
+    """
+    layers = ambient_layers(config) if active else ()
+    if not layers and _audio_engine_instance is None:
+        return
+    get_audio_engine().set_ambient(reason, layers, config.ambient_volume / 100)
+
+
+def shutdown_audio_engine() -> None:
+    """释放音频设备并结束解码线程（引擎未创建时不做任何事）"""
+    global _audio_engine_instance
+    if _audio_engine_instance is not None:
+        _audio_engine_instance.shutdown()
+        _audio_engine_instance.deleteLater()
+        _audio_engine_instance = None
@@ -0,0 +1,47 @@
+import dataclasses
+
+from PyQt6.QtMultimedia import QAudioDevice, QAudioFormat, QMediaDevices
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class PcmBuffer:
+    """已解码的 PCM 音频，可以直接写入 QAudioSink"""
+
+    data: bytes
+    sample_rate: int
+    channels: int
+    sample_format: QAudioFormat.SampleFormat
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data)
+
+    def audio_format(self) -> QAudioFormat:
+        audio_format = QAudioFormat()
+        audio_format.setSampleRate(self.sample_rate)
+        audio_format.setChannelCount(self.channels)
+        audio_format.setSampleFormat(self.sample_format)
+        return audio_format
+
+    @property
+    def duration(self) -> float:
+        """时长（秒）"""
+        bytes_per_frame = self.audio_format().bytesPerFrame()
+        if bytes_per_frame <= 0 or self.sample_rate <= 0:
+            return 0.0
+        return len(self.data) / bytes_per_frame / self.sample_rate
+
+
+def output_format(device: QAudioDevice | None = None) -> QAudioFormat:
+    """
+    获取输出设备的播放格式。
+    使用设备的首选采样率和声道数，设备支持时采用 16 位整数采样，便于混音。
+    """
+    if device is None:
+        device = QMediaDevices.defaultAudioOutput()
+    audio_format = device.preferredFormat()
+    int16_format = QAudioFormat(audio_format)
+    int16_format.setSampleFormat(QAudioFormat.SampleFormat.Int16)
+    if device.isFormatSupported(int16_format):
+        return int16_format
+    return audio_format
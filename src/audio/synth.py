@@ -0,0 +1,123 @@
+from typing import TYPE_CHECKING
+
+from PyQt6.QtMultimedia import QAudioFormat
+
+from ..breathing_easing import phase_envelope
+from ..config.enums import BreathingEasing, BreathingPhase
+from .pcm import PcmBuffer
+
+try:
+    import numpy as np
+except ImportError:  # Anki 不自带 NumPy，此时无法合成提示音
+    np = None
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+# 吸气时音高从低到高，呼气时从高到低（Hz）
+SWEEP_LOW_HZ = 196.0
+SWEEP_HIGH_HZ = 392.0
+SWEEP_GAIN = 0.2
+# 淡入淡出时长（秒），避免爆音
+FADE_SECONDS = 0.05
+
+# 屏气时的铃声: 基频、泛音比例和各自的衰减时间（秒）
+BELL_HZ = 660.0
+BELL_PARTIALS = ((1.0, 1.0, 1.2), (2.76, 0.4, 0.6), (5.4, 0.15, 0.3))
+BELL_GAIN = 0.15
+BELL_SECONDS = 2.0
+
+
+def is_available() -> bool:
+    """是否可以合成提示音（需要 NumPy）"""
+    return np is not None
+
+
+def _sweep(
+    phase: BreathingPhase, duration: float, easing: BreathingEasing, rate: int
+) -> "NDArray":
+    """音高随呼吸幅度曲线变化的正弦扫频"""
+    assert np is not None
+    frames = max(1, round(duration * rate))
+    t = np.arange(frames) / frames
+    table = phase_envelope(phase, easing)
+    level = np.interp(t, np.linspace(0.0, 1.0, len(table.values)), table.values)
+    frequency = SWEEP_LOW_HZ + (SWEEP_HIGH_HZ - SWEEP_LOW_HZ) * level
+    # 对瞬时频率积分得到相位，频率变化时波形连续
+    signal = np.sin(2 * np.pi * np.cumsum(frequency) / rate)
+
+    fade = min(round(FADE_SECONDS * rate), frames // 2)
+    gain = np.full(frames, SWEEP_GAIN)
+    if fade > 0:
+        ramp = np.linspace(0.0, SWEEP_GAIN, fade)
+        gain[:fade] = ramp
+        gain[-fade:] = ramp[::-1]
+    return signal * gain
+
+
+def _bell(duration: float, rate: int) -> "NDArray":
+    """柔和的铃声，长度不超过阶段时长"""
+    assert np is not None
+    frames = max(1, round(min(duration, BELL_SECONDS) * rate))
+    t = np.arange(frames) / rate
+    signal = np.zeros(frames)
+    for ratio, amplitude, decay in BELL_PARTIALS:
+        signal += (
+            amplitude * np.exp(-t / decay) * np.sin(2 * np.pi * BELL_HZ * ratio * t)
+        )
+    fade = min(round(FADE_SECONDS * rate), frames)
+    signal[:fade] *= np.linspace(0.0, 1.0, fade)
+    return signal * (BELL_GAIN / sum(p[1] for p in BELL_PARTIALS))
+
+
+def encode(signal: "NDArray", audio_format: QAudioFormat) -> "NDArray":
+    """
+    把 [-1, 1] 的单声道浮点信号转换为输出格式的交错采样，
+    返回形状为 (帧数, 声道数) 的数组。
+    """
+    assert np is not None
+    channels = max(1, audio_format.channelCount())
+    frames = np.repeat(signal[:, np.newaxis], channels, axis=1)
+    match audio_format.sampleFormat():
+        case QAudioFormat.SampleFormat.UInt8:
+            return ((frames + 1.0) * 127.5).astype(np.uint8)
+        case QAudioFormat.SampleFormat.Int16:
+            return (frames * 32767).astype("<i2")
+        case QAudioFormat.SampleFormat.Int32:
+            return (frames * 2147483647).astype("<i4")
+        case _:
+            return frames.astype("<f4")
+
+
+def _to_pcm(signal: "NDArray", audio_format: QAudioFormat) -> PcmBuffer:
+    return PcmBuffer(
+        data=encode(signal, audio_format).tobytes(),
+        sample_rate=audio_format.sampleRate(),
+        channels=max(1, audio_format.channelCount()),
+        sample_format=audio_format.sampleFormat(),
+    )
+
+
+def synthesize_cue(
+    phase: BreathingPhase,
+    duration: float,
+    easing: BreathingEasing,
+    audio_format: QAudioFormat,
+) -> PcmBuffer:
+    """
+    合成一个阶段的提示音: 吸气和呼气为长度与阶段一致的扫频，屏气为铃声。
+
+    Args:
+        phase: 呼吸阶段
+        duration: 阶段时长（秒）
+        easing: 扫频的音高曲线，与动画一致
+        audio_format: 输出格式
+    """
+    if np is None:
+        raise RuntimeError("合成提示音需要 NumPy")
+    rate = audio_format.sampleRate()
+    if phase in (BreathingPhase.INHALE, BreathingPhase.EXHALE):
+        signal = _sweep(phase, duration, easing, rate)
+    else:
+        signal = _bell(duration, rate)
+    return _to_pcm(signal, audio_format)
@@ -1,35 +1,137 @@
+import itertools
+import logging
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+
 from aqt import (
     QDialog,
     QMainWindow,
+    Qt,
     QTimer,
     mw,
 )
 
-from .audioplayer import AudioPlayer
-from .config.enums import PHASES, BreathingPhase
+from .audio import synth
+from .audio.ambient import AMBIENT_BREATHING
+from .audio.engine import AudioEngine, Voice, get_audio_engine, set_ambient_active
+from .breathing_plan import (
+    PhaseStep,
+    SessionPlan,
+    build_session_plan,
+    compile_session_plan,
+)
 from .state import get_app_state
 
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PhaseTimingStats:
+    """阶段切换相对于计划时间的偏差（毫秒）"""
+
+    phases: int
+    mean_jitter_ms: float
+    max_jitter_ms: float
+    last_jitter_ms: float  # 最近一次切换的偏差，即当前累积的漂移
+    # 提示音从计划开始到真正发声的延迟
+    cues: int = 0
+    mean_cue_latency_ms: float = 0.0
+    max_cue_latency_ms: float = 0.0
+    # 训练期间主事件循环的响应延迟（探测计时器相对于间隔的推迟），
+    # 训练以非模态窗口运行，主事件循环不会被嵌套的模态循环占用
+    loop_probes: int = 0
+    mean_loop_lag_ms: float = 0.0
+    max_loop_lag_ms: float = 0.0
+
+    def summary(self) -> str:
+        """调试日志用的摘要"""
+        return (
+            f"阶段切换 {self.phases} 次，偏差 平均 {self.mean_jitter_ms:.1f} ms / "
+            f"最大 {self.max_jitter_ms:.1f} ms / 最近 {self.last_jitter_ms:.1f} ms；"
+            f"提示音 {self.cues} 次，开始延迟 平均 {self.mean_cue_latency_ms:.1f} ms / "
+            f"最大 {self.max_cue_latency_ms:.1f} ms；"
+            f"主事件循环延迟 平均 {self.mean_loop_lag_ms:.1f} ms / "
+            f"最大 {self.max_loop_lag_ms:.1f} ms"
+        )
+
+
+class _RunningStats:
+    """只保存累计值的统计，内存占用与样本数无关"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.last = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
 
 # --- Breathing Exercise Controller ---
 class BreathingController:
-    """控制呼吸训练的业务逻辑"""
+    """
+    控制呼吸训练的业务逻辑。
+
+    训练窗口是非模态的，start() 显示窗口后立即返回，不启动嵌套的事件循环；
+    训练完成或跳过时调用 on_finished，后续步骤（如开始休息）在其中继续。
+
+    控制器和窗口在进程内只创建一次（见 get_breathing_controller()），
+    prewarm() 在训练开始前编译计划、准备窗口的第一帧和提示音，
+    两次训练之间只重置状态。
+
+    阶段由训练方案按需生成，控制器只保留当前和下一个阶段，
+    统计也只保存累计值，长时间或不限次数的训练占用固定的内存。
+    """
 
-    def __init__(self, target_cycles: int):
-        self.target_cycles = max(1, target_cycles)  # 确保至少有一个循环
+    # 主事件循环探测计时器的间隔（毫秒）
+    LOOP_PROBE_INTERVAL_MS = 100
+    # 训练开始前预先合成提示音的阶段数，其余的在前一个阶段开始时合成
+    SYNTH_PREFETCH_STEPS = 8
+
+    def __init__(self):
         self.completed_cycles = 0
-        self.current_phase_index = -1
         self._phase_timer: QTimer | None = None
-        self._current_audio_player: AudioPlayer | None = None
 
-        # 从配置中获取活动阶段
-        self._load_active_phases()
+        # 当前阶段、下一个阶段，以及生成后续阶段的迭代器
+        self.current_step: PhaseStep | None = None
+        self._upcoming: PhaseStep | None = None
+        self._steps: Iterator[PhaseStep] = iter(())
+
+        # 所有阶段的切换时间都相对于同一个单调时钟起点计算，误差不会累积
+        self._session_start: float | None = None
+        self._next_boundary: float | None = None
+        self._jitter_ms = _RunningStats()
+        self._cue_latencies_ms = _RunningStats()
+
+        # 训练结束时调用，参数为是否完成了全部循环
+        self.on_finished: Callable[[bool], None] | None = None
+
+        # 主事件循环的响应延迟，只保存累计值，内存占用与训练时长无关
+        self._loop_probe: QTimer | None = None
+        self._last_probe: float | None = None
+        self._loop_lag_ms = _RunningStats()
+
+        # 训练计划在 prewarm() 中从配置编译
+        self.plan: SessionPlan = build_session_plan((), 1)
         from .ui.breathing import BreathingDialog
 
-        # UI对话框
+        # UI对话框，第一次 prewarm() 时创建并一直复用
         self.dialog: BreathingDialog | None = None
 
-        # Audio Player
-        self.audio_player: AudioPlayer | None = None
+        # 共享的音频引擎，以及当前阶段提示音所在的声部
+        self.audio_engine: AudioEngine | None = None
+        self._cue_voice: Voice | None = None
+        self._use_synth_cues = False
+        self._easing = get_app_state().config.breathing_easing
 
         # Initialize phase timer once for reuse
         self._init_phase_timer()
@@ -39,125 +141,289 @@ class BreathingController:
         if self._phase_timer is None:
             self._phase_timer = QTimer(mw)
             self._phase_timer.setSingleShot(True)
+            self._phase_timer.setTimerType(Qt.TimerType.PreciseTimer)
             self._phase_timer.timeout.connect(self._advance_to_next_phase)
+        if self._loop_probe is None:
+            self._loop_probe = QTimer(mw)
+            self._loop_probe.setTimerType(Qt.TimerType.PreciseTimer)
+            self._loop_probe.setInterval(self.LOOP_PROBE_INTERVAL_MS)
+            self._loop_probe.timeout.connect(self._on_loop_probe)
 
-    def _load_active_phases(self):
-        """从配置中加载活动的呼吸阶段"""
-        app_state = get_app_state()
-        config = app_state.config
-
-        # --- 根据配置动态构建活动阶段 ---
-        self.active_phases: list[dict[str, str | int | BreathingPhase]] = []
-        for phase_def in PHASES:
-            key = phase_def.key
-            is_enabled = getattr(
-                config, f"{key.value}_enabled", phase_def.default_enabled
-            )
-            duration = getattr(
-                config, f"{key.value}_duration", phase_def.default_duration
-            )
-            audio_path = getattr(config, f"{key.value}_audio", phase_def.default_audio)
-
-            if is_enabled:
-                self.active_phases.append(
-                    {
-                        "label": phase_def.label,
-                        "duration": duration,
-                        "key": key.value,
-                        "audio_path": audio_path,
-                    }
-                )
-
-    def start(self, parent: QMainWindow = mw) -> bool:
-        """启动呼吸训练"""
-        if not self.active_phases:
+    @property
+    def is_running(self) -> bool:
+        """是否有训练正在进行"""
+        return self._session_start is not None
+
+    def prewarm(
+        self, target_cycles: int | None = None, parent: QMainWindow = mw
+    ) -> bool:
+        """
+        按当前配置准备下一次训练: 编译计划，创建（或重置）窗口并预先绘制第一帧，
+        合成或在后台解码所有提示音。可以重复调用，训练进行中时不做任何事。
+        返回计划是否包含阶段。
+
+        Args:
+            target_cycles: 自定义方案的目标循环次数，默认使用配置中的值
+        """
+        if self.is_running:
+            return not self.plan.is_empty
+        config = get_app_state().config
+        self._easing = config.breathing_easing
+        self.plan = compile_session_plan(config, target_cycles)
+        first_step = self.plan.first_step()
+        if first_step is None:
             return False
+
         from .ui.breathing import BreathingDialog
 
-        # 创建对话框
-        self.dialog = BreathingDialog(self, parent)
+        parent = parent or mw
+        if self.dialog is None:
+            self.dialog = BreathingDialog(self, parent)
+            self.dialog.finished.connect(self._on_dialog_finished)
+        elif self.dialog.parent() is not parent:
+            self.dialog.setParent(parent, self.dialog.windowFlags())
+        self.dialog.prepare(first_step, self.plan.cycles)
+
+        # Prepare all cues of the plan: synthesize them once, or decode
+        # the audio files in the background
+        self.audio_engine = get_audio_engine()
+        self._use_synth_cues = self._prepare_synth_cues()
+        if not self._use_synth_cues:
+            self.audio_engine.preload(self.plan.audio_urls())
+        self.audio_engine.prepare_voice()
+        return True
 
-        # Create audio player
-        self.audio_player = AudioPlayer(self.dialog)
+    def start(self, parent: QMainWindow = mw, target_cycles: int | None = None) -> bool:
+        """
+        显示训练窗口并开始第一个阶段，立即返回是否已开始。
+        结果通过 on_finished 通知。
+
+        Args:
+            target_cycles: 自定义方案的目标循环次数，默认使用配置中的值
+        """
+        if self.is_running:
+            return False
+        # 已经预热时只需要重置状态
+        if not self.prewarm(target_cycles, parent) or self.dialog is None:
+            return False
+
+        self.completed_cycles = 0
+        self.current_step = None
+        self._steps = self.plan.iter_steps()
+        self._upcoming = next(self._steps, None)
+
+        # 背景音在训练期间持续播放，位于提示音之下
+        set_ambient_active(AMBIENT_BREATHING, True, get_app_state().config)
 
         # Ensure phase timer is properly initialized
         self._init_phase_timer()
 
         # Start first phase
+        self._session_start = time.monotonic()
+        self._next_boundary = None
+        self._jitter_ms = _RunningStats()
+        self._cue_latencies_ms = _RunningStats()
+        self._start_loop_probe()
         self._advance_to_next_phase()
 
-        # 显示对话框并返回结果
-        return self.dialog.exec() == QDialog.DialogCode.Accepted
+        # 非模态显示，控制权立即回到主事件循环
+        self.dialog.show()
+        return True
+
+    def _on_dialog_finished(self, result: int) -> None:
+        """训练窗口关闭（完成或跳过）后结束本次训练并继续后续步骤，窗口留待复用"""
+        self._session_start = None
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("呼吸训练计时: %s", self.get_timing_stats().summary())
+        if self.on_finished:
+            self.on_finished(result == QDialog.DialogCode.Accepted)
+
+    def _start_loop_probe(self) -> None:
+        """探测结果只在调试日志中使用，未开启调试日志时不运行探测计时器"""
+        self._last_probe = time.monotonic()
+        self._loop_lag_ms = _RunningStats()
+        if self._loop_probe is not None and logger.isEnabledFor(logging.DEBUG):
+            self._loop_probe.start()
+
+    def _on_loop_probe(self) -> None:
+        """记录探测计时器比预定时间晚了多少，即主事件循环的响应延迟"""
+        now = time.monotonic()
+        if self._last_probe is not None:
+            lag_ms = (now - self._last_probe) * 1000 - self.LOOP_PROBE_INTERVAL_MS
+            self._loop_lag_ms.add(max(0.0, lag_ms))
+        self._last_probe = now
 
     def _advance_to_next_phase(self) -> None:
         """处理进入下一个阶段或完成练习的逻辑"""
-        if not self.dialog:
+        if not self.dialog or self._session_start is None:
+            return
+
+        self._stop_cue()
+
+        # 前进到方案生成的下一个阶段，没有下一个阶段表示训练完成
+        step = self._upcoming
+        if step is None:
+            if self.current_step is not None:
+                self.completed_cycles = self.current_step.cycle + 1
+            self.dialog.accept()
             return
+        self._upcoming = next(self._steps, None)
+
+        # 本阶段的计划开始时间，以及实际触发的偏差
+        phase_start = self._session_start + step.start
+        if self.current_step is not None:
+            self._jitter_ms.add((time.monotonic() - phase_start) * 1000)
+        self.current_step = step
+        self.completed_cycles = step.cycle
+
+        # 先安排下一次切换，界面和音频的耗时不会推迟它
+        self._schedule_next_boundary()
 
-        # 确定下一个阶段索引，并检查是否刚完成一个循环
-        next_phase_index = (self.current_phase_index + 1) % len(self.active_phases)
-        just_completed_cycle = (
-            next_phase_index == 0 and self.current_phase_index != -1
-        )  # 如果回到开始，则表示完成了一个循环
+        # 更新UI显示当前阶段，动画与计划使用同一个时钟
+        self.dialog.update_phase_display(
+            step.label, step.duration, step.phase, phase_start, step.envelope
+        )
+        self.dialog.update_cycle_display(step.cycle + 1, self.plan.cycles)
 
-        if self.audio_player:
-            self.audio_player.stop()
+        self._cue_voice = self._play_cue(step, phase_start)
 
-        # 在完成循环的最后一个阶段后增加循环计数
-        if just_completed_cycle:
-            self.completed_cycles += 1
-            self.dialog.update_cycle_display(
-                min(self.completed_cycles + 1, self.target_cycles), self.target_cycles
+    def _play_cue(self, step: PhaseStep, phase_start: float) -> Voice | None:
+        """
+        播放阶段的提示音。合成的提示音与动画使用同一条幅度曲线和同一个时间起点，
+        录制的语音提示按原始音量播放。
+        """
+        if self.audio_engine is None:
+            return None
+        if not self._use_synth_cues:
+            if step.audio is None:
+                return None
+            return self.audio_engine.play(step.audio, phase_start)
+
+        pcm = self.audio_engine.synthesized_cue(step.phase, step.duration, self._easing)
+        voice = None
+        if pcm is not None:
+            voice = self.audio_engine.play_buffer(
+                pcm, step.envelope, phase_start, step.duration
+            )
+        # 时长变化的阶段（如频率渐变）在前一个阶段开始后合成
+        if self._upcoming is not None:
+            self.audio_engine.synthesized_cue(
+                self._upcoming.phase, self._upcoming.duration, self._easing
             )
+        return voice
 
-            # 检查是否达到目标循环次数
-            if self.completed_cycles >= self.target_cycles:
-                self.dialog.accept()
-                return
+    def _prepare_synth_cues(self) -> bool:
+        """按配置为计划中的每个阶段合成提示音，返回是否使用合成的提示音"""
+        config = get_app_state().config
+        if not config.breathing_synth_cues or self.audio_engine is None:
+            return False
+        if not synth.is_available():
+            print("警告: 未安装 NumPy，无法合成提示音，将使用音频文件")
+            return False
+        for step in itertools.islice(self.plan.iter_steps(), self.SYNTH_PREFETCH_STEPS):
+            self.audio_engine.synthesized_cue(step.phase, step.duration, self._easing)
+        return True
 
-        self.current_phase_index = next_phase_index
-        current_phase_data = self.active_phases[self.current_phase_index]
-        duration = int(current_phase_data["duration"])
-        label = str(current_phase_data["label"])
-        phase_key = BreathingPhase(current_phase_data["key"])
-        audio_path = str(current_phase_data["audio_path"])
+    def _stop_cue(self) -> None:
+        """停止上一个阶段的提示音，并记录它的开始延迟"""
+        if self._cue_voice is None:
+            return
+        if self._cue_voice.onset_latency_ms is not None:
+            self._cue_latencies_ms.add(self._cue_voice.onset_latency_ms)
+        self._cue_voice.stop()
+        self._cue_voice = None
 
-        # 更新UI显示当前阶段
-        self.dialog.update_phase_display(label, duration, phase_key)
-        self.dialog.update_cycle_display(self.completed_cycles + 1, self.target_cycles)
+    def _schedule_next_boundary(self) -> None:
+        """按当前阶段在计划中的绝对时间安排下一个阶段的开始"""
+        if (
+            self._phase_timer is None
+            or self._session_start is None
+            or self.current_step is None
+        ):
+            return
 
-        if audio_path and self.audio_player:
-            self.audio_player.play(audio_path)
+        self._next_boundary = (
+            self._session_start + self.current_step.start + self.current_step.duration
+        )
+        delay_ms = (self._next_boundary - time.monotonic()) * 1000
+        self._phase_timer.start(max(0, round(delay_ms)))
 
-        if self._phase_timer:
-            if duration > 0:
-                self._phase_timer.start(duration * 1000)
-            else:
-                # 如果持续时间为0，立即前进（带有微小延迟以便事件循环）
-                self._phase_timer.start(10)
+    def get_timing_stats(self) -> PhaseTimingStats:
+        """获取本次训练中阶段切换的时间偏差统计"""
+        jitter = self._jitter_ms
+        latencies = self._cue_latencies_ms
+        loop_lag = self._loop_lag_ms
+        return PhaseTimingStats(
+            phases=jitter.count,
+            mean_jitter_ms=jitter.mean,
+            max_jitter_ms=jitter.max,
+            last_jitter_ms=jitter.last,
+            cues=latencies.count,
+            mean_cue_latency_ms=latencies.mean,
+            max_cue_latency_ms=latencies.max,
+            loop_probes=loop_lag.count,
+            mean_loop_lag_ms=loop_lag.mean,
+            max_loop_lag_ms=loop_lag.max,
+        )
 
     def stop_timers(self):
         """停止阶段计时器"""
         if self._phase_timer and self._phase_timer.isActive():
             self._phase_timer.stop()
-        if self.audio_player:
-            self.audio_player.stop()
+        if self._loop_probe:
+            self._loop_probe.stop()
+        self._stop_cue()
+        set_ambient_active(AMBIENT_BREATHING, False, get_app_state().config)
 
 
 # --- 便捷函数 ---
+_breathing_controller_instance: BreathingController | None = None
+
+
+def get_breathing_controller() -> BreathingController:
+    """获取呼吸训练控制器的单例实例（在首次使用时创建）"""
+    global _breathing_controller_instance
+    if _breathing_controller_instance is None:
+        _breathing_controller_instance = BreathingController()
+    return _breathing_controller_instance
+
+
+def prewarm_breathing_exercise() -> None:
+    """按当前配置预先准备下一次呼吸训练的窗口和提示音"""
+    get_breathing_controller().prewarm()
+
+
 def start_breathing_exercise(
-    target_cycles: int | None = None, parent: QMainWindow = mw
+    target_cycles: int | None = None,
+    parent: QMainWindow = mw,
+    on_finished: Callable[[bool], None] | None = None,
 ) -> bool:
-    """启动呼吸训练练习"""
-    _target_cycles: int
+    """
+    启动呼吸训练练习，显示非模态窗口后立即返回是否已开始。
+
+    Args:
+        on_finished: 训练结束时调用，参数为是否完成了全部循环；
+            已有训练在进行时在那次训练结束后调用，未能开始时不会调用
+    """
+    controller = get_breathing_controller()
+    if controller.is_running and controller.dialog is not None:
+        # 已有训练在进行，把它的窗口带到前面，后续步骤随那次训练一起结束
+        controller.dialog.raise_()
+        controller.dialog.activateWindow()
+        if on_finished is not None:
+            previous = controller.on_finished
+
+            def chained(completed: bool) -> None:
+                if previous:
+                    previous(completed)
+                on_finished(completed)
+
+            controller.on_finished = chained
+        return True
+
     # 如果未指定目标循环次数，或传入的是布尔值（来自Qt信号），则从配置中获取
-    if target_cycles is None or isinstance(target_cycles, bool):
-        app_state = get_app_state()
-        cycles_from_config: int = app_state.config.breathing_cycles
-        _target_cycles = cycles_from_config
-    else:
-        _target_cycles = target_cycles
-
-    # 创建控制器并启动训练
-    controller = BreathingController(_target_cycles)
-    return controller.start(parent)
+    if isinstance(target_cycles, bool):
+        target_cycles = None
+
+    controller.on_finished = on_finished
+    return controller.start(parent, target_cycles)
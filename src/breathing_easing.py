@@ -0,0 +1,103 @@
+import dataclasses
+import math
+from collections.abc import Callable
+from functools import cache
+
+from .config.enums import BreathingEasing, BreathingPhase
+
+# 查找表的采样点数
+LUT_SIZE = 256
+
+
+def _sine(t: float) -> float:
+    return 0.5 - 0.5 * math.cos(math.pi * t)
+
+
+def _ease_in_out(t: float) -> float:
+    if t < 0.5:
+        return 4 * t**3
+    return 1 - (-2 * t + 2) ** 3 / 2
+
+
+def _exponential(t: float) -> float:
+    if t <= 0.0 or t >= 1.0:
+        return min(1.0, max(0.0, t))
+    if t < 0.5:
+        return 2 ** (20 * t - 10) / 2
+    return (2 - 2 ** (-20 * t + 10)) / 2
+
+
+# 曲线 → 把归一化时间 [0, 1] 映射到 [0, 1] 的函数
+EASING_FUNCTIONS: dict[BreathingEasing, Callable[[float], float]] = {
+    BreathingEasing.LINEAR: lambda t: t,
+    BreathingEasing.SINE: _sine,
+    BreathingEasing.EASE_IN_OUT: _ease_in_out,
+    BreathingEasing.EXPONENTIAL: _exponential,
+}
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class EasingTable:
+    """
+    一个阶段内呼吸幅度（0 为最小，1 为最大）随归一化时间变化的查找表。
+    动画半径和提示音音量都由它计算，查询只需要一次索引和一次线性插值。
+    """
+
+    values: tuple[float, ...]
+    # 相邻采样点之间的最大变化率（每单位归一化时间），用于安排重绘
+    max_slope: float
+
+    @property
+    def is_constant(self) -> bool:
+        return self.max_slope == 0.0
+
+    def at(self, t: float) -> float:
+        """归一化时间 t 处的幅度"""
+        last = len(self.values) - 1
+        if last <= 0 or t <= 0.0:
+            return self.values[0]
+        if t >= 1.0:
+            return self.values[last]
+        x = t * last
+        i = int(x)
+        a = self.values[i]
+        return a + (self.values[i + 1] - a) * (x - i)
+
+
+def _make_table(values: tuple[float, ...]) -> EasingTable:
+    steps = len(values) - 1
+    max_slope = max(
+        (abs(b - a) * steps for a, b in zip(values, values[1:], strict=False)),
+        default=0.0,
+    )
+    return EasingTable(values=values, max_slope=max_slope)
+
+
+@cache
+def easing_table(
+    easing: BreathingEasing, rising: bool, size: int = LUT_SIZE
+) -> EasingTable:
+    """生成（并缓存）从 0 到 1（rising）或从 1 到 0 的查找表"""
+    func = EASING_FUNCTIONS.get(easing, EASING_FUNCTIONS[BreathingEasing.LINEAR])
+    samples = (func(i / (size - 1)) for i in range(size))
+    if rising:
+        return _make_table(tuple(samples))
+    return _make_table(tuple(1.0 - v for v in samples))
+
+
+# 屏气阶段幅度保持不变
+_FULL = _make_table((1.0,))
+_EMPTY = _make_table((0.0,))
+
+
+def phase_envelope(phase: BreathingPhase, easing: BreathingEasing) -> EasingTable:
+    """获取某个呼吸阶段的幅度查找表"""
+    match phase:
+        case BreathingPhase.INHALE:
+            return easing_table(easing, True)
+        case BreathingPhase.EXHALE:
+            return easing_table(easing, False)
+        case BreathingPhase.HOLD_AFTER_INHALE:
+            return _FULL
+        case _:
+            return _EMPTY
@@ -0,0 +1,140 @@
+import dataclasses
+from collections.abc import Iterable, Iterator, Mapping
+
+from aqt import QUrl
+
+from .breathing_easing import EasingTable, phase_envelope
+from .breathing_program import (
+    CUSTOM_PROGRAM_ID,
+    PHASE_ORDER,
+    BreathingProgram,
+    PatternSegment,
+    get_program,
+)
+from .config.enums import PHASES, BreathingEasing, BreathingPhase
+from .config.types import AppConfig
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class PhaseStep:
+    """呼吸训练中的一个阶段（已从配置中解析完毕）"""
+
+    phase: BreathingPhase
+    label: str
+    duration: float  # 秒
+    start: float  # 相对于训练开始的时间（秒），由方案直接算出，不会累积误差
+    cycle: int  # 所在的循环（从 0 开始）
+    audio: QUrl | None  # 预先生成的音频地址
+    envelope: EasingTable  # 呼吸幅度曲线，同时驱动动画和提示音音量
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class SessionPlan:
+    """
+    编译后的呼吸训练计划。
+    阶段由训练方案按需生成，长时间或不限次数的训练也只占用固定的内存；
+    能够直接算出的总时长和循环次数不需要展开阶段。
+    """
+
+    program: BreathingProgram
+    audio: Mapping[BreathingPhase, QUrl]  # 各阶段的提示音
+    easing: BreathingEasing = BreathingEasing.LINEAR
+
+    @property
+    def cycles(self) -> int | None:
+        """总循环次数，不限次数时为 None"""
+        return self.program.cycles
+
+    @property
+    def total_duration(self) -> float | None:
+        """整个训练的时长（秒），不限次数时为 None"""
+        return self.program.total_duration
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.program.phases
+
+    def iter_steps(self) -> Iterator[PhaseStep]:
+        """按顺序生成训练中的每个阶段"""
+        labels = {phase_def.key: phase_def.label for phase_def in PHASES}
+        envelopes = {phase: phase_envelope(phase, self.easing) for phase in PHASE_ORDER}
+        for cycle, (start, durations) in enumerate(self.program.iter_cycles()):
+            offset = start
+            for phase, duration in zip(PHASE_ORDER, durations, strict=True):
+                if duration <= 0:
+                    continue
+                yield PhaseStep(
+                    phase=phase,
+                    label=labels[phase],
+                    duration=duration,
+                    start=offset,
+                    cycle=cycle,
+                    audio=self.audio.get(phase),
+                    envelope=envelopes[phase],
+                )
+                offset += duration
+
+    def first_step(self) -> PhaseStep | None:
+        return next(self.iter_steps(), None)
+
+    def audio_urls(self) -> list[QUrl]:
+        """方案中用到的提示音"""
+        return [
+            self.audio[phase]
+            for phase in PHASE_ORDER
+            if phase in self.audio and phase in self.program.phases
+        ]
+
+
+def build_session_plan(
+    phases: Iterable[tuple[BreathingPhase, bool, int, str | None]],
+    cycles: int,
+    easing: BreathingEasing = BreathingEasing.LINEAR,
+) -> SessionPlan:
+    """
+    根据阶段设置编译训练计划，跳过未启用或时长为 0 的阶段。
+
+    Args:
+        phases: (阶段, 是否启用, 时长（秒）, 音频路径) 的序列，按 PHASES 的顺序
+        cycles: 目标循环次数
+        easing: 吸气和呼气阶段的幅度曲线
+    """
+    durations = {phase: 0.0 for phase in PHASE_ORDER}
+    audio: dict[BreathingPhase, QUrl] = {}
+    for phase, enabled, duration, audio_path in phases:
+        if enabled and duration > 0:
+            durations[phase] = float(duration)
+        if audio_path:
+            audio[phase] = QUrl.fromLocalFile(audio_path)
+    program = BreathingProgram(
+        program_id=CUSTOM_PROGRAM_ID,
+        name="",
+        segments=(
+            PatternSegment(
+                tuple(durations[phase] for phase in PHASE_ORDER), max(1, cycles)
+            ),
+        ),
+    )
+    return SessionPlan(program=program, audio=audio, easing=easing)
+
+
+def compile_session_plan(config: AppConfig, cycles: int | None = None) -> SessionPlan:
+    """
+    从配置编译训练计划，使用配置中选择的训练方案。
+
+    Args:
+        config: 应用配置
+        cycles: 自定义方案的目标循环次数，为 None 时使用配置中的值
+    """
+    audio: dict[BreathingPhase, QUrl] = {}
+    for phase_def in PHASES:
+        audio_path = getattr(
+            config, f"{phase_def.key.value}_audio", phase_def.default_audio
+        )
+        if audio_path:
+            audio[phase_def.key] = QUrl.fromLocalFile(audio_path)
+    return SessionPlan(
+        program=get_program(config, cycles),
+        audio=audio,
+        easing=config.breathing_easing,
+    )
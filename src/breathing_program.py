@@ -0,0 +1,306 @@
+import dataclasses
+import itertools
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from .config.enums import PHASES, BreathingPhase
+from .config.types import AppConfig
+from .translator import _
+
+# 一个循环中阶段的顺序，方案中的时长和比例都按这个顺序给出
+PHASE_ORDER: tuple[BreathingPhase, ...] = tuple(phase_def.key for phase_def in PHASES)
+
+# 使用设置中各阶段时长和循环次数的方案
+CUSTOM_PROGRAM_ID = "custom"
+
+# 按 PHASE_ORDER 排列的各阶段时长或比例
+PhaseDurations = tuple[float, ...]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class PatternSegment:
+    """以固定的阶段时长重复若干个循环"""
+
+    durations: PhaseDurations  # 各阶段时长（秒），0 表示跳过该阶段
+    cycles: int | None  # None 表示一直进行直到跳过
+
+    @property
+    def period(self) -> float:
+        return sum(self.durations)
+
+    @property
+    def duration(self) -> float | None:
+        """总时长（秒），不限循环次数时为 None"""
+        return None if self.cycles is None else self.period * self.cycles
+
+    def iter_cycles(self) -> Iterator[tuple[float, PhaseDurations]]:
+        """生成每个循环的 (相对于段落开始的时间, 各阶段时长)"""
+        counter = itertools.count() if self.cycles is None else range(self.cycles)
+        for index in counter:
+            yield index * self.period, self.durations
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class RampSegment:
+    """
+    呼吸频率从 start_bpm 逐渐变为 end_bpm（次/分钟），每个循环按比例分配到各阶段。
+    循环周期在两端之间线性变化，每个循环的开始时间和总时长都可以直接算出。
+    """
+
+    start_bpm: float
+    end_bpm: float
+    ratio: PhaseDurations  # 各阶段占一个循环的比例，0 表示跳过该阶段
+    cycles: int
+
+    @property
+    def durations(self) -> PhaseDurations:
+        return self.ratio
+
+    def period(self, index: int) -> float:
+        """第 index 个循环的周期（秒）"""
+        first, last = 60 / self.start_bpm, 60 / self.end_bpm
+        if self.cycles <= 1:
+            return first
+        return first + (last - first) * index / (self.cycles - 1)
+
+    def cycle_start(self, index: int) -> float:
+        """第 index 个循环相对于段落开始的时间，即前 index 个周期之和"""
+        first, last = 60 / self.start_bpm, 60 / self.end_bpm
+        if self.cycles <= 1:
+            return index * first
+        step = (last - first) / (self.cycles - 1)
+        return index * first + step * index * (index - 1) / 2
+
+    @property
+    def duration(self) -> float:
+        return self.cycle_start(self.cycles)
+
+    def iter_cycles(self) -> Iterator[tuple[float, PhaseDurations]]:
+        total = sum(self.ratio)
+        for index in range(self.cycles):
+            period = self.period(index)
+            durations = tuple(period * part / total for part in self.ratio)
+            yield self.cycle_start(index), durations
+
+
+Segment = PatternSegment | RampSegment
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class BreathingProgram:
+    """
+    呼吸训练方案: 按顺序进行的若干段落，如热身、主体和放松。
+    循环由 iter_cycles() 惰性生成，不限次数的方案也只占用固定的内存。
+    """
+
+    program_id: str
+    name: str
+    segments: tuple[Segment, ...]
+
+    @property
+    def cycles(self) -> int | None:
+        """总循环次数，不限次数时为 None"""
+        total = 0
+        for segment in self.segments:
+            if segment.cycles is None:
+                return None
+            total += segment.cycles
+        return total
+
+    @property
+    def total_duration(self) -> float | None:
+        """总时长（秒），不限次数时为 None"""
+        total = 0.0
+        for segment in self.segments:
+            duration = segment.duration
+            if duration is None:
+                return None
+            total += duration
+        return total
+
+    @property
+    def phases(self) -> frozenset[BreathingPhase]:
+        """方案中出现的阶段"""
+        return frozenset(
+            phase
+            for segment in self.segments
+            for phase, value in zip(PHASE_ORDER, segment.durations, strict=True)
+            if value > 0
+        )
+
+    def iter_cycles(self) -> Iterator[tuple[float, PhaseDurations]]:
+        """按顺序生成每个循环的 (相对于训练开始的时间, 各阶段时长)"""
+        offset = 0.0
+        for segment in self.segments:
+            if sum(segment.durations) <= 0:
+                continue
+            for start, durations in segment.iter_cycles():
+                yield offset + start, durations
+            duration = segment.duration
+            if duration is None:
+                return
+            offset += duration
+
+
+# 内置方案，格式与配置中的 breathing_programs 相同，见 parse_program()
+BUILTIN_PROGRAMS: tuple[dict[str, Any], ...] = (
+    {
+        "id": "4-7-8",
+        "name": _("4-7-8 呼吸"),
+        "segments": [{"pattern": [4, 7, 8, 0], "cycles": 4}],
+    },
+    {
+        "id": "box",
+        "name": _("箱式呼吸"),
+        "segments": [{"pattern": [4, 4, 4, 4], "cycles": 8}],
+    },
+    {
+        "id": "resonance",
+        "name": _("共振呼吸 (6 → 4.5 次/分钟)"),
+        "segments": [
+            {"pattern": [3, 0, 4, 0], "cycles": 3},
+            {"ramp": [6, 4.5], "ratio": [4, 0, 6, 0], "cycles": 40},
+            {"pattern": [4, 0, 6, 0], "cycles": 3},
+        ],
+    },
+)
+
+
+def _parse_durations(value: Any, name: str) -> PhaseDurations:
+    if (
+        not isinstance(value, list | tuple)
+        or len(value) != len(PHASE_ORDER)
+        or not all(
+            isinstance(v, int | float) and not isinstance(v, bool) and v >= 0
+            for v in value
+        )
+        or sum(value) <= 0
+    ):
+        raise ValueError(f"{name} 应为 4 个非负数（吸气、屏气、呼气、屏气）")
+    return tuple(float(v) for v in value)
+
+
+def _parse_cycles(value: Any) -> int:
+    if not isinstance(value, int) or isinstance(value, bool) or value <= 0:
+        raise ValueError("cycles 应为正整数")
+    return value
+
+
+def _parse_segment(spec: Any, is_last: bool) -> Segment:
+    if not isinstance(spec, Mapping):
+        raise ValueError("段落应为对象")
+    if "pattern" in spec:
+        return PatternSegment(
+            durations=_parse_durations(spec["pattern"], "pattern"),
+            # 只有最后一个段落可以不限循环次数
+            cycles=(
+                None
+                if is_last and spec.get("cycles") is None
+                else _parse_cycles(spec.get("cycles"))
+            ),
+        )
+    if "ramp" in spec:
+        bpm = spec["ramp"]
+        if (
+            not isinstance(bpm, list | tuple)
+            or len(bpm) != 2
+            or not all(
+                isinstance(v, int | float) and not isinstance(v, bool) and v > 0
+                for v in bpm
+            )
+        ):
+            raise ValueError("ramp 应为 [起始, 结束] 每分钟呼吸次数")
+        return RampSegment(
+            start_bpm=float(bpm[0]),
+            end_bpm=float(bpm[1]),
+            ratio=_parse_durations(spec.get("ratio", [1, 0, 1, 0]), "ratio"),
+            cycles=_parse_cycles(spec.get("cycles")),
+        )
+    raise ValueError("段落需要 pattern 或 ramp")
+
+
+def parse_program(spec: Mapping[str, Any]) -> BreathingProgram:
+    """
+    解析训练方案，格式错误时抛出 ValueError。例如:
+
+        {"id": "4-7-8", "name": "4-7-8",
+         "segments": [{"pattern": [4, 7, 8, 0], "cycles": 4}]}
+
+    段落按顺序进行，时长和比例按 吸气、屏气、呼气、屏气 的顺序给出:
+    - {"pattern": [秒, ...], "cycles": 次数}: 固定时长，
+      最后一个段落省略 cycles 表示不限次数
+    - {"ramp": [起始, 结束], "ratio": [比例, ...], "cycles": 次数}:
+      呼吸频率（次/分钟）逐渐变化，ratio 默认为吸气和呼气各一半
+    """
+    program_id = spec.get("id")
+    if not isinstance(program_id, str) or not program_id:
+        raise ValueError("方案需要 id")
+    segments = spec.get("segments")
+    if not isinstance(segments, list) or not segments:
+        raise ValueError(f"方案 {program_id} 没有段落")
+    return BreathingProgram(
+        program_id=program_id,
+        name=str(spec.get("name") or program_id),
+        segments=tuple(
+            _parse_segment(segment, index == len(segments) - 1)
+            for index, segment in enumerate(segments)
+        ),
+    )
+
+
+def custom_program(config: AppConfig, cycles: int | None = None) -> BreathingProgram:
+    """
+    由设置中各阶段的时长和循环次数组成的方案。
+
+    Args:
+        cycles: 目标循环次数，为 None 时使用配置中的值
+    """
+    durations = tuple(
+        float(
+            getattr(
+                config, f"{phase_def.key.value}_duration", phase_def.default_duration
+            )
+        )
+        if getattr(config, f"{phase_def.key.value}_enabled", phase_def.default_enabled)
+        else 0.0
+        for phase_def in PHASES
+    )
+    if cycles is None:
+        cycles = config.breathing_cycles
+    return BreathingProgram(
+        program_id=CUSTOM_PROGRAM_ID,
+        name=_("自定义"),
+        segments=(PatternSegment(durations, max(1, cycles)),),
+    )
+
+
+def list_programs(config: AppConfig) -> list[BreathingProgram]:
+    """自定义方案、内置方案和配置中的方案（与内置方案 ID 相同时替换内置方案）"""
+    programs: dict[str, BreathingProgram] = {CUSTOM_PROGRAM_ID: custom_program(config)}
+    for spec in (*BUILTIN_PROGRAMS, *config.breathing_programs):
+        # 配置中的方案由用户编辑，可能不是对象
+        if not isinstance(spec, Mapping):
+            print(f"警告: 忽略无效的呼吸训练方案 {spec!r}: 方案应为对象")
+            continue
+        try:
+            program = parse_program(spec)
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"警告: 忽略无效的呼吸训练方案 {spec.get('id')}: {e}")
+            continue
+        if program.program_id != CUSTOM_PROGRAM_ID:
+            programs[program.program_id] = program
+    return list(programs.values())
+
+
+def get_program(config: AppConfig, cycles: int | None = None) -> BreathingProgram:
+    """
+    配置中选择的方案，找不到时使用自定义方案。
+
+    Args:
+        cycles: 自定义方案的目标循环次数，其他方案的次数由方案本身决定
+    """
+    if config.breathing_program != CUSTOM_PROGRAM_ID:
+        for program in list_programs(config):
+            if program.program_id == config.breathing_program:
+                return program
+    return custom_program(config, cycles)
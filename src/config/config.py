@@ -16,7 +16,7 @@ from typing import Any
 
 from koda_validate import Valid
 
-from .enums import CircularTimerStyle, StatusBarFormat, TimerPosition
+from .enums import AmbientSound, BreathingEasing, StatusBarFormat, TimerPosition
 from .types import AppConfig, config_validator
 
 
@@ -65,14 +65,6 @@ def _convert_to_enum(data: dict[str, Any]) -> dict[str, Any]:
     """
     将文本配置转换为枚举
     """
-    if "circular_timer_style" in data and isinstance(data["circular_timer_style"], str):
-        try:
-            data["circular_timer_style"] = CircularTimerStyle(
-                data["circular_timer_style"]
-            )
-        except ValueError:
-            data["circular_timer_style"] = CircularTimerStyle.DEFAULT
-
     if "statusbar_format" in data and isinstance(data["statusbar_format"], str):
         try:
             data["statusbar_format"] = StatusBarFormat(data["statusbar_format"])
@@ -87,6 +79,18 @@ def _convert_to_enum(data: dict[str, Any]) -> dict[str, Any]:
         except ValueError:
             data["timer_position"] = TimerPosition.TOP_RIGHT
 
+    if "breathing_easing" in data and isinstance(data["breathing_easing"], str):
+        try:
+            data["breathing_easing"] = BreathingEasing(data["breathing_easing"])
+        except ValueError:
+            data["breathing_easing"] = BreathingEasing.SINE
+
+    if "ambient_sound" in data and isinstance(data["ambient_sound"], str):
+        try:
+            data["ambient_sound"] = AmbientSound(data["ambient_sound"])
+        except ValueError:
+            data["ambient_sound"] = AmbientSound.OFF
+
     if "language" in data and isinstance(data["language"], str):
         from .languages import LanguageCode
 
@@ -98,6 +102,42 @@ def _convert_to_enum(data: dict[str, Any]) -> dict[str, Any]:
     return data
 
 
+def _migrate_timer_positions(data: dict[str, Any]) -> dict[str, Any]:
+    """
+    将旧版本保存的窗口位置（DisplayPosition 字典）转换为紧凑格式:
+    [x, y, 宽, 高, DPI_X, DPI_Y, 最近使用时间]
+    """
+    positions = data.get("saved_timer_positions")
+    if not isinstance(positions, dict):
+        return data
+
+    migrated: dict[str, list[int]] = {}
+    for identifier, entry in positions.items():
+        try:
+            if isinstance(entry, dict):
+                x, y = entry["pos"]
+                width, height = entry["resolution"]
+                dpi_x, dpi_y = entry["logical_dpi"]
+                last_used = 0
+            else:
+                x, y, width, height, dpi_x, dpi_y, last_used = entry
+            migrated[str(identifier)] = [
+                int(x),
+                int(y),
+                int(width),
+                int(height),
+                round(dpi_x),
+                round(dpi_y),
+                int(last_used),
+            ]
+        except (KeyError, TypeError, ValueError):
+            # 丢弃无法识别的记录，而不是让整个配置验证失败
+            continue
+
+    data["saved_timer_positions"] = migrated
+    return data
+
+
 def load_user_config() -> AppConfig:
     """
     从自定义配置文件中加载、验证并返回用户配置。
@@ -126,6 +166,7 @@ def load_user_config() -> AppConfig:
     try:
         # 在验证之前进行枚举转换
         migrated_data = _convert_to_enum(loaded_data)
+        migrated_data = _migrate_timer_positions(migrated_data)
 
         # 使用从 types.py 导入的验证器进行验证和填充
         result = config_validator(migrated_data)
@@ -30,6 +30,13 @@ class CircularTimerStyle(str, Enum):
     RAINBOW = "rainbow"
 
 
+class BreathingVisualStyle(str, Enum):
+    CIRCLE = "circle"
+    BOX = "box"
+    WAVE = "wave"
+    PARTICLE_RING = "particle_ring"
+
+
 class PomodoroPhase(Enum):
     POMODORO = "pomodoro"
     LONG_BREAK = "long_break"
@@ -42,6 +49,48 @@ class BreathingPhase(str, Enum):
     HOLD_AFTER_EXHALE = "hold_after_exhale"
 
 
+class BreathingEasing(str, Enum):
+    """呼吸动画（以及提示音音量）随时间变化的曲线"""
+
+    _display_name: str
+
+    def __new__(cls, value: str, display_name: str):
+        obj = str.__new__(cls, value)
+        obj._value_ = value
+        obj._display_name = display_name
+        return obj
+
+    @property
+    def display_name(self) -> str:
+        return self._display_name
+
+    LINEAR = "linear", _("线性")
+    SINE = "sine", _("正弦")
+    EASE_IN_OUT = "ease_in_out", _("缓入缓出")
+    EXPONENTIAL = "exponential", _("指数")
+
+
+class AmbientSound(str, Enum):
+    """长休息和呼吸训练时的背景音"""
+
+    _display_name: str
+
+    def __new__(cls, value: str, display_name: str):
+        obj = str.__new__(cls, value)
+        obj._value_ = value
+        obj._display_name = display_name
+        return obj
+
+    @property
+    def display_name(self) -> str:
+        return self._display_name
+
+    OFF = "off", _("无")
+    BROWN_NOISE = "brown_noise", _("布朗噪声")
+    RAIN = "rain", _("雨声")
+    CUSTOM = "custom", _("自定义循环 (WAV)")
+
+
 @dataclasses.dataclass
 class BreathingPhaseInfo:
     key: BreathingPhase
@@ -9,12 +9,16 @@ if str(vendor_dir) not in sys.path:
 
 import dataclasses
 from pathlib import Path
+from typing import Any
 
 from koda_validate import DataclassValidator
 
 from .constants import AUDIO_FILENAMES
 from .enums import (
+    AmbientSound,
+    BreathingEasing,
     BreathingPhase,
+    BreathingVisualStyle,
     CircularTimerStyle,
     StatusBarFormat,
     TimerPosition,
@@ -58,16 +62,6 @@ def get_default_audio_path(
     return None
 
 
-@dataclasses.dataclass
-class DisplayPosition:
-    """存储显示器的位置和相关信息"""
-
-    serial_number: str
-    resolution: tuple[int, int]
-    logical_dpi: tuple[float, float]
-    pos: tuple[int, int]
-
-
 @dataclasses.dataclass
 class AppConfig:
     """
@@ -105,16 +99,39 @@ class AppConfig:
     hold_after_exhale_duration: int = 0
     hold_after_exhale_enabled: bool = False
     hold_after_exhale_audio: str | None = None
+    breathing_easing: BreathingEasing = BreathingEasing.SINE
+    # 训练方案 ID，"custom" 使用上面各阶段的设置，内置方案见 breathing_program.py
+    breathing_program: str = "custom"
+    # 自定义的训练方案，格式见 breathing_program.parse_program()
+    breathing_programs: list[dict[str, Any]] = dataclasses.field(default_factory=list)
+    # 用合成的扫频和铃声代替音频文件作为提示音（需要 NumPy）
+    breathing_synth_cues: bool = False
+    # 呼吸动画样式 ID，见 ui/breathing/visuals
+    breathing_visual: str = BreathingVisualStyle.CIRCLE.value
+    # 在呼吸动画左上角显示绘制次数和耗时，用于调试
+    breathing_debug_overlay: bool = False
+    # 长休息和呼吸训练时的背景音，音量为百分比（需要 NumPy）
+    ambient_sound: AmbientSound = AmbientSound.OFF
+    ambient_sound_path: str = ""
+    ambient_volume: int = 30
 
     # 界面设置
     show_circular_timer: bool = True
-    circular_timer_style: CircularTimerStyle = CircularTimerStyle.DEFAULT
+    # 样式 ID，内置样式见 CircularTimerStyle，也可以是第三方样式的 ID
+    circular_timer_style: str = CircularTimerStyle.DEFAULT.value
+    circular_timer_max_fps: int = 20
+    # 进度弧在两次计时之间平滑移动
+    circular_timer_smooth: bool = True
+    show_tray_timer: bool = False
+    show_reviewer_overlay: bool = False
+    show_deck_browser_summary: bool = False
     statusbar_format: StatusBarFormat = (
         StatusBarFormat.ICON_COUNTDOWN_PROGRESS_WITH_TOTAL_TIME
     )
     progress_display_threshold: int = 10
     timer_position: TimerPosition = TimerPosition.TOP_RIGHT
-    saved_timer_positions: dict[str, DisplayPosition] = dataclasses.field(
+    # 屏幕标识符 → [x, y, 宽, 高, DPI_X, DPI_Y, 最近使用时间]，见 ui/position_store.py
+    saved_timer_positions: dict[str, list[int]] = dataclasses.field(
         default_factory=dict
     )
 
@@ -124,6 +141,9 @@ class AppConfig:
     max_break_duration: int = 1800  # 以秒为单位
     last_pomodoro_time: float = 0.0
     last_date: str = ""
+    # 连续完成番茄钟的天数，以及最近一次完成的日期（YYYY-MM-DD）
+    streak_days: int = 0
+    last_streak_date: str = ""
 
 
 # --- 2. 使用 DataclassValidator 简化并修正验证逻辑 ---
@@ -1,8 +1,13 @@
+from collections.abc import Callable
+
 from anki.cards import Card
 from aqt import QTimer, mw
+from aqt.deckbrowser import DeckBrowser, DeckBrowserContent
 from aqt.utils import tooltip
+from aqt.webview import WebContent
 
 from .breathing import start_breathing_exercise
+from .breathing_program import CUSTOM_PROGRAM_ID
 from .config.config import save_config
 from .config.constants import AnkiStates
 from .config.enums import PHASES
@@ -102,6 +107,37 @@ def on_theme_change():
     ):
         timer_widget = pomodoro_manager.ui_updater.circular_timer
         timer_widget.update_theme_colors()
+    if pomodoro_manager and pomodoro_manager.ui_updater.tray_timer:
+        # 托盘图标按主题分别预渲染，立即切换到新主题的图标
+        pomodoro_manager.ui_updater.update(pomodoro_manager.timer_manager)
+
+
+def on_webview_will_set_content(web_content: WebContent, context: object | None):
+    """Injects the countdown overlay into the reviewer page."""
+    from .ui.reviewer_overlay import on_webview_will_set_content as inject_overlay
+
+    inject_overlay(web_content, context)
+
+
+def on_deck_browser_will_render_content(
+    deck_browser: DeckBrowser, content: DeckBrowserContent
+):
+    """Adds the cached pomodoro summary below the deck list."""
+    from .ui.deck_browser_summary import on_deck_browser_will_render_content as render
+
+    render(deck_browser, content)
+
+
+def on_profile_will_close():
+    """
+    Writes pending timer window positions and releases the audio device
+    before the profile closes.
+    """
+    from .audio.engine import shutdown_audio_engine
+    from .ui.screen_index import flush_saved_positions
+
+    flush_saved_positions()
+    shutdown_audio_engine()
 
 
 def _after_pomodoro_finish_tasks():
@@ -111,50 +147,84 @@ def _after_pomodoro_finish_tasks():
     QTimer.singleShot(200, _start_breathing_and_break)
 
 
-def show_breathing_dialog():
-    """Checks config and shows the breathing exercise if appropriate."""
+def show_breathing_dialog(on_finished: Callable[[], None] | None = None):
+    """
+    Checks config and shows the breathing exercise if appropriate.
+
+    The exercise runs in a non-modal window and this function returns
+    immediately; on_finished is called once the exercise completes, is
+    skipped, or is not shown at all. If an exercise is already running,
+    on_finished waits for that exercise to end.
+    """
+
+    def finish():
+        if on_finished:
+            on_finished()
+
     config = get_config()
     if not config.enabled:
+        finish()
         return
 
-    any_phase_enabled = any(
-        getattr(config, f"{p.key}_enabled", p.default_enabled) for p in PHASES
-    )
-    if not any_phase_enabled:
-        tooltip(_("呼吸训练已跳过 (无启用阶段)。"), period=3000)
-        return
-
-    target_cycles = config.breathing_cycles
-    if target_cycles <= 0:
-        tooltip(_("呼吸训练已跳过 (循环次数为 0)。"), period=3000)
+    # 其他训练方案的阶段和循环次数由方案本身决定
+    target_cycles: int | None = None
+    if config.breathing_program == CUSTOM_PROGRAM_ID:
+        any_phase_enabled = any(
+            getattr(config, f"{p.key}_enabled", p.default_enabled) for p in PHASES
+        )
+        if not any_phase_enabled:
+            tooltip(_("呼吸训练已跳过 (无启用阶段)。"), period=3000)
+            finish()
+            return
+
+        target_cycles = config.breathing_cycles
+        if target_cycles <= 0:
+            tooltip(_("呼吸训练已跳过 (循环次数为 0)。"), period=3000)
+            finish()
+            return
+
+    if not (mw and mw.isVisible()):
+        tooltip(_("跳过呼吸训练 (主窗口不可见)。"), period=2000)
+        finish()
         return
 
-    if mw and mw.isVisible():
-        result = start_breathing_exercise(target_cycles, mw)
-        if result:
+    def on_exercise_finished(completed: bool):
+        if completed:
             tooltip(_("呼吸训练完成！"), period=2000)
         else:
             tooltip(_("呼吸训练已跳过。"), period=2000)
-    else:
-        tooltip(_("跳过呼吸训练 (主窗口不可见)。"), period=2000)
+        finish()
+
+    if not start_breathing_exercise(target_cycles, mw, on_exercise_finished):
+        # 训练窗口未能显示，直接继续
+        finish()
 
 
 def _start_breathing_and_break():
     """
-    Starts breathing exercise and then the appropriate break or max break countdown.
+    Starts the breathing exercise; the appropriate break or max break
+    countdown is chained as a continuation once it completes or is skipped.
     """
+    show_breathing_dialog(_start_pending_break)
+
+
+def _start_pending_break():
+    """Starts the pending break or max break countdown after breathing."""
     config = get_config()
     app_state = get_app_state()
     pomodoro_manager = get_pomodoro_manager()
 
-    # Always show breathing dialog
-    show_breathing_dialog()  # This is a blocking call
+    pending_long_break = app_state.pending_break_type
+    app_state.pending_break_type = False
+    # 训练窗口是非模态的，期间可能已经开始了新的番茄钟
+    if (
+        pomodoro_manager is None
+        or pomodoro_manager.timer_manager.state != TimerState.IDLE
+    ):
+        return
 
-    # After breathing, start the pending break or max break countdown
-    if pomodoro_manager and app_state.pending_break_type:
+    if pending_long_break:
         pomodoro_manager.start_long_break()
-        app_state.pending_break_type = False
-
         pomodoro_manager.ui_updater.update(pomodoro_manager.timer_manager)
-    elif pomodoro_manager:
+    else:
         pomodoro_manager.start_max_break_countdown(config.max_break_duration / 60)
@@ -4,9 +4,13 @@ from collections.abc import Callable
 from aqt import QTimer, mw
 from aqt.utils import tooltip
 
+from ..audio.ambient import AMBIENT_LONG_BREAK
+from ..audio.engine import set_ambient_active
 from ..config.constants import AnkiStates
 from ..state import get_app_state
 from ..translator import _
+from ..ui.reviewer_overlay import sync_reviewer_overlay
+from .streak import record_streak_day
 from .timer_manager import TimerManager, TimerState
 from .ui_updater import UiUpdater
 
@@ -14,6 +18,9 @@ from .ui_updater import UiUpdater
 class PomodoroManager:
     """协调 TimerManager, UiUpdater 和 AppState 来实现番茄钟功能。"""
 
+    # 番茄钟剩余时间不超过该值（秒）时预先准备呼吸训练的窗口和提示音
+    BREATHING_PREWARM_SECONDS = 60
+
     def __init__(self):
         self.app_state = get_app_state()
         self.timer_manager = TimerManager(mw)
@@ -25,9 +32,12 @@ class PomodoroManager:
         # 连接计时器事件
         self.timer_manager.on_tick = self.on_timer_tick
         self.timer_manager.on_finish = self.on_timer_finish
+        self.timer_manager.on_state_change = self.on_timer_state_change
 
         self._max_break_timer: QTimer | None = None
         self._init_max_break_timer()
+        # 本次番茄钟是否已经预先准备了呼吸训练
+        self._breathing_prewarmed = False
 
         # 在 AppState 中注册此实例
         self.app_state.pomodoro_manager = self
@@ -48,6 +58,24 @@ class PomodoroManager:
                 "daily_pomodoro_seconds", current_daily_seconds + 1
             )
 
+        if (
+            self.timer_manager.state == TimerState.WORKING
+            and not self._breathing_prewarmed
+            and self.timer_manager.remaining_seconds <= self.BREATHING_PREWARM_SECONDS
+        ):
+            self._breathing_prewarmed = True
+            # 在事件循环空闲时进行，不推迟本次更新
+            QTimer.singleShot(0, self._prewarm_breathing)
+
+    def on_timer_state_change(self):
+        """计时器开始、停止或结束时，把新的截止时间交给复习界面，并开始或停止背景音"""
+        sync_reviewer_overlay(self.timer_manager)
+        set_ambient_active(
+            AMBIENT_LONG_BREAK,
+            self.timer_manager.state == TimerState.LONG_BREAK,
+            self.app_state.config,
+        )
+
     def on_timer_finish(self, finished_state: TimerState):
         """处理计时器完成事件"""
         match finished_state:
@@ -58,6 +86,7 @@ class PomodoroManager:
                 self.app_state.update_config_value("last_pomodoro_time", time.time())
                 completed = self.app_state.config.completed_pomodoros + 1
                 self.app_state.update_config_value("completed_pomodoros", completed)
+                record_streak_day(self.app_state)
 
                 # 调用钩子函数
                 if self.on_pomodoro_finished_callback:
@@ -76,6 +105,16 @@ class PomodoroManager:
         # 确保UI更新到空闲状态
         self.ui_updater.update(self.timer_manager)
 
+    def _prewarm_breathing(self):
+        """在番茄钟结束前准备好呼吸训练，结束时窗口可以立即显示"""
+        from ..breathing import prewarm_breathing_exercise
+
+        if (
+            self.app_state.config.enabled
+            and self.timer_manager.state == TimerState.WORKING
+        ):
+            prewarm_breathing_exercise()
+
     def start_pomodoro(self):
         """启动一个新的番茄钟"""
         config = self.app_state.config
@@ -91,6 +130,7 @@ class PomodoroManager:
             return
 
         self._check_long_idle_period()
+        self._breathing_prewarmed = False
         self.timer_manager.start(config.pomodoro_minutes, TimerState.WORKING)
         tooltip(
             _("番茄钟计时器已启动，时长: {} 分钟。").format(config.pomodoro_minutes),
@@ -136,7 +176,9 @@ class PomodoroManager:
 
     def start_max_break_countdown(self, duration_minutes: float):
         """启动最长休息时间倒计时"""
-        self.stop_max_break_countdown()  # Stop any existing timer
+        # 只停止超时计时器，主计时器由 start() 直接切换到新状态，状态只通知一次
+        if self._max_break_timer and self._max_break_timer.isActive():
+            self._max_break_timer.stop()
         if self._max_break_timer:
             # Start the main timer for UI updates
             self.timer_manager.start(duration_minutes, TimerState.MAX_BREAK_COUNTDOWN)
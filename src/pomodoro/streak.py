@@ -0,0 +1,29 @@
+import datetime
+
+from ..config.types import AppConfig
+from ..state import AppState
+
+
+def _today_and_yesterday() -> tuple[str, str]:
+    """今天和昨天的日期（YYYY-MM-DD，与 last_date 格式相同）"""
+    today = datetime.date.today()
+    return today.isoformat(), (today - datetime.timedelta(days=1)).isoformat()
+
+
+def current_streak(config: AppConfig) -> int:
+    """连续完成番茄钟的天数，昨天和今天都没有完成时为 0"""
+    today, yesterday = _today_and_yesterday()
+    if config.last_streak_date in (today, yesterday):
+        return config.streak_days
+    return 0
+
+
+def record_streak_day(app_state: AppState) -> None:
+    """完成一个番茄钟后更新连续天数，每天只计一次"""
+    config = app_state.config
+    today, yesterday = _today_and_yesterday()
+    if config.last_streak_date == today:
+        return
+    streak = config.streak_days + 1 if config.last_streak_date == yesterday else 1
+    app_state.update_config_value("streak_days", streak)
+    app_state.update_config_value("last_streak_date", today)
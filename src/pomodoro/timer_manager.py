@@ -25,6 +25,7 @@ class TimerManager(QWidget):
         # Callbacks
         self.on_tick: Callable[[], None] | None = None
         self.on_finish: Callable[[TimerState], None] | None = None
+        self.on_state_change: Callable[[], None] | None = None
 
         # Main timer for both work and break
         self._timer = QTimer(self)
@@ -39,13 +40,18 @@ class TimerManager(QWidget):
         self.remaining_seconds = self.total_seconds
         self.state = state
         self._timer.start(1000)  # 每秒触发一次
+        if self.on_state_change:
+            self.on_state_change()
         if self.on_tick:
             self.on_tick()  # 立即触发一次以更新UI
 
     def stop(self):
-        """停止计时器"""
+        """停止计时器，已经停止时不再通知状态改变"""
+        changed = self.state != TimerState.IDLE or self._timer.isActive()
         self._timer.stop()
         self.state = TimerState.IDLE
+        if changed and self.on_state_change:
+            self.on_state_change()
         if self.on_tick:
             self.on_tick()  # 更新UI到空闲状态
 
@@ -61,3 +67,7 @@ class TimerManager(QWidget):
             self.state = TimerState.IDLE
             if self.on_finish:
                 self.on_finish(original_state)  # 传递刚刚完成的状态
+            # on_finish 可能已经开始了下一个计时（如最长休息倒计时），
+            # start() 会通知新的状态，这里只通知停在空闲状态的情况
+            if self.state == TimerState.IDLE and self.on_state_change:
+                self.on_state_change()
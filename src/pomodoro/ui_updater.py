@@ -1,3 +1,5 @@
+import time
+
 from aqt import QWidget
 
 from ..config.constants import Defaults
@@ -10,6 +12,7 @@ from ..ui.circularTimer import (
     setup_circular_timer,
 )
 from ..ui.statusbar import show_timer_in_statusbar
+from ..ui.tray import TrayTimer
 from .timer_manager import TimerManager, TimerState
 
 
@@ -18,32 +21,39 @@ class UiUpdater:
 
     def __init__(self):
         self.circular_timer: BaseCircularTimer | None = None
+        self.tray_timer: TrayTimer | None = None
         self._setup_circular_timer_if_needed()
+        self._setup_tray_timer_if_needed()
 
     def _setup_circular_timer_if_needed(self):
-        """如果需要，则创建圆形计时器。"""
+        """如果需要，则创建圆形计时器；已有窗口时原地切换到配置的样式。"""
         config = get_app_state().config
         if config.show_circular_timer:
-            parent_widget = (
-                self.circular_timer.parent() if self.circular_timer else None
-            )
-            if not self.circular_timer or (
-                isinstance(parent_widget, QWidget) and not parent_widget.isVisible()
-            ):
-                # 从配置中获取计时器样式
-                circular_timer_style = config.circular_timer_style
-                # 获取对应的计时器类
-                timer_class = get_timer_class(circular_timer_style)
-                # 使用通用的setup函数创建计时器
-                new_timer = setup_circular_timer(timer_class)
-                if new_timer:
-                    self.circular_timer = new_timer
+            # 从配置中获取计时器样式对应的类
+            timer_class = get_timer_class(config.circular_timer_style)
+            # 窗口已存在时只替换其中的计时器控件
+            self.circular_timer = setup_circular_timer(timer_class)
         elif self.circular_timer:
             parent_widget = self.circular_timer.parent()
             if isinstance(parent_widget, QWidget):
                 parent_widget.close()
             self.circular_timer = None
 
+    def _setup_tray_timer_if_needed(self):
+        """根据配置创建或隐藏系统托盘计时器。"""
+        config = get_app_state().config
+        if config.enabled and config.show_tray_timer and TrayTimer.is_available():
+            if self.tray_timer is None:
+                self.tray_timer = TrayTimer()
+        elif self.tray_timer:
+            self.tray_timer.close()
+            self.tray_timer = None
+
+    def apply_config(self):
+        """配置改变后调用，更新圆形计时器和托盘计时器的显示状态和样式。"""
+        self._setup_circular_timer_if_needed()
+        self._setup_tray_timer_if_needed()
+
     def update(self, timer_manager: TimerManager):
         """根据 TimerManager 的状态更新所有UI组件。"""
         app_state = get_app_state()
@@ -64,6 +74,15 @@ class UiUpdater:
         # 更新圆形计时器
         self._update_circular_timer_progress(timer_manager)
 
+        # 更新托盘计时器（图标只在量化进度变化时更换）
+        if self.tray_timer:
+            self.tray_timer.update(
+                timer_manager.state,
+                timer_manager.remaining_seconds,
+                timer_manager.total_seconds,
+                self._get_statusbar_text(timer_manager, app_state.config),
+            )
+
     def _get_statusbar_text(
         self, timer_manager: TimerManager, config: AppConfig
     ) -> str:
@@ -161,8 +180,19 @@ class UiUpdater:
                 self.circular_timer.set_progress(
                     timer_manager.remaining_seconds, timer_manager.total_seconds
                 )
+                if get_app_state().config.circular_timer_smooth:
+                    # 每次计时都重新对齐截止时间，弧线与倒计时文本保持一致
+                    deadline = time.monotonic() + timer_manager.remaining_seconds
+                    self.circular_timer.set_deadline(
+                        deadline - timer_manager.total_seconds, deadline
+                    )
+                else:
+                    self.circular_timer.clear_deadline()
+                self.circular_timer.set_active(True)
             case _:  # 空闲或完成
+                self.circular_timer.clear_deadline()
                 self.circular_timer.set_progress(0, 1)
+                self.circular_timer.set_active(False)
 
     def cleanup(self):
         """清理所有UI资源。"""
@@ -171,3 +201,6 @@ class UiUpdater:
             if parent and isinstance(parent, QWidget):
                 parent.close()
             self.circular_timer = None
+        if self.tray_timer:
+            self.tray_timer.close()
+            self.tray_timer = None
@@ -1,13 +1,14 @@
 import time
+from collections.abc import Hashable
 
 from aqt import (
-    QBrush,
     QColor,
     QDialog,
     QMainWindow,
     QPainter,
     QPaintEvent,
-    QPointF,
+    QRect,
+    QResizeEvent,
     QSizePolicy,
     Qt,
     QTimer,
@@ -15,23 +16,41 @@ from aqt import (
     mw,
 )
 
-from ...config.enums import BreathingPhase
+from ...breathing_easing import EasingTable, phase_envelope
+from ...config.enums import BreathingEasing, BreathingPhase
+from ..circularTimer.core.base import FrameStats, FrameStatsRecorder
+from .visuals import BreathingVisual, create_visual
 
 
 # --- Breathing Animation Widget ---
 class BreathingAnimationWidget(QWidget):
-    """Displays the expanding/contracting circle animation for breathing."""
+    """
+    Displays the breathing animation using a registered visualization
+    (circle by default, see visuals.BREATHING_VISUALS).
+
+    Frames are scheduled only when the visualization moves by at least one
+    device pixel, and only its bounding box is invalidated. Hold phases
+    draw a single frame and leave the timer stopped.
+    """
+
+    # Shortest interval between frames (ms), ~60 fps
+    MIN_FRAME_INTERVAL_MS = 16
+    # Number of recent frames used for the paint statistics
+    STATS_WINDOW = 120
+    # Area of the debug overlay in the top-left corner
+    DEBUG_OVERLAY_RECT = QRect(4, 4, 200, 36)
 
     def __init__(self, parent: QMainWindow | QDialog = mw):
         super().__init__(parent)
         self._current_phase_key: BreathingPhase = BreathingPhase.INHALE
         self._phase_duration_ms = 4000
+        self._envelope = phase_envelope(self._current_phase_key, BreathingEasing.LINEAR)
         self._animation_timer = QTimer(self)
+        self._animation_timer.setSingleShot(True)
+        self._animation_timer.setTimerType(Qt.TimerType.PreciseTimer)
         self._animation_timer.timeout.connect(self._update_animation)
-        self._start_time = time.time()
+        self._start_time = time.monotonic()
         self._progress = 0.0
-        self._min_radius_ratio = 0.2
-        self._max_radius_ratio = 0.8
         # Define colors using QColor constants or hex strings
         self._color_inhale = QColor("#87CEEB")  # Sky Blue
         self._color_hold = QColor("#ADD8E6")  # Light Blue
@@ -39,94 +58,195 @@ class BreathingAnimationWidget(QWidget):
         self.setMinimumSize(150, 150)
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
 
-    def set_phase(self, phase_key: BreathingPhase, duration_seconds: int):
-        """Sets the current breathing phase and its duration."""
+        # Cached geometry for the selected visualization
+        self._visual: BreathingVisual = create_visual(None)
+        # Key and bounding box of the last requested frame
+        self._last_frame_key: Hashable | None = None
+        self._last_rect = QRect()
+
+        # Paint statistics, shown in the debug overlay
+        self.show_debug_overlay = False
+        self._paint_count = 0
+        self._frame_stats = FrameStatsRecorder(self.STATS_WINDOW)
+
+    def set_phase(
+        self,
+        phase_key: BreathingPhase,
+        duration_seconds: float,
+        started_at: float | None = None,
+        envelope: EasingTable | None = None,
+    ):
+        """
+        Sets the current breathing phase and its duration.
+
+        Args:
+            started_at: Scheduled phase start on the time.monotonic() clock,
+                so the animation follows the controller's schedule.
+            envelope: Precomputed breath amplitude over the phase
+                (linear if omitted).
+        """
         self._current_phase_key = phase_key
         self._phase_duration_ms = duration_seconds * 1000
-        self._start_time = time.time()
-        self._progress = 0.0
+        if envelope is None:
+            envelope = phase_envelope(phase_key, BreathingEasing.LINEAR)
+        self._envelope = envelope
+        self._start_time = time.monotonic() if started_at is None else started_at
         self._animation_timer.stop()  # Stop previous timer explicitly
+        self._update_progress()
+
+        # The color may change with the phase, so always draw the first frame
+        self._invalidate_frame(force=True)
+        if self._is_moving() and self._progress < 1.0:
+            self._schedule_next_frame()
+
+    def reset(
+        self,
+        phase_key: BreathingPhase,
+        duration_seconds: float,
+        envelope: EasingTable | None = None,
+    ):
+        """Shows the first frame of a phase without starting the animation."""
+        self._animation_timer.stop()
+        self._current_phase_key = phase_key
+        self._phase_duration_ms = duration_seconds * 1000
+        if envelope is None:
+            envelope = phase_envelope(phase_key, BreathingEasing.LINEAR)
+        self._envelope = envelope
+        self._start_time = time.monotonic()
+        self._progress = 0.0
+        self._invalidate_frame(force=True)
 
-        if self._phase_duration_ms > 33:
-            # Start timer with a reasonable interval for smooth animation
-            # (e.g., 33ms ~ 30fps)
-            self._animation_timer.start(33)
-            # Initial update to show the start state immediately
-            self.update()
-        else:
-            # If duration is 0, set progress to 1 and update once
-            self._progress = 1.0
-            self.update()
+    def set_visual(self, style_id: str | None):
+        """Switches to another registered visualization."""
+        self._visual = create_visual(style_id)
+        self._last_frame_key = None
+        self._last_rect = QRect()
+        self.update()
 
     def stop_animation(self):
         """Stops the animation timer."""
         self._animation_timer.stop()
 
-    def _update_animation(self):
+    def _frame_state(self) -> tuple[BreathingPhase, float, float]:
+        """Returns (phase, level, progress) for the current frame."""
+        # Zero duration phases show the final state immediately
+        progress = self._progress if self._phase_duration_ms > 0 else 1.0
+        return self._current_phase_key, self._envelope.at(progress), progress
+
+    def _pixel_span(self) -> float:
+        """Device pixels the visualization moves over the phase at its fastest."""
+        self._visual.ensure_geometry(self.size(), self.devicePixelRatioF())
+        span = (
+            self._visual.pixel_span(self._current_phase_key) * self.devicePixelRatioF()
+        )
+        # Sized for the steepest part of the curve; frames that did not move
+        # a whole pixel are skipped in _invalidate_frame
+        if not self._envelope.is_constant:
+            span *= self._envelope.max_slope
+        return span
+
+    def _is_moving(self) -> bool:
+        """Whether the visualization changes during the current phase."""
+        return self._phase_duration_ms > 0 and self._pixel_span() > 0
+
+    def _update_progress(self):
         """Updates the animation progress based on elapsed time."""
-        elapsed_ms = (time.time() - self._start_time) * 1000
         if self._phase_duration_ms > 0:
-            self._progress = min(1.0, elapsed_ms / self._phase_duration_ms)
+            elapsed_ms = (time.monotonic() - self._start_time) * 1000
+            self._progress = min(1.0, max(0.0, elapsed_ms / self._phase_duration_ms))
         else:
-            # Should not be called if duration is 0 as timer isn't started,
-            # but handle defensively
             self._progress = 1.0
 
-        self.update()  # Request a repaint
+    def _update_animation(self):
+        """Advances the animation and requests a repaint if the frame changed."""
+        self._update_progress()
+        self._invalidate_frame()
+        if self._progress < 1.0:
+            self._schedule_next_frame()
+
+    def _schedule_next_frame(self):
+        """Arms the timer for when the visualization has moved one device pixel."""
+        pixel_span = self._pixel_span()
+        if pixel_span >= 1:
+            interval_ms = self._phase_duration_ms / pixel_span
+        else:
+            interval_ms = self._phase_duration_ms
+        remaining_ms = self._phase_duration_ms * (1.0 - self._progress)
+        # The last frame lands exactly on the end of the phase
+        delay_ms = min(max(self.MIN_FRAME_INTERVAL_MS, interval_ms), remaining_ms)
+        self._animation_timer.start(max(0, round(delay_ms)))
+
+    def _invalidate_frame(self, force: bool = False):
+        """Requests a repaint of the visualization's bounds if the frame changed."""
+        self._visual.ensure_geometry(self.size(), self.devicePixelRatioF())
+        state = self._frame_state()
+        frame_key = self._visual.frame_key(*state)
+        if not force and frame_key == self._last_frame_key:
+            return
+
+        rect = self._visual.bounds(*state).toAlignedRect().adjusted(-1, -1, 1, 1)
+        # The previous frame may cover more than the new one
+        dirty = rect.united(self._last_rect)
+        if self.show_debug_overlay:
+            dirty = dirty.united(self.DEBUG_OVERLAY_RECT)
+        self.update(dirty)
+        self._last_frame_key = frame_key
+        self._last_rect = rect
+
+    def _current_color(self) -> QColor:
+        match self._current_phase_key:
+            case BreathingPhase.INHALE:
+                return self._color_inhale
+            case BreathingPhase.EXHALE:
+                return self._color_exhale
+            case BreathingPhase.HOLD_AFTER_INHALE | BreathingPhase.HOLD_AFTER_EXHALE:
+                return self._color_hold
+            case _:
+                return QColor(Qt.GlobalColor.gray)
 
-        # Stop the timer precisely when progress reaches 1.0
-        if self._progress >= 1.0:
-            self._animation_timer.stop()
+    def resizeEvent(self, a0: QResizeEvent | None):
+        """The whole widget is repainted after a resize."""
+        super().resizeEvent(a0)
+        self._last_frame_key = None
+        self._last_rect = QRect()
 
     def paintEvent(self, a0: QPaintEvent | None):
-        """Paints the breathing circle."""
+        """Paints the current frame of the visualization."""
+        start = time.perf_counter()
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
-        width, height = self.width(), self.height()
-        center = QPointF(width / 2, height / 2)
-        # Calculate radius based on the smaller dimension to fit circle
-        max_available_radius = (
-            min(width, height) / 2 * 0.9
-        )  # Use 90% of available space
-        min_radius = max_available_radius * self._min_radius_ratio
-        max_radius = max_available_radius * self._max_radius_ratio
-        radius_range = max_radius - min_radius
-
-        current_radius = min_radius  # Default radius
-        current_color = QColor(Qt.GlobalColor.gray)  # Default color
-
-        # Determine radius and color based on phase and progress
-        match self._current_phase_key:
-            case BreathingPhase.INHALE:
-                # Linear interpolation from min to max radius
-                current_radius = min_radius + radius_range * self._progress
-                current_color = self._color_inhale
-            case BreathingPhase.HOLD_AFTER_INHALE:
-                # Stays at max radius during hold
-                current_radius = max_radius
-                current_color = self._color_hold
-            case BreathingPhase.EXHALE:
-                # Linear interpolation from max to min radius
-                current_radius = max_radius - radius_range * self._progress
-                current_color = self._color_exhale
-            case BreathingPhase.HOLD_AFTER_EXHALE:
-                # Stays at min radius during hold
-                current_radius = min_radius
-                current_color = self._color_hold
-            case _:
-                current_radius = min_radius
-                current_color = QColor(Qt.GlobalColor.gray)
-
-        # Handle zero duration phases to show the final state immediately
-        if self._phase_duration_ms <= 0:
-            match self._current_phase_key:
-                case BreathingPhase.INHALE | BreathingPhase.HOLD_AFTER_INHALE:
-                    current_radius = max_radius
-                case BreathingPhase.EXHALE | BreathingPhase.HOLD_AFTER_EXHALE:
-                    current_radius = min_radius
-
-        # Draw the circle
-        painter.setBrush(QBrush(current_color))
-        painter.setPen(Qt.PenStyle.NoPen)  # No border
-        painter.drawEllipse(center, current_radius, current_radius)
+        self._visual.ensure_geometry(self.size(), self.devicePixelRatioF())
+        self._visual.paint(painter, *self._frame_state(), self._current_color())
+
+        if self.show_debug_overlay:
+            self._paint_debug_overlay(painter)
+        painter.end()
+
+        self._paint_count += 1
+        self._frame_stats.record(start, time.perf_counter() - start)
+
+    def _paint_debug_overlay(self, painter: QPainter):
+        """Draws the paint counters in the top-left corner."""
+        stats = self.get_frame_stats()
+        painter.setPen(self.palette().text().color())
+        painter.drawText(
+            self.DEBUG_OVERLAY_RECT,
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop,
+            f"paints {self._paint_count}  {stats.fps:.1f} fps\n"
+            f"avg {stats.avg_paint_ms:.2f} ms  max {stats.max_paint_ms:.2f} ms",
+        )
+
+    @property
+    def paint_count(self) -> int:
+        """Total number of frames painted."""
+        return self._paint_count
+
+    def reset_frame_stats(self):
+        """Clears the paint statistics, e.g. between sessions."""
+        self._paint_count = 0
+        self._frame_stats.clear()
+
+    def get_frame_stats(self) -> FrameStats:
+        """Returns the frame rate and paint time of the recent frames."""
+        return self._frame_stats.stats()
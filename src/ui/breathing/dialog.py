@@ -11,11 +11,19 @@ from aqt import (
     mw,
 )
 
+from ...breathing_easing import EasingTable
+from ...breathing_plan import PhaseStep
 from ...config.enums import BreathingPhase
+from ...state import get_config
 from ...translator import _
 from .animation import BreathingAnimationWidget
 
 
+def _format_phase(label: str, duration: float) -> str:
+    """阶段名称和时长，频率渐变中的时长保留一位小数"""
+    return f"{label} ({round(duration, 1):g}s)"
+
+
 # --- Breathing Dialog UI ---
 class BreathingDialog(QDialog):
     """Dialog window for the guided breathing exercise based on cycles."""
@@ -28,7 +36,11 @@ class BreathingDialog(QDialog):
         super().__init__(parent or mw)
         self.controller = breathing_controller
         self.setWindowTitle(_("呼吸训练"))
-        self.setModal(True)
+        # 非模态显示，训练期间主窗口和主事件循环照常工作
+        self.setModal(False)
+        # 当前的动画样式，以及第一帧是否已按当前样式绘制过
+        self._visual_id: str | None = None
+        self._frame_warm = False
 
         # 初始化UI组件
         self._init_ui()
@@ -39,7 +51,7 @@ class BreathingDialog(QDialog):
     def _init_ui(self):
         """初始化UI组件"""
         # --- UI Elements ---
-        layout = QVBoxLayout(mw)
+        layout = QVBoxLayout()
         self.animation_widget = BreathingAnimationWidget(self)
         layout.addWidget(self.animation_widget, 1)
 
@@ -49,12 +61,8 @@ class BreathingDialog(QDialog):
             "font-size: 20px; font-weight: bold; margin-top: 10px;"
         )
 
-        self.cycle_label = QLabel(
-            _("循环: {current} / {total}").format(
-                current=1, total=self.controller.target_cycles
-            ),
-            self,
-        )
+        # 循环计数在 prepare() 中按训练计划设置
+        self.cycle_label = QLabel(self)
         self.cycle_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.cycle_label.setStyleSheet("font-size: 16px; margin-bottom: 10px;")
 
@@ -67,24 +75,66 @@ class BreathingDialog(QDialog):
 
         self.resize(300, 350)
 
+    def prepare(self, first_step: PhaseStep, total_cycles: int | None):
+        """
+        在显示前重置为训练开始时的状态。
+        动画样式改变后（包括第一次）在后台绘制一次第一帧，
+        使图形缓存在窗口显示时已经就绪。
+        """
+        config = get_config()
+        if config.breathing_visual != self._visual_id:
+            self.animation_widget.set_visual(config.breathing_visual)
+            self._visual_id = config.breathing_visual
+            self._frame_warm = False
+        self.animation_widget.show_debug_overlay = config.breathing_debug_overlay
+
+        self.instruction_label.setText(
+            _format_phase(first_step.label, first_step.duration)
+        )
+        self.update_cycle_display(1, total_cycles)
+        self.animation_widget.reset(
+            first_step.phase, first_step.duration, first_step.envelope
+        )
+
+        if not self._frame_warm:
+            layout = self.layout()
+            if layout is not None:
+                layout.activate()
+            self.animation_widget.grab()
+            self.animation_widget.reset_frame_stats()
+            self._frame_warm = True
+
     def _connect_signals(self):
         """连接信号和槽"""
         self.skip_button.clicked.connect(self.reject)
 
     def update_phase_display(
-        self, label: str, duration: int, phase_key: BreathingPhase
+        self,
+        label: str,
+        duration: float,
+        phase_key: BreathingPhase,
+        started_at: float | None = None,
+        envelope: EasingTable | None = None,
     ):
-        """更新当前阶段的显示"""
-        self.instruction_label.setText(f"{label} ({duration}s)")
-        self.animation_widget.set_phase(phase_key, duration)
-
-    def update_cycle_display(self, current_cycle: int, total_cycles: int):
-        """更新循环计数的显示"""
-        self.cycle_label.setText(
-            _("循环: {current} / {total}").format(
+        """
+        更新当前阶段的显示。
+
+        Args:
+            started_at: 阶段的计划开始时间（time.monotonic()），默认为现在
+            envelope: 阶段的幅度曲线，默认为线性
+        """
+        self.instruction_label.setText(_format_phase(label, duration))
+        self.animation_widget.set_phase(phase_key, duration, started_at, envelope)
+
+    def update_cycle_display(self, current_cycle: int, total_cycles: int | None):
+        """更新循环计数的显示，不限次数时只显示当前循环"""
+        if total_cycles is None:
+            text = _("循环: {current}").format(current=current_cycle)
+        else:
+            text = _("循环: {current} / {total}").format(
                 current=current_cycle, total=total_cycles
             )
-        )
+        self.cycle_label.setText(text)
 
     def stop_all_timers(self):
         """停止所有计时器"""
@@ -0,0 +1,17 @@
+from .base import BreathingVisual
+from .registry import (
+    BREATHING_VISUALS,
+    BreathingVisualEntry,
+    create_visual,
+    list_breathing_visuals,
+    register_breathing_visual,
+)
+
+__all__ = [
+    "create_visual",
+    "list_breathing_visuals",
+    "register_breathing_visual",
+    "BREATHING_VISUALS",
+    "BreathingVisualEntry",
+    "BreathingVisual",
+]
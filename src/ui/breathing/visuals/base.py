@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+from collections.abc import Hashable
+
+from aqt import QColor, QPainter, QRectF, QSize
+
+from ....config.enums import BreathingPhase
+
+
+class BreathingVisual(ABC):
+    """
+    呼吸动画样式的抽象基类。
+
+    几何图形（QPainterPath、精灵图等）只在控件尺寸或设备像素比改变时
+    由 build() 预先生成，每帧只对缓存的图形做选择或变换。
+
+    每一帧由 (阶段, 幅度, 进度) 决定: 幅度来自阶段的幅度曲线（0 为最小，1 为最大），
+    进度是阶段内的归一化时间。
+    """
+
+    def __init__(self):
+        self._size = QSize()
+        self._dpr = 0.0
+
+    def ensure_geometry(self, size: QSize, dpr: float) -> None:
+        """尺寸或设备像素比改变时重新生成缓存的图形"""
+        if size == self._size and dpr == self._dpr:
+            return
+        self._size = QSize(size)
+        self._dpr = dpr
+        self.build(size, dpr)
+
+    @abstractmethod
+    def build(self, size: QSize, dpr: float) -> None:
+        """为指定尺寸和设备像素比预先生成图形"""
+
+    @abstractmethod
+    def pixel_span(self, phase: BreathingPhase) -> float:
+        """
+        匀速进行时，一个阶段内图形移动的距离（逻辑像素），用于安排重绘。
+        图形在该阶段内静止时返回 0。
+        """
+
+    @abstractmethod
+    def frame_key(
+        self, phase: BreathingPhase, level: float, progress: float
+    ) -> Hashable:
+        """帧的标识（以设备像素为单位），只有改变时才需要重绘"""
+
+    @abstractmethod
+    def bounds(self, phase: BreathingPhase, level: float, progress: float) -> QRectF:
+        """该帧需要重绘的区域"""
+
+    @abstractmethod
+    def paint(
+        self,
+        painter: QPainter,
+        phase: BreathingPhase,
+        level: float,
+        progress: float,
+        color: QColor,
+    ) -> None:
+        """绘制一帧"""
@@ -0,0 +1,92 @@
+from collections.abc import Hashable
+from typing import override
+
+from aqt import QColor, QPainter, QPainterPath, QPen, QPointF, QRectF, QSize, Qt
+
+from ....config.enums import BreathingPhase
+from .base import BreathingVisual
+
+
+class BoxVisual(BreathingVisual):
+    """
+    方块呼吸: 圆点沿正方形的边移动。
+    吸气时沿左边上升，屏气时沿上边向右，呼气时沿右边下降，屏气时沿下边向左。
+    正方形内部按幅度填充。
+    """
+
+    SIDE_RATIO = 0.7
+    DOT_RADIUS = 8.0
+    LINE_WIDTH = 3.0
+
+    def __init__(self):
+        super().__init__()
+        self._square = QRectF()
+        # 正方形的边框，只在尺寸改变时生成
+        self._outline = QPainterPath()
+        self._dot = QPainterPath()
+
+    @override
+    def build(self, size: QSize, dpr: float) -> None:
+        side = min(size.width(), size.height()) * self.SIDE_RATIO
+        self._square = QRectF(
+            (size.width() - side) / 2, (size.height() - side) / 2, side, side
+        )
+        self._outline = QPainterPath()
+        self._outline.addRect(self._square)
+        self._dot = QPainterPath()
+        self._dot.addEllipse(QPointF(0, 0), self.DOT_RADIUS, self.DOT_RADIUS)
+
+    def _dot_position(
+        self, phase: BreathingPhase, level: float, progress: float
+    ) -> QPointF:
+        square = self._square
+        y = square.bottom() - square.height() * level
+        match phase:
+            case BreathingPhase.INHALE:
+                return QPointF(square.left(), y)
+            case BreathingPhase.HOLD_AFTER_INHALE:
+                return QPointF(square.left() + square.width() * progress, y)
+            case BreathingPhase.EXHALE:
+                return QPointF(square.right(), y)
+            case _:
+                return QPointF(square.right() - square.width() * progress, y)
+
+    @override
+    def pixel_span(self, phase: BreathingPhase) -> float:
+        return self._square.width()
+
+    @override
+    def frame_key(
+        self, phase: BreathingPhase, level: float, progress: float
+    ) -> Hashable:
+        dot = self._dot_position(phase, level, progress)
+        return round(dot.x() * self._dpr), round(dot.y() * self._dpr)
+
+    @override
+    def bounds(self, phase: BreathingPhase, level: float, progress: float) -> QRectF:
+        margin = self.DOT_RADIUS + self.LINE_WIDTH
+        return self._square.adjusted(-margin, -margin, margin, margin)
+
+    @override
+    def paint(
+        self,
+        painter: QPainter,
+        phase: BreathingPhase,
+        level: float,
+        progress: float,
+        color: QColor,
+    ) -> None:
+        fill_color = QColor(color)
+        fill_color.setAlpha(80)
+        fill = QRectF(self._square)
+        fill.setTop(self._square.bottom() - self._square.height() * level)
+        painter.fillRect(fill, fill_color)
+
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.setPen(QPen(color, self.LINE_WIDTH))
+        painter.drawPath(self._outline)
+
+        painter.save()
+        painter.translate(self._dot_position(phase, level, progress))
+        painter.fillPath(self._dot, color.darker(130))
+        painter.restore()
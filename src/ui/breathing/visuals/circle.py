@@ -0,0 +1,74 @@
+from collections.abc import Hashable
+from typing import override
+
+from aqt import QColor, QPainter, QPainterPath, QPointF, QRectF, QSize
+
+from ....config.enums import BreathingPhase
+from .base import BreathingVisual
+
+
+class CircleVisual(BreathingVisual):
+    """随呼吸放大和缩小的实心圆"""
+
+    MIN_RADIUS_RATIO = 0.2
+    MAX_RADIUS_RATIO = 0.8
+
+    def __init__(self):
+        super().__init__()
+        self._center = QPointF()
+        self._min_radius = 0.0
+        self._max_radius = 0.0
+        # 以原点为圆心、半径为最大半径的圆，每帧只做缩放
+        self._path = QPainterPath()
+
+    @override
+    def build(self, size: QSize, dpr: float) -> None:
+        width, height = size.width(), size.height()
+        self._center = QPointF(width / 2, height / 2)
+        # 使用较短边 90% 的空间
+        max_available_radius = min(width, height) / 2 * 0.9
+        self._min_radius = max_available_radius * self.MIN_RADIUS_RATIO
+        self._max_radius = max_available_radius * self.MAX_RADIUS_RATIO
+
+        self._path = QPainterPath()
+        self._path.addEllipse(QPointF(0, 0), self._max_radius, self._max_radius)
+
+    def _radius(self, level: float) -> float:
+        return self._min_radius + (self._max_radius - self._min_radius) * level
+
+    @override
+    def pixel_span(self, phase: BreathingPhase) -> float:
+        if phase in (BreathingPhase.INHALE, BreathingPhase.EXHALE):
+            return self._max_radius - self._min_radius
+        return 0.0
+
+    @override
+    def frame_key(
+        self, phase: BreathingPhase, level: float, progress: float
+    ) -> Hashable:
+        return round(self._radius(level) * self._dpr)
+
+    @override
+    def bounds(self, phase: BreathingPhase, level: float, progress: float) -> QRectF:
+        radius = self._radius(level)
+        return QRectF(
+            self._center.x() - radius, self._center.y() - radius, radius * 2, radius * 2
+        )
+
+    @override
+    def paint(
+        self,
+        painter: QPainter,
+        phase: BreathingPhase,
+        level: float,
+        progress: float,
+        color: QColor,
+    ) -> None:
+        if self._max_radius <= 0:
+            return
+        scale = self._radius(level) / self._max_radius
+        painter.save()
+        painter.translate(self._center)
+        painter.scale(scale, scale)
+        painter.fillPath(self._path, color)
+        painter.restore()
@@ -0,0 +1,118 @@
+import math
+from collections.abc import Hashable
+from typing import override
+
+from aqt import (
+    QColor,
+    QPainter,
+    QPixmap,
+    QPointF,
+    QRadialGradient,
+    QRectF,
+    QSize,
+    Qt,
+)
+
+from ....config.enums import BreathingPhase
+from .base import BreathingVisual
+
+
+class ParticleRingVisual(BreathingVisual):
+    """由光点组成、随呼吸扩散和收拢的圆环"""
+
+    PARTICLES = 24
+    PARTICLE_RADIUS = 6.0
+    MIN_RADIUS_RATIO = 0.25
+    MAX_RADIUS_RATIO = 0.8
+
+    def __init__(self):
+        super().__init__()
+        self._center = QPointF()
+        self._min_radius = 0.0
+        self._max_radius = 0.0
+        # 每个光点在单位圆上的方向
+        self._directions: tuple[tuple[float, float], ...] = tuple(
+            (math.cos(angle), math.sin(angle))
+            for angle in (
+                2 * math.pi * i / self.PARTICLES for i in range(self.PARTICLES)
+            )
+        )
+        # 按颜色缓存的光点精灵图
+        self._sprites: dict[int, QPixmap] = {}
+
+    @override
+    def build(self, size: QSize, dpr: float) -> None:
+        width, height = size.width(), size.height()
+        self._center = QPointF(width / 2, height / 2)
+        max_available_radius = min(width, height) / 2 * 0.9 - self.PARTICLE_RADIUS
+        self._min_radius = max_available_radius * self.MIN_RADIUS_RATIO
+        self._max_radius = max_available_radius * self.MAX_RADIUS_RATIO
+        # 设备像素比改变后需要重新生成精灵图
+        self._sprites.clear()
+
+    def _sprite(self, color: QColor) -> QPixmap:
+        """按当前设备像素比生成一个带柔和边缘的光点"""
+        key = color.rgba()
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            return sprite
+
+        size = math.ceil(self.PARTICLE_RADIUS * 2 * self._dpr)
+        sprite = QPixmap(size, size)
+        sprite.setDevicePixelRatio(self._dpr)
+        sprite.fill(Qt.GlobalColor.transparent)
+
+        r = self.PARTICLE_RADIUS
+        gradient = QRadialGradient(QPointF(r, r), r)
+        gradient.setColorAt(0.0, color)
+        gradient.setColorAt(0.6, color)
+        gradient.setColorAt(1.0, QColor(color.red(), color.green(), color.blue(), 0))
+        painter = QPainter(sprite)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(gradient)
+        painter.drawEllipse(QPointF(r, r), r, r)
+        painter.end()
+
+        self._sprites[key] = sprite
+        return sprite
+
+    def _radius(self, level: float) -> float:
+        return self._min_radius + (self._max_radius - self._min_radius) * level
+
+    @override
+    def pixel_span(self, phase: BreathingPhase) -> float:
+        if phase in (BreathingPhase.INHALE, BreathingPhase.EXHALE):
+            return self._max_radius - self._min_radius
+        return 0.0
+
+    @override
+    def frame_key(
+        self, phase: BreathingPhase, level: float, progress: float
+    ) -> Hashable:
+        return round(self._radius(level) * self._dpr)
+
+    @override
+    def bounds(self, phase: BreathingPhase, level: float, progress: float) -> QRectF:
+        radius = self._radius(level) + self.PARTICLE_RADIUS
+        return QRectF(
+            self._center.x() - radius, self._center.y() - radius, radius * 2, radius * 2
+        )
+
+    @override
+    def paint(
+        self,
+        painter: QPainter,
+        phase: BreathingPhase,
+        level: float,
+        progress: float,
+        color: QColor,
+    ) -> None:
+        sprite = self._sprite(color)
+        radius = self._radius(level)
+        offset = self.PARTICLE_RADIUS
+        cx, cy = self._center.x(), self._center.y()
+        for dx, dy in self._directions:
+            painter.drawPixmap(
+                QPointF(cx + dx * radius - offset, cy + dy * radius - offset), sprite
+            )
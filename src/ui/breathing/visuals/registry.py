@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+
+from ....config.enums import BreathingVisualStyle
+from ....translator import _
+from .base import BreathingVisual
+from .box import BoxVisual
+from .circle import CircleVisual
+from .particles import ParticleRingVisual
+from .wave import WaveVisual
+
+
+@dataclass(frozen=True)
+class BreathingVisualEntry:
+    """呼吸动画样式的注册信息"""
+
+    style_id: str
+    display_name: str
+    visual_class: type[BreathingVisual]
+
+
+BREATHING_VISUALS: dict[str, BreathingVisualEntry] = {
+    entry.style_id: entry
+    for entry in (
+        BreathingVisualEntry(
+            style_id=BreathingVisualStyle.CIRCLE.value,
+            display_name=_("圆形"),
+            visual_class=CircleVisual,
+        ),
+        BreathingVisualEntry(
+            style_id=BreathingVisualStyle.BOX.value,
+            display_name=_("方块呼吸"),
+            visual_class=BoxVisual,
+        ),
+        BreathingVisualEntry(
+            style_id=BreathingVisualStyle.WAVE.value,
+            display_name=_("水波"),
+            visual_class=WaveVisual,
+        ),
+        BreathingVisualEntry(
+            style_id=BreathingVisualStyle.PARTICLE_RING.value,
+            display_name=_("粒子环"),
+            visual_class=ParticleRingVisual,
+        ),
+    )
+}
+
+
+def create_visual(style_id: str | None = None) -> BreathingVisual:
+    """
+    根据样式 ID 创建呼吸动画样式。
+
+    Args:
+        style_id: 样式 ID，为 None 或未知时使用圆形
+    """
+    default_key = BreathingVisualStyle.CIRCLE.value
+    style_key = default_key if style_id is None else style_id
+    if style_key not in BREATHING_VISUALS:
+        print(f"警告: 未知的呼吸动画样式 '{style_key}'，使用默认样式 '{default_key}'")
+        style_key = default_key
+    return BREATHING_VISUALS[style_key].visual_class()
+
+
+def register_breathing_visual(entry: BreathingVisualEntry) -> None:
+    """
+    注册一个呼吸动画样式。
+
+    Args:
+        entry: 样式的注册信息，visual_class 必须是 BreathingVisual 的子类
+    """
+    if entry.style_id in BREATHING_VISUALS:
+        print(f"警告: 呼吸动画样式 '{entry.style_id}' 已存在，将被覆盖")
+    BREATHING_VISUALS[entry.style_id] = entry
+
+
+def list_breathing_visuals() -> list[BreathingVisualEntry]:
+    """列出所有可用的呼吸动画样式"""
+    return list(BREATHING_VISUALS.values())
@@ -0,0 +1,81 @@
+import math
+from collections.abc import Hashable
+from typing import override
+
+from aqt import QColor, QPainter, QPainterPath, QRectF, QSize
+
+from ....config.enums import BreathingPhase
+from .base import BreathingVisual
+
+
+class WaveVisual(BreathingVisual):
+    """随呼吸上涨和回落的水面"""
+
+    # 水面的最低和最高位置（占高度的比例）
+    MIN_LEVEL_RATIO = 0.15
+    MAX_LEVEL_RATIO = 0.85
+    WAVES = 2  # 控件宽度内的波峰数
+    AMPLITUDE_RATIO = 0.04
+    SAMPLES = 64  # 波形的采样点数
+
+    def __init__(self):
+        super().__init__()
+        self._width = 0.0
+        self._height = 0.0
+        self._amplitude = 0.0
+        # 水面位于 y=0、向下延伸到控件底部的形状，每帧只做平移
+        self._path = QPainterPath()
+
+    @override
+    def build(self, size: QSize, dpr: float) -> None:
+        self._width = float(size.width())
+        self._height = float(size.height())
+        self._amplitude = self._height * self.AMPLITUDE_RATIO
+
+        path = QPainterPath()
+        path.moveTo(0, 0)
+        for i in range(self.SAMPLES + 1):
+            x = self._width * i / self.SAMPLES
+            y = self._amplitude * math.sin(2 * math.pi * self.WAVES * i / self.SAMPLES)
+            path.lineTo(x, y)
+        path.lineTo(self._width, self._height)
+        path.lineTo(0, self._height)
+        path.closeSubpath()
+        self._path = path
+
+    def _surface_y(self, level: float) -> float:
+        ratio = (
+            self.MIN_LEVEL_RATIO + (self.MAX_LEVEL_RATIO - self.MIN_LEVEL_RATIO) * level
+        )
+        return self._height * (1.0 - ratio)
+
+    @override
+    def pixel_span(self, phase: BreathingPhase) -> float:
+        if phase in (BreathingPhase.INHALE, BreathingPhase.EXHALE):
+            return self._height * (self.MAX_LEVEL_RATIO - self.MIN_LEVEL_RATIO)
+        return 0.0
+
+    @override
+    def frame_key(
+        self, phase: BreathingPhase, level: float, progress: float
+    ) -> Hashable:
+        return round(self._surface_y(level) * self._dpr)
+
+    @override
+    def bounds(self, phase: BreathingPhase, level: float, progress: float) -> QRectF:
+        top = self._surface_y(level) - self._amplitude
+        return QRectF(0, top, self._width, self._height - top)
+
+    @override
+    def paint(
+        self,
+        painter: QPainter,
+        phase: BreathingPhase,
+        level: float,
+        progress: float,
+        color: QColor,
+    ) -> None:
+        painter.save()
+        painter.translate(0, self._surface_y(level))
+        painter.fillPath(self._path, color)
+        painter.restore()
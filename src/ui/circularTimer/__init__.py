@@ -1,11 +1,21 @@
 from .core.base import BaseCircularTimer
-from .core.factory import TIMER_STYLES, get_timer_class, register_timer_style
+from .core.factory import (
+    TIMER_STYLES,
+    TimerStyleEntry,
+    get_timer_class,
+    list_timer_styles,
+    register_timer_style,
+    register_timer_style_entry,
+)
 from .core.window import setup_circular_timer
 
 __all__ = [
     "get_timer_class",
+    "list_timer_styles",
     "register_timer_style",
+    "register_timer_style_entry",
     "setup_circular_timer",
     "TIMER_STYLES",
+    "TimerStyleEntry",
     "BaseCircularTimer",
 ]
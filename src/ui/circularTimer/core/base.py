@@ -1,6 +1,13 @@
+import math
+import time
 from abc import ABCMeta, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from typing import override
 
-from aqt import QWidget
+from aqt import QEvent, QHideEvent, QObject, QShowEvent, Qt, QTimer, QWidget, mw
+
+from ....state import get_app_state
 
 
 # Combine the metaclasses of QWidget and ABCMeta to resolve the conflict.
@@ -8,17 +15,91 @@ class QWidgetABCMeta(ABCMeta, type(QWidget)):
     pass
 
 
+@dataclass(frozen=True)
+class FrameStats:
+    """最近一段时间内的绘制统计"""
+
+    fps: float
+    avg_paint_ms: float
+    max_paint_ms: float
+    frames: int
+
+
+class FrameStatsRecorder:
+    """保存最近若干帧的开始时间和绘制耗时，用于计算 FrameStats"""
+
+    def __init__(self, window: int):
+        self._frame_times: deque[float] = deque(maxlen=window)
+        self._paint_durations: deque[float] = deque(maxlen=window)
+
+    def record(self, start: float, duration: float) -> None:
+        """记录一帧（start 为 time.perf_counter() 时间，duration 为秒）"""
+        self._frame_times.append(start)
+        self._paint_durations.append(duration)
+
+    def clear(self) -> None:
+        self._frame_times.clear()
+        self._paint_durations.clear()
+
+    def stats(self) -> FrameStats:
+        """最近若干帧的实际帧率和绘制耗时"""
+        frames = len(self._frame_times)
+        if frames == 0:
+            return FrameStats(fps=0.0, avg_paint_ms=0.0, max_paint_ms=0.0, frames=0)
+
+        span = self._frame_times[-1] - self._frame_times[0]
+        fps = (frames - 1) / span if span > 0 else 0.0
+        avg_paint_ms = sum(self._paint_durations) / frames * 1000
+        max_paint_ms = max(self._paint_durations) * 1000
+        return FrameStats(
+            fps=fps, avg_paint_ms=avg_paint_ms, max_paint_ms=max_paint_ms, frames=frames
+        )
+
+
 class BaseCircularTimer(QWidget, metaclass=QWidgetABCMeta):
     """
     圆形计时器的抽象基类。
     所有计时器样式都必须继承此类并实现抽象方法。
+
+    需要持续动画的样式应将 ANIMATED 设为 True，由基类统一调度重绘：
+    窗口隐藏、最小化、被遮挡或计时器空闲时暂停动画，并按配置限制帧率。
+
+    设置截止时间后进入平滑模式，进度弧在绘制时按单调时钟插值，
+    绘制进度时应使用 current_progress() 而不是 _progress。
     """
 
+    ANIMATED = False
+    # 用于统计帧率和绘制耗时的帧数
+    STATS_WINDOW = 120
+    # 平滑模式下，进度弧每前进多少个设备像素重绘一次
+    ARC_PIXEL_STEP = 1.0
+
     def __init__(self, parent: QWidget | None = None):
         super().__init__(parent)
         self.setMinimumSize(50, 50)
         self._progress = 0.0
         self._remaining_time = "00:00"
+        self._active = False
+
+        # 动画时钟，基于单调时钟，跳帧时不会产生跳变
+        self._clock_origin = time.monotonic()
+
+        # 帧率调度器
+        self._animation_timer = QTimer(self)
+        self._animation_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._animation_timer.timeout.connect(self.update)
+        self._watched_windows: list[QObject] = []
+
+        # 平滑进度：开始时间和截止时间（time.monotonic() 时间）
+        self._segment_start: float | None = None
+        self._deadline: float | None = None
+        self._smooth_timer = QTimer(self)
+        self._smooth_timer.setSingleShot(True)
+        self._smooth_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._smooth_timer.timeout.connect(self.update)
+
+        # 绘制统计
+        self._frame_stats = FrameStatsRecorder(self.STATS_WINDOW)
 
     def set_progress(self, current: float, total: float) -> None:
         """
@@ -32,6 +113,56 @@ class BaseCircularTimer(QWidget, metaclass=QWidgetABCMeta):
         self._remaining_time = self._format_time(current)
         self.update()
 
+    def set_deadline(self, start: float, deadline: float) -> None:
+        """
+        启用平滑模式，进度从 start 时的 1 线性减少到 deadline 时的 0。
+        剩余时间文本仍由 set_progress 更新。
+
+        Args:
+            start: 计时开始时间（time.monotonic()）
+            deadline: 计时结束时间（time.monotonic()）
+        """
+        self._segment_start = start
+        self._deadline = deadline
+        self.update()
+
+    def clear_deadline(self) -> None:
+        """关闭平滑模式，进度弧只随 set_progress 变化"""
+        self._segment_start = None
+        self._deadline = None
+        self._smooth_timer.stop()
+        self.update()
+
+    def current_progress(self) -> float:
+        """获取当前应绘制的进度（0.0-1.0），平滑模式下按当前时间插值"""
+        if self._deadline is None or self._segment_start is None:
+            return self._progress
+        total = self._deadline - self._segment_start
+        if total <= 0:
+            return self._progress
+        remaining = self._deadline - time.monotonic()
+        return min(1.0, max(0.0, remaining / total))
+
+    def set_active(self, active: bool) -> None:
+        """
+        设置计时器是否处于运行状态。
+        空闲时动画样式不再持续重绘。
+        """
+        self._active = active
+        self._update_animation_state()
+
+    def copy_state_from(self, other: "BaseCircularTimer") -> None:
+        """
+        从另一个计时器控件接管进度和运行状态。
+        在窗口内切换样式时使用，新样式无需等待下一次计时器滴答即可显示正确进度。
+        """
+        self._progress = other._progress
+        self._remaining_time = other._remaining_time
+        self._segment_start = other._segment_start
+        self._deadline = other._deadline
+        self.set_active(other._active)
+        self.update()
+
     @abstractmethod
     def update_theme_colors(self) -> None:
         """
@@ -54,6 +185,132 @@ class BaseCircularTimer(QWidget, metaclass=QWidgetABCMeta):
         secs = int(seconds % 60)
         return f"{minutes:02d}:{secs:02d}"
 
+    # --- 动画调度 ---
+
+    def animation_time(self) -> float:
+        """获取动画时钟的当前时间（秒），用于推导动画相位。"""
+        return time.monotonic() - self._clock_origin
+
+    def _max_fps(self) -> int:
+        """从配置中读取帧率上限"""
+        return max(1, get_app_state().config.circular_timer_max_fps)
+
+    def _should_animate(self) -> bool:
+        """判断当前是否需要持续重绘"""
+        if not self.ANIMATED:
+            return False
+        return self._is_on_screen()
+
+    def _is_on_screen(self) -> bool:
+        """计时器运行中，且窗口可见、未最小化、未被完全遮挡"""
+        if not self._active or not self.isVisible():
+            return False
+
+        window = self.window()
+        if window is not None:
+            if window.isMinimized():
+                return False
+            handle = window.windowHandle()
+            if handle is not None and not handle.isExposed():
+                return False
+
+        return not (mw is not None and mw.isMinimized())
+
+    def _update_animation_state(self) -> None:
+        """根据可见性、窗口状态和计时器状态启动或暂停动画"""
+        if self._should_animate():
+            interval = max(1, round(1000 / self._max_fps()))
+            if (
+                not self._animation_timer.isActive()
+                or self._animation_timer.interval() != interval
+            ):
+                self._animation_timer.start(interval)
+        elif self._animation_timer.isActive():
+            self._animation_timer.stop()
+
+    def _watch_windows(self) -> None:
+        """监听所在窗口和主窗口的状态变化（最小化、遮挡等）"""
+        windows: list[QObject] = []
+        window = self.window()
+        if window is not None and window is not self:
+            windows.append(window)
+        if mw is not None and mw not in windows:
+            windows.append(mw)
+
+        for obj in windows:
+            if obj not in self._watched_windows:
+                obj.installEventFilter(self)
+                self._watched_windows.append(obj)
+
+    def _schedule_smooth_repaint(self) -> None:
+        """
+        平滑模式下安排下一次重绘，时间间隔取决于进度弧前进 ARC_PIXEL_STEP
+        个设备像素所需的时间：控件越大、计时越短，重绘越频繁，但不超过帧率上限。
+        """
+        if (
+            self._deadline is None
+            or self._segment_start is None
+            or self._animation_timer.isActive()  # 动画样式已在持续重绘
+            or not self._is_on_screen()
+        ):
+            self._smooth_timer.stop()
+            return
+
+        total = self._deadline - self._segment_start
+        remaining = self._deadline - time.monotonic()
+        if total <= 0 or remaining <= 0:
+            self._smooth_timer.stop()
+            return
+
+        # 进度弧的周长（设备像素）
+        arc_pixels = (
+            math.pi * min(self.width(), self.height()) * self.devicePixelRatioF()
+        )
+        seconds_per_step = total / max(arc_pixels, 1.0) * self.ARC_PIXEL_STEP
+        interval_ms = max(1000 / self._max_fps(), seconds_per_step * 1000)
+        self._smooth_timer.start(max(1, round(min(interval_ms, remaining * 1000))))
+
+    @override
+    def eventFilter(self, a0: QObject | None, a1: QEvent | None) -> bool:
+        if a1 is not None and a1.type() in (
+            QEvent.Type.WindowStateChange,
+            QEvent.Type.Show,
+            QEvent.Type.Hide,
+            QEvent.Type.Expose,
+        ):
+            # 等待事件处理完毕后再检查窗口状态
+            QTimer.singleShot(0, self._update_animation_state)
+        return super().eventFilter(a0, a1)
+
+    @override
+    def showEvent(self, a0: QShowEvent | None) -> None:
+        super().showEvent(a0)
+        self._watch_windows()
+        self._update_animation_state()
+
+    @override
+    def hideEvent(self, a0: QHideEvent | None) -> None:
+        super().hideEvent(a0)
+        self._animation_timer.stop()
+        self._smooth_timer.stop()
+
+    # --- 绘制统计 ---
+
+    @override
+    def event(self, a0: QEvent | None) -> bool:
+        if a0 is None or a0.type() != QEvent.Type.Paint:
+            return super().event(a0)
+
+        start = time.perf_counter()
+        result = super().event(a0)
+        self._frame_stats.record(start, time.perf_counter() - start)
+        self._schedule_smooth_repaint()
+        return result
+
+    def get_frame_stats(self) -> FrameStats:
+        """获取最近若干帧的实际帧率和绘制耗时"""
+        return self._frame_stats.stats()
+
 
 # 类型别名
 type TimerClass = type[BaseCircularTimer]
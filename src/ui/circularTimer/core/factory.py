@@ -1,18 +1,154 @@
+import importlib
+import importlib.util
+import json
+import os
+import sys
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+
 from ....config.constants import Defaults
 from ....config.enums import CircularTimerStyle
-from ..styles.default import CircularTimer as DefaultTimer
-from ..styles.rainbow import CircularTimer as RainbowTimer
-from .base import TimerClass
+from ....translator import _
+from .base import BaseCircularTimer, TimerClass
+
+# 内置样式所在的包，第三方样式也会以该包的子模块身份加载，
+# 因此可以像内置样式一样使用 `from ..core.base import BaseCircularTimer`
+_STYLES_PACKAGE = __package__.rsplit(".", 1)[0] + ".styles"
+
+# 第三方样式目录下每个样式的元数据文件名
+STYLE_MANIFEST_NAME = "manifest.json"
 
-TIMER_STYLES: dict[CircularTimerStyle, TimerClass] = {
-    CircularTimerStyle.DEFAULT: DefaultTimer,
-    CircularTimerStyle.RAINBOW: RainbowTimer,
+
+@dataclass(frozen=True)
+class TimerStyleEntry:
+    """
+    计时器样式的注册信息。
+    只保存模块位置和元数据，样式类在第一次被选中时才导入。
+    """
+
+    style_id: str
+    display_name: str
+    module: str  # 完整的模块名
+    class_name: str = "CircularTimer"
+    version: str = "1"
+    path: Path | None = None  # 第三方样式的源文件，内置样式为 None
+
+    @property
+    def is_builtin(self) -> bool:
+        return self.path is None
+
+
+TIMER_STYLES: dict[str, TimerStyleEntry] = {
+    CircularTimerStyle.DEFAULT.value: TimerStyleEntry(
+        style_id=CircularTimerStyle.DEFAULT.value,
+        display_name=_("默认"),
+        module=f"{_STYLES_PACKAGE}.default",
+    ),
+    CircularTimerStyle.RAINBOW.value: TimerStyleEntry(
+        style_id=CircularTimerStyle.RAINBOW.value,
+        display_name=_("彩虹"),
+        module=f"{_STYLES_PACKAGE}.rainbow",
+    ),
 }
 
+# 已导入的样式类缓存: {style_id: TimerClass}
+_loaded_classes: dict[str, TimerClass] = {}
+_user_styles_discovered = False
+
 
-def get_timer_class(style_name: CircularTimerStyle | None = None) -> TimerClass:
+def _style_key(style_name: str) -> str:
+    """将样式枚举或字符串统一为注册表的键"""
+    return style_name.value if isinstance(style_name, Enum) else style_name
+
+
+def _get_user_styles_dir() -> Path:
+    """获取第三方样式目录的完整路径。"""
+    module_path = os.path.abspath(__file__)
+    package_root = Path(module_path).parents[3]
+    return package_root / "user_files" / "styles"
+
+
+def discover_user_styles() -> list[TimerStyleEntry]:
+    """
+    扫描 user_files/styles 下的第三方样式，只读取元数据而不导入模块。
+
+    每个样式占一个子目录，包含 manifest.json，例如:
+        {"id": "neon", "name": "Neon", "entry": "neon.py",
+         "class": "CircularTimer", "version": "1.0"}
     """
-    根据样式名称获取对应的计时器类。
+    global _user_styles_discovered
+    _user_styles_discovered = True
+
+    styles_dir = _get_user_styles_dir()
+    if not styles_dir.is_dir():
+        return []
+
+    discovered: list[TimerStyleEntry] = []
+    for manifest_path in sorted(styles_dir.glob(f"*/{STYLE_MANIFEST_NAME}")):
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            style_id = str(manifest["id"])
+            entry_path = manifest_path.parent / str(manifest["entry"])
+            entry = TimerStyleEntry(
+                style_id=style_id,
+                display_name=str(manifest.get("name", style_id)),
+                module=f"{_STYLES_PACKAGE}.user_{manifest_path.parent.name}",
+                class_name=str(manifest.get("class", "CircularTimer")),
+                version=str(manifest.get("version", "1")),
+                path=entry_path,
+            )
+        except (OSError, json.JSONDecodeError, KeyError, TypeError) as e:
+            print(f"警告: 无法读取计时器样式元数据 {manifest_path}: {e}")
+            continue
+
+        existing = TIMER_STYLES.get(style_id)
+        if existing and existing.is_builtin:
+            print(f"警告: 第三方样式 '{style_id}' 与内置样式重名，已忽略")
+            continue
+        if not entry_path.is_file():
+            print(f"警告: 计时器样式 '{style_id}' 的入口文件不存在: {entry_path}")
+            continue
+
+        TIMER_STYLES[style_id] = entry
+        discovered.append(entry)
+
+    return discovered
+
+
+def _ensure_user_styles_discovered() -> None:
+    if not _user_styles_discovered:
+        discover_user_styles()
+
+
+def _load_style_class(entry: TimerStyleEntry) -> TimerClass:
+    """导入样式模块并返回其中的计时器类"""
+    if entry.path is None:
+        module = importlib.import_module(entry.module)
+    else:
+        spec = importlib.util.spec_from_file_location(entry.module, entry.path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"无法加载模块 {entry.path}")
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[entry.module] = module
+        try:
+            spec.loader.exec_module(module)
+        except Exception:
+            del sys.modules[entry.module]
+            raise
+
+    timer_class = getattr(module, entry.class_name)
+    if not (
+        isinstance(timer_class, type) and issubclass(timer_class, BaseCircularTimer)
+    ):
+        raise TypeError(f"{entry.class_name} 不是 BaseCircularTimer 的子类")
+    return timer_class
+
+
+def get_timer_class(style_name: str | None = None) -> TimerClass:
+    """
+    根据样式名称获取对应的计时器类，首次使用时才导入样式模块。
 
     Args:
         style_name: 计时器样式，如果为None则使用默认样式
@@ -20,36 +156,67 @@ def get_timer_class(style_name: CircularTimerStyle | None = None) -> TimerClass:
     Returns:
         计时器类，保证是BaseCircularTimer的子类
     """
-    if style_name is None:
-        style_name = Defaults.CIRCULAR_TIMER_STYLE
+    default_key = _style_key(Defaults.CIRCULAR_TIMER_STYLE)
+    style_key = default_key if style_name is None else _style_key(style_name)
 
-    if style_name not in TIMER_STYLES:
-        print(
-            f"警告: 未知的计时器样式 '{style_name}'，"
-            f"使用默认样式 '{Defaults.CIRCULAR_TIMER_STYLE}'"
-        )
-        style_name = Defaults.CIRCULAR_TIMER_STYLE
+    if style_key not in TIMER_STYLES:
+        _ensure_user_styles_discovered()
 
-    return TIMER_STYLES[style_name]
+    if style_key not in TIMER_STYLES:
+        print(f"警告: 未知的计时器样式 '{style_key}'，使用默认样式 '{default_key}'")
+        style_key = default_key
 
+    if style_key in _loaded_classes:
+        return _loaded_classes[style_key]
 
-def register_timer_style(
-    style_name: CircularTimerStyle, timer_class: TimerClass
-) -> None:
+    entry = TIMER_STYLES[style_key]
+    try:
+        timer_class = _load_style_class(entry)
+    except Exception as e:
+        if style_key == default_key:
+            raise
+        print(f"警告: 无法加载计时器样式 '{style_key}': {e}，使用默认样式")
+        return get_timer_class(default_key)
+
+    _loaded_classes[style_key] = timer_class
+    return timer_class
+
+
+def register_timer_style(style_name: str, timer_class: TimerClass) -> None:
     """
-    注册新的计时器样式。
+    注册一个已导入的计时器样式。
 
     Args:
         style_name: 样式名称
         timer_class: 计时器类，必须是BaseCircularTimer的子类
     """
-    # 编译时类型检查已经保证了类型安全
-    if style_name in TIMER_STYLES:
-        print(f"警告: 计时器样式 '{style_name}' 已存在，将被覆盖")
+    style_key = _style_key(style_name)
+    register_timer_style_entry(
+        TimerStyleEntry(
+            style_id=style_key,
+            display_name=style_key,
+            module=timer_class.__module__,
+            class_name=timer_class.__name__,
+        )
+    )
+    _loaded_classes[style_key] = timer_class
+
+
+def register_timer_style_entry(entry: TimerStyleEntry) -> None:
+    """
+    注册一个延迟加载的计时器样式。
+
+    Args:
+        entry: 样式的注册信息
+    """
+    if entry.style_id in TIMER_STYLES:
+        print(f"警告: 计时器样式 '{entry.style_id}' 已存在，将被覆盖")
 
-    TIMER_STYLES[style_name] = timer_class
+    TIMER_STYLES[entry.style_id] = entry
+    _loaded_classes.pop(entry.style_id, None)
 
 
-def list_timer_styles() -> list[CircularTimerStyle]:
-    """列出所有可用的计时器样式"""
-    return list(TIMER_STYLES.keys())
+def list_timer_styles() -> list[TimerStyleEntry]:
+    """列出所有可用的计时器样式（包括第三方样式），不会导入样式模块"""
+    _ensure_user_styles_discovered()
+    return list(TIMER_STYLES.values())
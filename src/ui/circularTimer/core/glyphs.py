@@ -0,0 +1,251 @@
+import math
+from collections.abc import Hashable
+
+from aqt import (
+    QBrush,
+    QColor,
+    QFont,
+    QFontMetricsF,
+    QPainter,
+    QPen,
+    QPixmap,
+    QPointF,
+    QRectF,
+    Qt,
+    QTransform,
+)
+
+# 倒计时文本可能用到的全部字符
+GLYPHS = "0123456789:"
+
+# 同时保留的图集数量（窗口缩放时字体大小会变化）
+_MAX_CACHED_ATLASES = 8
+
+
+class GlyphAtlas:
+    """
+    将倒计时字符按指定字体和设备像素比预先渲染到一张图集中。
+    字形以白色绘制，使用时再通过合成模式着色。
+    """
+
+    def __init__(self, font: QFont, dpr: float):
+        self.font = QFont(font)
+        self.dpr = dpr
+
+        metrics = QFontMetricsF(self.font)
+        self.ascent = metrics.ascent()
+        self.height = metrics.height()
+        # 为字形的外延（如粗体）预留边距
+        self.padding = math.ceil(self.height * 0.15)
+        self.advances = {ch: metrics.horizontalAdvance(ch) for ch in GLYPHS}
+        self._cells: dict[str, QRectF] = {}
+
+        cell_height = self.height + 2 * self.padding
+        total_width = sum(adv + 2 * self.padding for adv in self.advances.values())
+        self.pixmap = QPixmap(
+            math.ceil(total_width * dpr), math.ceil(cell_height * dpr)
+        )
+        self.pixmap.setDevicePixelRatio(dpr)
+        self.pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(self.pixmap)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        painter.setFont(self.font)
+        painter.setPen(QColor(Qt.GlobalColor.white))
+        x = 0.0
+        for ch, advance in self.advances.items():
+            cell_width = advance + 2 * self.padding
+            painter.drawText(QPointF(x + self.padding, self.padding + self.ascent), ch)
+            # 源矩形以图集的物理像素为单位
+            self._cells[ch] = QRectF(x * dpr, 0, cell_width * dpr, cell_height * dpr)
+            x += cell_width
+        painter.end()
+
+    def text_width(self, text: str) -> float:
+        """计算文本的排版宽度"""
+        return sum(self.advances[ch] for ch in text)
+
+    def draw(self, painter: QPainter, origin: QPointF, text: str) -> None:
+        """
+        以 origin 为文本框左上角，逐字拷贝图集中的字形。
+
+        Args:
+            painter: 目标绘制器
+            origin: 文本框（不含边距）的左上角
+            text: 仅包含 GLYPHS 中字符的文本
+        """
+        x = origin.x() - self.padding
+        y = origin.y() - self.padding
+        for ch in text:
+            source = self._cells[ch]
+            target = QRectF(x, y, source.width() / self.dpr, source.height() / self.dpr)
+            painter.drawPixmap(target, self.pixmap, source)
+            x += self.advances[ch]
+
+
+_atlas_cache: dict[tuple[str, float], GlyphAtlas] = {}
+
+
+def get_glyph_atlas(font: QFont, dpr: float) -> GlyphAtlas:
+    """获取（必要时创建）指定字体和设备像素比的字形图集"""
+    key = (font.key(), dpr)
+    atlas = _atlas_cache.pop(key, None)
+    if atlas is None:
+        atlas = GlyphAtlas(font, dpr)
+        while len(_atlas_cache) >= _MAX_CACHED_ATLASES:
+            del _atlas_cache[next(iter(_atlas_cache))]
+    # 重新插入以保持最近使用的顺序
+    _atlas_cache[key] = atlas
+    return atlas
+
+
+class CountdownText:
+    """
+    使用字形图集绘制带阴影的倒计时文本。
+
+    文本内容不变时复用已合成的图层（阴影已烘焙其中），
+    仅在文本或填充改变时通过 SourceIn 合成模式重新着色，不再重新排版文字。
+    """
+
+    def __init__(self, font: QFont, shadow_color: QColor, shadow_offset: int):
+        self._font = QFont(font)
+        self._shadow_color = QColor(shadow_color)
+        self._shadow_offset = shadow_offset
+
+        self._atlas: GlyphAtlas | None = None
+        self._text = ""
+        self._mask: QPixmap | None = None
+        self._shadow: QPixmap | None = None
+        self._colored: QPixmap | None = None
+        self._layer: QPixmap | None = None
+        self._layer_key: Hashable | None = None
+
+    def set_font(self, font: QFont) -> None:
+        """更新字体，下一次绘制时切换到对应的图集"""
+        self._font = QFont(font)
+        self._atlas = None
+
+    def set_shadow(self, color: QColor, offset: int) -> None:
+        """更新阴影颜色和偏移"""
+        self._shadow_color = QColor(color)
+        self._shadow_offset = offset
+        self._atlas = None
+
+    def draw(
+        self,
+        painter: QPainter,
+        rect: QRectF,
+        text: str,
+        brush: QBrush,
+        fill_key: Hashable,
+    ) -> None:
+        """
+        在 rect 中居中绘制倒计时文本。
+
+        Args:
+            painter: 目标绘制器
+            rect: 文本区域
+            text: 倒计时文本
+            brush: 文本填充，坐标与 painter 一致
+            fill_key: 标识当前填充的键，相同的键会复用已着色的图层
+        """
+        if not text or any(ch not in GLYPHS for ch in text):
+            self._draw_fallback(painter, rect, text, brush)
+            return
+
+        device = painter.device()
+        dpr = device.devicePixelRatioF() if device is not None else 1.0
+        atlas = self._atlas
+        if atlas is None or atlas.dpr != dpr or text != self._text:
+            atlas = get_glyph_atlas(self._font, dpr)
+            self._build_masks(atlas, text)
+
+        width = atlas.text_width(text)
+        origin = QPointF(
+            rect.center().x() - width / 2, rect.center().y() - atlas.height / 2
+        )
+        layer_key = (fill_key, origin.x(), origin.y())
+        if layer_key != self._layer_key:
+            self._compose_layer(atlas, origin, brush)
+            self._layer_key = layer_key
+
+        assert self._layer is not None
+        painter.drawPixmap(
+            QPointF(origin.x() - atlas.padding, origin.y() - atlas.padding),
+            self._layer,
+        )
+
+    def _new_pixmap(self, atlas: GlyphAtlas, width: float, height: float) -> QPixmap:
+        pixmap = QPixmap(math.ceil(width * atlas.dpr), math.ceil(height * atlas.dpr))
+        pixmap.setDevicePixelRatio(atlas.dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        return pixmap
+
+    def _build_masks(self, atlas: GlyphAtlas, text: str) -> None:
+        """文本改变时重建白色字形遮罩和阴影图层"""
+        self._atlas = atlas
+        self._text = text
+        self._layer_key = None
+
+        width = atlas.text_width(text) + 2 * atlas.padding + self._shadow_offset
+        height = atlas.height + 2 * atlas.padding + self._shadow_offset
+
+        self._mask = self._new_pixmap(atlas, width, height)
+        painter = QPainter(self._mask)
+        atlas.draw(painter, QPointF(atlas.padding, atlas.padding), text)
+        painter.end()
+
+        self._shadow = self._new_pixmap(atlas, width, height)
+        painter = QPainter(self._shadow)
+        painter.drawPixmap(
+            QPointF(self._shadow_offset, self._shadow_offset), self._mask
+        )
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceIn)
+        painter.fillRect(QRectF(0, 0, width, height), self._shadow_color)
+        painter.end()
+
+        self._colored = self._new_pixmap(atlas, width, height)
+        self._layer = self._new_pixmap(atlas, width, height)
+
+    def _compose_layer(self, atlas: GlyphAtlas, origin: QPointF, brush: QBrush):
+        """给遮罩着色并与阴影合成为最终图层"""
+        assert self._mask is not None and self._shadow is not None
+        assert self._colored is not None and self._layer is not None
+
+        layer_origin = QPointF(origin.x() - atlas.padding, origin.y() - atlas.padding)
+        local_brush = QBrush(brush)
+        # 将填充从控件坐标平移到图层坐标
+        local_brush.setTransform(
+            brush.transform()
+            * QTransform.fromTranslate(-layer_origin.x(), -layer_origin.y())
+        )
+        bounds = QRectF(
+            0, 0, self._mask.width() / atlas.dpr, self._mask.height() / atlas.dpr
+        )
+
+        self._colored.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(self._colored)
+        painter.drawPixmap(QPointF(0, 0), self._mask)
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceIn)
+        painter.fillRect(bounds, local_brush)
+        painter.end()
+
+        self._layer.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(self._layer)
+        painter.drawPixmap(QPointF(0, 0), self._shadow)
+        painter.drawPixmap(QPointF(0, 0), self._colored)
+        painter.end()
+
+    def _draw_fallback(
+        self, painter: QPainter, rect: QRectF, text: str, brush: QBrush
+    ) -> None:
+        """文本包含图集之外的字符时，直接绘制文字"""
+        painter.setFont(self._font)
+        painter.setPen(self._shadow_color)
+        painter.drawText(
+            rect.translated(self._shadow_offset, self._shadow_offset),
+            Qt.AlignmentFlag.AlignCenter,
+            text,
+        )
+        painter.setPen(QPen(brush, 1))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
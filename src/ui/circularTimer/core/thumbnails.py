@@ -0,0 +1,142 @@
+import os
+import re
+from collections import deque
+from pathlib import Path
+from typing import override
+
+from aqt import (
+    QEvent,
+    QImage,
+    QObject,
+    QPixmap,
+    Qt,
+    QTimer,
+    QWidget,
+    pyqtSignal,
+    theme,
+)
+
+from .factory import TimerStyleEntry, get_timer_class
+
+# 缩略图的逻辑尺寸（像素），下拉框中会缩小显示
+THUMBNAIL_SIZE = 96
+# 缩略图显示的进度
+THUMBNAIL_PROGRESS = 0.75
+
+
+def _get_thumbnail_dir() -> Path:
+    """获取缩略图缓存目录的完整路径。"""
+    module_path = os.path.abspath(__file__)
+    package_root = Path(module_path).parents[3]
+    return package_root / "user_files" / "cache" / "style_thumbnails"
+
+
+def thumbnail_path(entry: TimerStyleEntry, dpr: float, dark: bool) -> Path:
+    """缓存文件路径，由样式 ID、样式版本、设备像素比和主题决定"""
+    safe_id = re.sub(r"[^\w.-]", "_", entry.style_id)
+    safe_version = re.sub(r"[^\w.-]", "_", entry.version)
+    theme_name = "dark" if dark else "light"
+    return _get_thumbnail_dir() / (
+        f"{safe_id}-v{safe_version}-{dpr:g}x-{theme_name}.png"
+    )
+
+
+def render_thumbnail(entry: TimerStyleEntry, dpr: float) -> QImage:
+    """按当前主题把样式渲染成一张静态图像"""
+    timer_class = get_timer_class(entry.style_id)
+    widget = timer_class(None)
+    # 固定动画时钟，保证缩略图可复现
+    widget.animation_time = lambda: 0.0  # type: ignore[method-assign]
+    widget.resize(THUMBNAIL_SIZE, THUMBNAIL_SIZE)
+    widget.set_progress(round(THUMBNAIL_PROGRESS * 1500), 1500)
+
+    pixels = round(THUMBNAIL_SIZE * dpr)
+    image = QImage(pixels, pixels, QImage.Format.Format_ARGB32_Premultiplied)
+    image.setDevicePixelRatio(dpr)
+    image.fill(Qt.GlobalColor.transparent)
+    widget.render(image)
+    widget.deleteLater()
+    return image
+
+
+class StyleThumbnailLoader(QObject):
+    """
+    在窗口第一次绘制后逐个加载样式缩略图。
+
+    已缓存的缩略图直接从磁盘读取，否则渲染后写入缓存。
+    渲染控件只能在 GUI 线程进行，因此每次事件循环空闲时只处理一个样式，
+    对话框的打开时间与已安装的样式数量无关。
+    """
+
+    # 样式 ID, 缩略图, 缓存文件路径（未能写入缓存时为空）
+    thumbnail_ready = pyqtSignal(str, QPixmap, str)
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self._queue: deque[TimerStyleEntry] = deque()
+        self._dpr = 1.0
+        self._dark = False
+        self._waiting_for: QWidget | None = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._load_next)
+
+    def request(self, entries: list[TimerStyleEntry], window: QWidget) -> None:
+        """
+        按当前主题加载一组样式的缩略图。
+
+        Args:
+            entries: 样式列表
+            window: 显示缩略图的窗口，在其第一次绘制后才开始加载
+        """
+        self._queue = deque(entries)
+        self._dpr = window.devicePixelRatioF()
+        self._dark = theme.theme_manager.night_mode
+        if not self._queue:
+            return
+        if window.isVisible():
+            self._timer.start()
+        else:
+            self._waiting_for = window
+            window.installEventFilter(self)
+
+    @override
+    def eventFilter(self, a0: QObject | None, a1: QEvent | None) -> bool:
+        if (
+            a0 is self._waiting_for
+            and a1 is not None
+            and a1.type() == QEvent.Type.Paint
+        ):
+            a0.removeEventFilter(self)
+            self._waiting_for = None
+            # 等待本次绘制完成后再开始
+            self._timer.start()
+        return super().eventFilter(a0, a1)
+
+    def _load_next(self) -> None:
+        if not self._queue:
+            self._timer.stop()
+            return
+
+        entry = self._queue.popleft()
+        path = thumbnail_path(entry, self._dpr, self._dark)
+        pixmap = QPixmap(str(path)) if path.is_file() else QPixmap()
+        cached = not pixmap.isNull()
+        if not cached:
+            try:
+                image = render_thumbnail(entry, self._dpr)
+            except Exception as e:
+                print(f"警告: 无法渲染计时器样式 '{entry.style_id}' 的缩略图: {e}")
+                return
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                cached = image.save(str(path))
+            except OSError:
+                cached = False
+            if not cached:
+                print(f"警告: 无法保存缩略图 {path}")
+            pixmap = QPixmap.fromImage(image)
+
+        pixmap.setDevicePixelRatio(self._dpr)
+        self.thumbnail_ready.emit(entry.style_id, pixmap, str(path) if cached else "")
@@ -1,23 +1,25 @@
+from collections import OrderedDict
 from typing import override
 
 from aqt import (
-    QApplication,
     QCloseEvent,
     QDialog,
+    QEvent,
+    QHelpEvent,
     QMainWindow,
     QMouseEvent,
     QPointF,
     QResizeEvent,
     Qt,
+    QToolTip,
     mw,
     pyqtSignal,
 )
 
 from ....config.enums import TimerPosition
-from ....config.types import DisplayPosition
-from ....state import get_app_state, reload_config
+from ....state import get_app_state
 from ....translator import _
-from ...utils import get_screen_identifier
+from ...screen_index import get_screen_index
 from .base import BaseCircularTimer, TimerClass
 
 
@@ -27,6 +29,9 @@ class TimerWindow(QDialog):
     closed = pyqtSignal()
     timer_widget: BaseCircularTimer
 
+    # 保留最近使用过的样式控件数量（不含当前显示的控件）
+    WIDGET_POOL_SIZE = 2
+
     def __init__(self, timer_widget_class: TimerClass, parent: QMainWindow = mw):
         super().__init__(parent)
 
@@ -48,42 +53,67 @@ class TimerWindow(QDialog):
         self.setWindowTitle(_("番茄钟计时器"))
         self.setMinimumSize(100, 100)
 
+        self._screen_index = get_screen_index()
+        self._screen_index.screens_changed.connect(self._on_screens_changed)
+
         # 实例化计时器控件
+        self._widget_pool: OrderedDict[TimerClass, BaseCircularTimer] = OrderedDict()
         self.timer_widget = timer_widget_class(self)
         self.resize(150, 150)
         self.position_window()
         self._center_timer_widget()
 
+    def set_timer_class(self, timer_widget_class: TimerClass) -> BaseCircularTimer:
+        """
+        在窗口内原地切换计时器样式，窗口本身保持不变。
+        最近使用过的样式控件会被保留，再次切换时直接复用。
+
+        Args:
+            timer_widget_class: 计时器类，必须是BaseCircularTimer的子类
+
+        Returns:
+            当前显示的计时器控件
+        """
+        current = self.timer_widget
+        if type(current) is timer_widget_class:
+            return current
+
+        new_widget = self._widget_pool.pop(timer_widget_class, None)
+        if new_widget is None:
+            new_widget = timer_widget_class(self)
+        else:
+            # 控件在池中时可能错过了主题变化
+            new_widget.update_theme_colors()
+        new_widget.copy_state_from(current)
+
+        current.hide()
+        current.set_active(False)
+        self._widget_pool[type(current)] = current
+        while len(self._widget_pool) > self.WIDGET_POOL_SIZE:
+            _, evicted = self._widget_pool.popitem(last=False)
+            evicted.deleteLater()
+
+        self.timer_widget = new_widget
+        self._center_timer_widget()
+        new_widget.show()
+        return new_widget
+
     def position_window(self):
         """根据配置将窗口定位到屏幕的指定角落"""
-        screen = self.screen()
-        if not screen:
-            screen = QApplication.primaryScreen()
-            if not screen:
-                return
+        info = self._screen_index.info_for(self.screen())
+        if info is None:
+            return
 
-        config = reload_config()
-        position = config.timer_position
+        position = get_app_state().config.timer_position
 
         if position == TimerPosition.LAST_USED:
-            identifier = get_screen_identifier(screen)
-            if identifier in config.saved_timer_positions:
-                saved_pos = config.saved_timer_positions[identifier]
-                current_res = screen.size()
-                current_dpi = (
-                    screen.logicalDotsPerInchX(),
-                    screen.logicalDotsPerInchY(),
-                )
-
-                if (
-                    saved_pos.resolution == (current_res.width(), current_res.height())
-                    and saved_pos.logical_dpi == current_dpi
-                ):
-                    self.move(saved_pos.pos[0], saved_pos.pos[1])
-                    return
+            anchor = self._screen_index.anchor_for(info)
+            if anchor is not None:
+                self.move(anchor)
+                return
 
         margin = 20
-        screen_rect = screen.availableGeometry()
+        screen_rect = info.available_geometry
         window_width, window_height = self.width(), self.height()
 
         x, y = screen_rect.x() + margin, screen_rect.y() + margin
@@ -101,6 +131,11 @@ class TimerWindow(QDialog):
 
         self.move(x, y)
 
+    def _on_screens_changed(self):
+        """屏幕拔出或几何变化后，窗口不再完整可见时重新定位"""
+        if self.isVisible() and not self._screen_index.contains(self.frameGeometry()):
+            self.position_window()
+
     def _center_timer_widget(self):
         """将内部的计时器控件在窗口中居中"""
         dialog_w, dialog_h = self.width(), self.height()
@@ -116,6 +151,22 @@ class TimerWindow(QDialog):
         widget_y = (dialog_h - widget_size) // 2
         self.timer_widget.move(widget_x, widget_y)
 
+    @override
+    def event(self, a0: QEvent | None) -> bool:
+        # 悬停时显示实际帧率和绘制耗时
+        if isinstance(a0, QHelpEvent) and a0.type() == QEvent.Type.ToolTip:
+            stats = self.timer_widget.get_frame_stats()
+            text = (
+                _("帧率: {fps:.1f} FPS").format(fps=stats.fps)
+                + "\n"
+                + _("绘制耗时: 平均 {avg:.2f} ms / 最大 {max:.2f} ms").format(
+                    avg=stats.avg_paint_ms, max=stats.max_paint_ms
+                )
+            )
+            QToolTip.showText(a0.globalPos(), text, self)
+            return True
+        return super().event(a0)
+
     def resizeEvent(self, a0: QResizeEvent | None):
         super().resizeEvent(a0)
         self._center_timer_widget()
@@ -138,32 +189,12 @@ class TimerWindow(QDialog):
 
     def mouseReleaseEvent(self, a0: QMouseEvent | None):
         if self._offset is not None and a0 and a0.button() == Qt.MouseButton.LeftButton:
-            screen = self.screen()
-            if not screen:
+            info = self._screen_index.info_for(self.screen())
+            if info is None:
                 super().mouseReleaseEvent(a0)
                 return
 
-            identifier = get_screen_identifier(screen)
-
-            app_state = get_app_state()
-            pos = self.pos()
-            current_res = screen.size()
-            logical_dpi = (
-                screen.logicalDotsPerInchX(),
-                screen.logicalDotsPerInchY(),
-            )
-
-            display_pos = DisplayPosition(
-                serial_number=identifier,  # 使用生成的标识符
-                resolution=(current_res.width(), current_res.height()),
-                logical_dpi=logical_dpi,
-                pos=(pos.x(), pos.y()),
-            )
-
-            # 更新配置
-            saved_positions = app_state.config.saved_timer_positions.copy()
-            saved_positions[identifier] = display_pos
-            app_state.update_config_value("saved_timer_positions", saved_positions)
+            self._screen_index.remember_anchor(info, self.pos())
 
             a0.accept()
         else:
@@ -171,6 +202,7 @@ class TimerWindow(QDialog):
 
     @override
     def closeEvent(self, a0: QCloseEvent | None):
+        self._screen_index.positions.flush()
         self.closed.emit()
         super().closeEvent(a0)
 
@@ -179,11 +211,21 @@ class TimerWindow(QDialog):
 _timer_window_instance: TimerWindow | None = None
 
 
+def _destroy_timer_window() -> None:
+    """关闭并销毁计时器窗口"""
+    global _timer_window_instance
+    if _timer_window_instance:
+        _timer_window_instance.close()
+        _timer_window_instance.deleteLater()
+        _timer_window_instance = None
+
+
 def setup_circular_timer(
     timer_widget_class: TimerClass, force_new: bool = False
 ) -> BaseCircularTimer | None:
     """
     创建或显示独立的计时器窗口。
+    窗口创建后一直保留，切换样式或重新显示时只替换其中的计时器控件。
 
     Args:
         timer_widget_class: 计时器类，必须是BaseCircularTimer的子类
@@ -196,38 +238,20 @@ def setup_circular_timer(
 
     config = get_app_state().config
     if not config.enabled:
-        if _timer_window_instance:
-            _timer_window_instance.close()
-            _timer_window_instance = None
+        _destroy_timer_window()
         return None
 
-    # 检查现有窗口的样式是否与请求的样式匹配
-    style_changed = False
-    if (
-        _timer_window_instance
-        and hasattr(_timer_window_instance, "timer_widget")
-        and not isinstance(_timer_window_instance.timer_widget, timer_widget_class)
-    ):
-        style_changed = True
-        force_new = True
-
-    if _timer_window_instance and not force_new:
-        _timer_window_instance.position_window()
-        _timer_window_instance.show()
-        _timer_window_instance.raise_()
-        _timer_window_instance.activateWindow()
-    else:
-        if _timer_window_instance and (force_new or style_changed):
-            _timer_window_instance.close()
-            _timer_window_instance = None
+    if force_new:
+        _destroy_timer_window()
 
+    if _timer_window_instance is None:
         _timer_window_instance = TimerWindow(timer_widget_class=timer_widget_class)
-        _timer_window_instance.show()
-
-        def on_closed():
-            global _timer_window_instance
-            _timer_window_instance = None
+    else:
+        _timer_window_instance.set_timer_class(timer_widget_class)
 
-        _timer_window_instance.closed.connect(on_closed)
+    # 关闭（隐藏）后再次显示时保留原来的位置
+    if not _timer_window_instance.isVisible():
+        _timer_window_instance.show()
+        _timer_window_instance.raise_()
 
-    return _timer_window_instance.timer_widget if _timer_window_instance else None
+    return _timer_window_instance.timer_widget
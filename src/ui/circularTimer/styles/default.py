@@ -34,6 +34,7 @@ from ..constants import (
     TEXT_COLOR_START_LIGHT,
 )
 from ..core.base import BaseCircularTimer
+from ..core.glyphs import CountdownText
 
 
 class CircularTimer(BaseCircularTimer):
@@ -44,14 +45,17 @@ class CircularTimer(BaseCircularTimer):
 
         # 初始化绘制工具
         self._bg_brush = QBrush()
-        self._text_pen = QPen()
         self._text_font = QFont("Arial", 20, QFont.Weight.Bold)
-        self._shadow_pen = QPen()
 
         # 定义边框和阴影属性
         self._border_width = 8
         self._shadow_offset = 2
 
+        # 倒计时文本渲染器（字形图集）
+        self._countdown = CountdownText(
+            self._text_font, SHADOW_COLOR_LIGHT, self._shadow_offset
+        )
+
         # 检测主题并设置颜色
         self.update_theme_colors()
         self._update_font_size()
@@ -81,8 +85,8 @@ class CircularTimer(BaseCircularTimer):
             self._shadow_color = SHADOW_COLOR_LIGHT
             self._track_color = QColor(0, 0, 0, 20)
 
-        # 更新阴影画笔颜色
-        self._shadow_pen.setColor(self._shadow_color)
+        # 更新阴影颜色
+        self._countdown.set_shadow(self._shadow_color, self._shadow_offset)
         self.update()
 
     def _update_font_size(self):
@@ -90,6 +94,7 @@ class CircularTimer(BaseCircularTimer):
         inner_dim = min(self.width(), self.height()) - (self._border_width * 2)
         font_size = max(10, inner_dim * 0.25)
         self._text_font.setPointSizeF(font_size)
+        self._countdown.set_font(self._text_font)
 
     @override
     def resizeEvent(self, a0: QResizeEvent | None) -> None:
@@ -128,7 +133,8 @@ class CircularTimer(BaseCircularTimer):
         painter.drawArc(rectF, 0, 360 * 16)
 
         # 3. 绘制进度弧
-        if self._progress > 0:
+        progress = self.current_progress()
+        if progress > 0:
             progress_gradient = QLinearGradient(
                 QPointF(rectF.topLeft()), QPointF(rectF.bottomRight())
             )
@@ -144,33 +150,29 @@ class CircularTimer(BaseCircularTimer):
             painter.setPen(progress_pen)
 
             start_angle = 90 * 16
-            span_angle = -int(self._progress * 360 * 16)
+            span_angle = -int(progress * 360 * 16)
             painter.drawArc(rectF, start_angle, span_angle)
 
-        # 4. 绘制剩余时间文本
+        # 4. 绘制剩余时间文本（阴影已烘焙在缓存图层中）
         text_rect = rectF.adjusted(
             self._border_width,
             self._border_width,
             -self._border_width,
             -self._border_width,
         )
-        painter.setFont(self._text_font)
-
-        # 4a. 绘制阴影文本
-        shadow_rectF = QRectF(text_rect).translated(
-            self._shadow_offset, self._shadow_offset
-        )
-        painter.setPen(self._shadow_pen)
-        painter.drawText(
-            shadow_rectF, Qt.AlignmentFlag.AlignCenter, self._remaining_time
-        )
-
-        # 4b. 使用渐变绘制主文本
         text_gradient = QLinearGradient(
             QPointF(text_rect.topLeft()), QPointF(text_rect.bottomLeft())
         )
         text_gradient.setColorAt(0, self._text_start_color)
         text_gradient.setColorAt(1, self._text_end_color)
-        self._text_pen.setBrush(QBrush(text_gradient))
-        painter.setPen(self._text_pen)
-        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, self._remaining_time)
+        self._countdown.draw(
+            painter,
+            text_rect,
+            self._remaining_time,
+            QBrush(text_gradient),
+            (
+                self._text_start_color.rgba(),
+                self._text_end_color.rgba(),
+                text_rect.getRect(),
+            ),
+        )
@@ -1,4 +1,3 @@
-import time
 from typing import override
 
 from aqt import (
@@ -14,7 +13,6 @@ from aqt import (
     QRectF,
     QResizeEvent,
     Qt,
-    QTimer,
     QWidget,
     theme,
 )
@@ -32,35 +30,34 @@ from ..constants import (
     SHADOW_COLOR_LIGHT,
 )
 from ..core.base import BaseCircularTimer
+from ..core.glyphs import CountdownText
 
 
 class CircularTimer(BaseCircularTimer):
     """彩虹文字圆形计时器实现，带有动态彩虹文本和进度边框"""
 
+    ANIMATED = True
     RAINBOW_CYCLE_DURATION_S = 6.0
-    ANIMATION_UPDATE_INTERVAL_MS = 50  # ~20 FPS
 
     def __init__(self, parent: QWidget | None = None):
         super().__init__(parent)
 
         # 初始化绘制工具
-        self._text_pen = QPen()
         self._text_font = QFont("Arial", 20, QFont.Weight.Bold)
-        self._shadow_pen = QPen()
 
         # 定义边框和阴影属性
         self._border_width = 8
         self._shadow_offset = 2
 
+        # 倒计时文本渲染器（字形图集）
+        self._countdown = CountdownText(
+            self._text_font, SHADOW_COLOR_LIGHT, self._shadow_offset
+        )
+
         # 检测主题并设置颜色
         self.update_theme_colors()
         self._update_font_size()
 
-        # 启动动画计时器
-        self._animation_timer = QTimer(self)
-        self._animation_timer.timeout.connect(self.update)
-        self._animation_timer.start(self.ANIMATION_UPDATE_INTERVAL_MS)
-
     @override
     def update_theme_colors(self) -> None:
         """根据当前的Anki主题更新所有颜色"""
@@ -82,8 +79,8 @@ class CircularTimer(BaseCircularTimer):
             self._shadow_color = SHADOW_COLOR_LIGHT
             self._track_color = QColor(0, 0, 0, 20)
 
-        # 更新阴影画笔颜色
-        self._shadow_pen.setColor(self._shadow_color)
+        # 更新阴影颜色
+        self._countdown.set_shadow(self._shadow_color, self._shadow_offset)
         self.update()
 
     def _update_font_size(self):
@@ -91,6 +88,7 @@ class CircularTimer(BaseCircularTimer):
         inner_dim = min(self.width(), self.height()) - (self._border_width * 2)
         font_size = max(10, inner_dim * 0.25)
         self._text_font.setPointSizeF(font_size)
+        self._countdown.set_font(self._text_font)
 
     @override
     def resizeEvent(self, a0: QResizeEvent | None) -> None:
@@ -128,7 +126,8 @@ class CircularTimer(BaseCircularTimer):
         painter.drawArc(rectF, 0, 360 * 16)
 
         # 3. 绘制进度弧
-        if self._progress > 0:
+        progress = self.current_progress()
+        if progress > 0:
             progress_gradient = QLinearGradient(
                 QPointF(rectF.topLeft()), QPointF(rectF.bottomRight())
             )
@@ -144,33 +143,28 @@ class CircularTimer(BaseCircularTimer):
             painter.setPen(progress_pen)
 
             start_angle = 90 * 16
-            span_angle = -int(self._progress * 360 * 16)
+            span_angle = -int(progress * 360 * 16)
             painter.drawArc(rectF, start_angle, span_angle)
 
-        # 4. 绘制剩余时间文本
+        # 4. 绘制剩余时间文本（阴影已烘焙在缓存图层中）
         text_rect = rectF.adjusted(
             self._border_width,
             self._border_width,
             -self._border_width,
             -self._border_width,
         )
-        painter.setFont(self._text_font)
 
-        # 4a. 绘制阴影文本
-        shadow_rectF = QRectF(text_rect).translated(
-            self._shadow_offset, self._shadow_offset
-        )
-        painter.setPen(self._shadow_pen)
-        painter.drawText(
-            shadow_rectF, Qt.AlignmentFlag.AlignCenter, self._remaining_time
-        )
-
-        # 4b. 使用彩虹色绘制主文本
-        current_time = time.time()
+        # 色相由单调时钟推导，帧率降低或跳帧时颜色不会跳变
+        current_time = self.animation_time()
         hue = (
             current_time % self.RAINBOW_CYCLE_DURATION_S
         ) / self.RAINBOW_CYCLE_DURATION_S
         rainbow_color = QColor.fromHsvF(hue, 1.0, 1.0)
-        self._text_pen.setColor(rainbow_color)
-        painter.setPen(self._text_pen)
-        painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, self._remaining_time)
+        # 通过合成模式给缓存的字形着色，无需每帧重新排版文字
+        self._countdown.draw(
+            painter,
+            text_rect,
+            self._remaining_time,
+            QBrush(rainbow_color),
+            rainbow_color.rgba(),
+        )
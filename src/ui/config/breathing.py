@@ -4,6 +4,7 @@ from typing import Any
 
 from aqt import (
     QCheckBox,
+    QComboBox,
     QFileDialog,
     QGridLayout,
     QGroupBox,
@@ -16,9 +17,13 @@ from aqt import (
     QWidget,
 )
 
-from ...config.enums import PHASES
+from ...audio import synth
+from ...breathing_plan import SessionPlan, build_session_plan
+from ...breathing_program import CUSTOM_PROGRAM_ID, BreathingProgram, list_programs
+from ...config.enums import PHASES, AmbientSound, BreathingEasing, BreathingPhase
 from ...config.types import AppConfig
 from ...translator import _
+from ..breathing.visuals import list_breathing_visuals
 
 
 @dataclass
@@ -36,16 +41,43 @@ class BreathingSettings:
 
     def __init__(self, config: AppConfig):
         self.config = config
+        self.program_combobox: QComboBox | None = None
         self.cycles_spinbox: QSpinBox | None = None
+        self.phases_group: QGroupBox | None = None
+        self.easing_combobox: QComboBox | None = None
+        self.visual_combobox: QComboBox | None = None
+        self.synth_cues_checkbox: QCheckBox | None = None
+        self.ambient_combobox: QComboBox | None = None
+        self.ambient_volume_spinbox: QSpinBox | None = None
+        self.ambient_path = config.ambient_sound_path
         self.estimated_time_label: QLabel | None = None
         self.phase_uis: dict[str, PhaseUI] = {}
         self.audio_paths: dict[str, str] = {}
+        # 各阶段当前的 (是否启用, 时长)，只在对应控件改变时更新
+        self._phase_settings: dict[BreathingPhase, tuple[bool, int]] = {}
+        self._plan: SessionPlan | None = None
+        self._programs: dict[str, BreathingProgram] = {}
 
     def create_ui(self, parent: QWidget) -> QGroupBox:
         """创建呼吸设置部分的UI组件"""
         group = QGroupBox(_("呼吸训练设置"))
         layout = QVBoxLayout()
 
+        program_layout = QHBoxLayout()
+        program_label = QLabel(_("训练方案:"), parent)
+        self.program_combobox = QComboBox(parent)
+        self._programs = {
+            program.program_id: program for program in list_programs(self.config)
+        }
+        for program in self._programs.values():
+            self.program_combobox.addItem(program.name, program.program_id)
+        self.program_combobox.setToolTip(
+            _("自定义方案使用下面的循环次数和阶段设置，其他方案的阶段由方案本身决定")
+        )
+        program_layout.addWidget(program_label)
+        program_layout.addWidget(self.program_combobox)
+        layout.addLayout(program_layout)
+
         cycles_layout = QHBoxLayout()
         cycles_label = QLabel(_("目标循环次数:"), parent)
         self.cycles_spinbox = QSpinBox(parent)
@@ -56,7 +88,44 @@ class BreathingSettings:
         cycles_layout.addWidget(self.cycles_spinbox)
         layout.addLayout(cycles_layout)
 
-        phases_group = QGroupBox(_("呼吸阶段设置"))
+        easing_layout = QHBoxLayout()
+        easing_label = QLabel(_("动画曲线:"), parent)
+        self.easing_combobox = QComboBox(parent)
+        self.easing_combobox.addItems(
+            [easing.display_name for easing in BreathingEasing]
+        )
+        self.easing_combobox.setCurrentText(self.config.breathing_easing.display_name)
+        self.easing_combobox.setToolTip(_("同时控制动画的缩放和提示音的音量变化"))
+        easing_layout.addWidget(easing_label)
+        easing_layout.addWidget(self.easing_combobox)
+        layout.addLayout(easing_layout)
+
+        visual_layout = QHBoxLayout()
+        visual_label = QLabel(_("动画样式:"), parent)
+        self.visual_combobox = QComboBox(parent)
+        for visual_entry in list_breathing_visuals():
+            self.visual_combobox.addItem(
+                visual_entry.display_name, visual_entry.style_id
+            )
+        visual_index = self.visual_combobox.findData(self.config.breathing_visual)
+        if visual_index >= 0:
+            self.visual_combobox.setCurrentIndex(visual_index)
+        visual_layout.addWidget(visual_label)
+        visual_layout.addWidget(self.visual_combobox)
+        layout.addLayout(visual_layout)
+
+        self.synth_cues_checkbox = QCheckBox(_("使用合成提示音"), parent)
+        self.synth_cues_checkbox.setChecked(self.config.breathing_synth_cues)
+        if synth.is_available():
+            self.synth_cues_checkbox.setToolTip(
+                _("吸气和呼气时播放与阶段等长的音调，屏气时播放铃声，不使用音频文件")
+            )
+        else:
+            self.synth_cues_checkbox.setEnabled(False)
+            self.synth_cues_checkbox.setToolTip(_("需要安装 NumPy"))
+        layout.addWidget(self.synth_cues_checkbox)
+
+        self.phases_group = phases_group = QGroupBox(_("呼吸阶段设置"))
         phases_layout = QGridLayout()
         phases_layout.setColumnStretch(5, 1)
 
@@ -93,6 +162,8 @@ class BreathingSettings:
             checkbox.toggled.connect(spinbox.setEnabled)
             checkbox.toggled.connect(audio_button.setEnabled)
             self._connect_audio_button(audio_button, key, audio_label)
+            self._connect_estimate(checkbox, spinbox, phase_def.key)
+            self._phase_settings[phase_def.key] = (is_enabled, duration)
 
             duration_label = QLabel(_("持续时间:"))
             duration_label.setAlignment(
@@ -113,24 +184,153 @@ class BreathingSettings:
                 audio_label=audio_label,
             )
 
+        # 预计时间放在阶段设置外面，选择其他方案时阶段设置不可用
         self.estimated_time_label = QLabel(_("预计时间: --:--"), parent)
         self.estimated_time_label.setStyleSheet("font-style: italic; color: grey;")
-        phases_layout.addWidget(
-            self.estimated_time_label,
-            phases_layout.rowCount(),
-            0,
-            1,
-            -1,
-            Qt.AlignmentFlag.AlignRight,
-        )
+
+        program_index = self.program_combobox.findData(self.config.breathing_program)
+        self.program_combobox.setCurrentIndex(max(0, program_index))
+        self._rebuild_plan()
+        self.program_combobox.currentIndexChanged.connect(self._on_program_changed)
+        self.cycles_spinbox.valueChanged.connect(self._update_estimated_time)
 
         phases_group.setLayout(phases_layout)
         layout.addWidget(phases_group)
+        layout.addWidget(self.estimated_time_label, 0, Qt.AlignmentFlag.AlignRight)
+        self._on_program_changed()
+        layout.addWidget(self._create_ambient_ui(parent))
         layout.addStretch()
 
         group.setLayout(layout)
         return group
 
+    def _create_ambient_ui(self, parent: QWidget) -> QGroupBox:
+        """背景音设置: 声音、自定义循环文件和音量"""
+        group = QGroupBox(_("背景音 (长休息和呼吸训练时播放)"))
+        layout = QGridLayout()
+        layout.setColumnStretch(2, 1)
+
+        self.ambient_combobox = QComboBox(parent)
+        for sound in AmbientSound:
+            self.ambient_combobox.addItem(sound.display_name, sound.value)
+        ambient_index = self.ambient_combobox.findData(self.config.ambient_sound.value)
+        if ambient_index >= 0:
+            self.ambient_combobox.setCurrentIndex(ambient_index)
+
+        path_button = QPushButton(_("选择音频"), parent)
+        path_label = QLabel(
+            os.path.basename(self.ambient_path) if self.ambient_path else _("未选择"),
+            parent,
+        )
+        path_label.setWordWrap(True)
+        path_label.setToolTip(self.ambient_path)
+        path_button.clicked.connect(lambda: self._select_ambient_file(path_label))
+
+        def on_sound_changed():
+            assert self.ambient_combobox is not None
+            is_custom = self.ambient_combobox.currentData() == AmbientSound.CUSTOM.value
+            path_button.setEnabled(is_custom)
+            path_label.setEnabled(is_custom)
+
+        self.ambient_combobox.currentIndexChanged.connect(on_sound_changed)
+        on_sound_changed()
+
+        self.ambient_volume_spinbox = QSpinBox(parent)
+        self.ambient_volume_spinbox.setRange(0, 100)
+        self.ambient_volume_spinbox.setSuffix(" %")
+        self.ambient_volume_spinbox.setValue(self.config.ambient_volume)
+
+        layout.addWidget(QLabel(_("声音:"), parent), 0, 0)
+        layout.addWidget(self.ambient_combobox, 0, 1)
+        layout.addWidget(path_button, 1, 1)
+        layout.addWidget(path_label, 1, 2)
+        layout.addWidget(QLabel(_("音量:"), parent), 2, 0)
+        layout.addWidget(self.ambient_volume_spinbox, 2, 1)
+        group.setLayout(layout)
+
+        if not synth.is_available():
+            group.setEnabled(False)
+            group.setToolTip(_("需要安装 NumPy"))
+        return group
+
+    def _select_ambient_file(self, label_widget: QLabel):
+        """选择自定义的背景音循环（WAV 文件按块读取，不会整个载入内存）"""
+        file_path, __ = QFileDialog.getOpenFileName(
+            None, _("选择背景音"), "", _("WAV 文件 (*.wav);;所有文件 (*)")
+        )
+        if file_path:
+            label_widget.setText(os.path.basename(file_path))
+            label_widget.setToolTip(file_path)
+            self.ambient_path = file_path
+
+    def _connect_estimate(
+        self, checkbox: QCheckBox, spinbox: QSpinBox, phase: BreathingPhase
+    ):
+        """阶段的启用状态或时长改变时，只更新该阶段的设置并重新编译计划"""
+
+        def on_change():
+            self._phase_settings[phase] = (checkbox.isChecked(), spinbox.value())
+            self._rebuild_plan()
+            self._update_estimated_time()
+
+        checkbox.toggled.connect(on_change)
+        spinbox.valueChanged.connect(on_change)
+
+    def _rebuild_plan(self):
+        """用与呼吸训练相同的计划计算自定义方案单个循环的时长（预计时间不需要音频）"""
+        self._plan = build_session_plan(
+            (
+                (phase, enabled, duration, None)
+                for phase, (enabled, duration) in self._phase_settings.items()
+            ),
+            1,
+        )
+
+    def _selected_program(self) -> BreathingProgram | None:
+        """当前选择的方案，自定义方案时为 None（由阶段设置决定）"""
+        if self.program_combobox is None:
+            return None
+        program_id = self.program_combobox.currentData()
+        if program_id == CUSTOM_PROGRAM_ID:
+            return None
+        return self._programs.get(program_id)
+
+    def _on_program_changed(self):
+        """只有自定义方案使用循环次数和阶段设置"""
+        is_custom = self._selected_program() is None
+        if self.cycles_spinbox is not None:
+            self.cycles_spinbox.setEnabled(is_custom)
+        if self.phases_group is not None:
+            self.phases_group.setEnabled(is_custom)
+        self._update_estimated_time()
+
+    def _update_estimated_time(self):
+        """更新呼吸练习的预计时间标签，时长由方案直接算出，不需要展开阶段"""
+        if (
+            self.estimated_time_label is None
+            or self.cycles_spinbox is None
+            or self._plan is None
+        ):
+            return
+
+        program = self._selected_program()
+        if program is not None:
+            total = program.total_duration
+            if total is None:
+                self.estimated_time_label.setText(_("预计时间: 不限"))
+                return
+        else:
+            target_cycles = self.cycles_spinbox.value()
+            total = (self._plan.total_duration or 0) * target_cycles
+        if total <= 0:
+            self.estimated_time_label.setText(_("预计时间: --:-- (未启用或周期为0)"))
+            return
+
+        mins, secs = divmod(round(total), 60)
+        self.estimated_time_label.setText(
+            _("预计时间: {mins:02d}:{secs:02d}").format(mins=mins, secs=secs)
+        )
+
     def _connect_audio_button(
         self, button: QPushButton, phase_key: str, label_widget: QLabel
     ):
@@ -161,9 +361,25 @@ class BreathingSettings:
 
     def get_values(self) -> dict[str, Any]:
         """从呼吸设置获取值"""
+        assert self.program_combobox is not None
         assert self.cycles_spinbox is not None
+        assert self.easing_combobox is not None
+        assert self.visual_combobox is not None
+        assert self.synth_cues_checkbox is not None
+        assert self.ambient_combobox is not None
+        assert self.ambient_volume_spinbox is not None
+        easing_map = {easing.display_name: easing for easing in BreathingEasing}
         values: dict[str, int | str | bool] = {
-            "breathing_cycles": self.cycles_spinbox.value()
+            "breathing_program": self.program_combobox.currentData(),
+            "breathing_cycles": self.cycles_spinbox.value(),
+            "breathing_easing": easing_map.get(
+                self.easing_combobox.currentText(), BreathingEasing.SINE
+            ),
+            "breathing_visual": self.visual_combobox.currentData(),
+            "breathing_synth_cues": self.synth_cues_checkbox.isChecked(),
+            "ambient_sound": AmbientSound(self.ambient_combobox.currentData()),
+            "ambient_sound_path": self.ambient_path,
+            "ambient_volume": self.ambient_volume_spinbox.value(),
         }
         for key, ui in self.phase_uis.items():
             values[f"{key}_enabled"] = ui.checkbox.isChecked()
@@ -1,9 +1,12 @@
 import dataclasses
+import logging
+import time
 from typing import override
 
 from aqt import (
     QDialog,
     QDialogButtonBox,
+    QEvent,
     QTabWidget,
     QVBoxLayout,
     QWidget,
@@ -12,31 +15,40 @@ from aqt import (
 from aqt.utils import tooltip
 
 from ...config.types import AppConfig
-from ...state import get_pomodoro_manager, reload_config, update_and_save_config
+from ...state import get_config, get_pomodoro_manager, update_and_save_config
 from ...translator import _, set_language
 from .breathing import BreathingSettings
 from .general import GeneralSettings
 
+logger = logging.getLogger(__name__)
+
 
 class ConfigDialog(QDialog):
     """用于番茄钟和呼吸设置的配置对话框。"""
 
     def __init__(self, parent: QWidget = mw):
         super().__init__(parent or mw)
+        self._opened_at = time.perf_counter()
+        # 从打开到第一次绘制完成的耗时（毫秒）
+        self.time_to_first_paint_ms: float | None = None
 
-        self.config = reload_config()
+        # 使用内存中的配置，无需重新读取、验证并回写配置文件
+        self.config = get_config()
         self.setWindowTitle(_("番茄钟/呼吸训练设置"))
         self._main_layout = QVBoxLayout(self)
 
+        # 选项卡在第一次切换到时才创建
+        self.general_settings: GeneralSettings | None = None
+        self.breathing_settings: BreathingSettings | None = None
+
         self.tabs = QTabWidget()
         self.general_tab = QWidget()
         self.breathing_tab = QWidget()
 
         self.tabs.addTab(self.general_tab, _("常规设置"))
         self.tabs.addTab(self.breathing_tab, _("呼吸训练"))
-
-        self.setup_general_tab()
-        self.setup_breathing_tab()
+        self.tabs.currentChanged.connect(self._ensure_tab)
+        self._ensure_tab(self.tabs.currentIndex())
 
         self._main_layout.addWidget(self.tabs)
 
@@ -51,16 +63,13 @@ class ConfigDialog(QDialog):
 
         self.setLayout(self._main_layout)
 
-        self._update_estimated_time()
-
-        # 连接信号以实时更新预计时间
-        for phase_ui in self.breathing_settings.phase_uis.values():
-            phase_ui.checkbox.toggled.connect(self._update_estimated_time)
-            phase_ui.spinbox.valueChanged.connect(self._update_estimated_time)
-        assert self.breathing_settings.cycles_spinbox is not None
-        self.breathing_settings.cycles_spinbox.valueChanged.connect(
-            self._update_estimated_time
-        )
+    def _ensure_tab(self, index: int):
+        """创建指定选项卡的内容（如果尚未创建）"""
+        tab = self.tabs.widget(index)
+        if tab is self.general_tab and self.general_settings is None:
+            self.setup_general_tab()
+        elif tab is self.breathing_tab and self.breathing_settings is None:
+            self.setup_breathing_tab()
 
     def setup_general_tab(self):
         """设置常规选项卡"""
@@ -74,53 +83,28 @@ class ConfigDialog(QDialog):
         self.breathing_settings = BreathingSettings(self.config)
         layout.addWidget(self.breathing_settings.create_ui(self))
 
-    def _update_estimated_time(self):
-        """计算并更新呼吸练习的预计时间标签。"""
-        if not hasattr(self.breathing_settings, "estimated_time_label") or not hasattr(
-            self.breathing_settings, "phase_uis"
+    @override
+    def event(self, a0: QEvent | None) -> bool:
+        result = super().event(a0)
+        if (
+            self.time_to_first_paint_ms is None
+            and a0 is not None
+            and a0.type() == QEvent.Type.Paint
         ):
-            return
-
-        try:
-            if self.breathing_settings.estimated_time_label is None:
-                return
-
-            breathing_values = self.breathing_settings.get_values()
-            target_cycles = breathing_values["breathing_cycles"]
-            single_cycle_duration = sum(
-                breathing_values.get(f"{key}_duration", 0)
-                for key in self.breathing_settings.phase_uis
-                if breathing_values.get(f"{key}_enabled", False)
-            )
-
-            if single_cycle_duration == 0 or target_cycles <= 0:
-                self.breathing_settings.estimated_time_label.setText(
-                    _("预计时间: --:-- (未启用或周期为0)")
-                )
-                return
-
-            total_seconds = single_cycle_duration * target_cycles
-            mins, secs = divmod(total_seconds, 60)
-            self.breathing_settings.estimated_time_label.setText(
-                _("预计时间: {mins:02d}:{secs:02d}").format(mins=mins, secs=secs)
-            )
-        except Exception as e:
-            tooltip(f"Error updating estimated time: {e}")
-            if self.breathing_settings.estimated_time_label:
-                self.breathing_settings.estimated_time_label.setText(
-                    _("预计时间: 计算错误")
-                )
+            self.time_to_first_paint_ms = (time.perf_counter() - self._opened_at) * 1000
+            logger.debug("设置窗口首次绘制: %.1f ms", self.time_to_first_paint_ms)
+        return result
 
     @override
     def accept(self):
         """当点击“保存”时，收集UI值，更新全局状态并保存到文件。"""
         try:
-            general_values = self.general_settings.get_values()
-            breathing_values = self.breathing_settings.get_values()
-
+            # 未打开过的选项卡沿用当前配置
             config_dict = dataclasses.asdict(self.config)
-            config_dict.update(general_values)
-            config_dict.update(breathing_values)
+            if self.general_settings is not None:
+                config_dict.update(self.general_settings.get_values())
+            if self.breathing_settings is not None:
+                config_dict.update(self.breathing_settings.get_values())
 
             app_config_fields = {field.name for field in dataclasses.fields(AppConfig)}
             filtered_config_dict = {
@@ -135,6 +119,8 @@ class ConfigDialog(QDialog):
 
             pomodoro_manager = get_pomodoro_manager()
             if pomodoro_manager:
+                pomodoro_manager.ui_updater.apply_config()
+                pomodoro_manager.on_timer_state_change()
                 pomodoro_manager.ui_updater.update(pomodoro_manager.timer_manager)
 
             super().accept()
@@ -6,17 +6,23 @@ from aqt import (
     QGridLayout,
     QGroupBox,
     QHBoxLayout,
+    QIcon,
     QLabel,
+    QPixmap,
+    QSize,
     QSpinBox,
+    Qt,
+    QUrl,
     QVBoxLayout,
     QWidget,
 )
 
-from ...config.enums import StatusBarFormat, TimerPosition
+from ...config.enums import CircularTimerStyle, StatusBarFormat, TimerPosition
 from ...config.languages import LanguageCode
 from ...config.types import AppConfig
 from ...translator import _
 from ..circularTimer.core.factory import list_timer_styles
+from ..circularTimer.core.thumbnails import StyleThumbnailLoader
 
 
 class GeneralSettings:
@@ -28,6 +34,12 @@ class GeneralSettings:
         self.work_across_decks_checkbox: QCheckBox | None = None
         self.show_timer_checkbox: QCheckBox | None = None
         self.circular_timer_style_combobox: QComboBox | None = None
+        self._thumbnail_loader: StyleThumbnailLoader | None = None
+        self.circular_timer_max_fps_spinbox: QSpinBox | None = None
+        self.circular_timer_smooth_checkbox: QCheckBox | None = None
+        self.show_tray_timer_checkbox: QCheckBox | None = None
+        self.show_reviewer_overlay_checkbox: QCheckBox | None = None
+        self.show_deck_browser_summary_checkbox: QCheckBox | None = None
         self.timer_position_combobox: QComboBox | None = None
         self.streak_spinbox: QSpinBox | None = None
         self.progress_display_threshold_spinbox: QSpinBox | None = None
@@ -77,15 +89,88 @@ class GeneralSettings:
         # 圆形计时器样式
         circular_style_label = QLabel(_("圆形计时器样式:"), parent)
         self.circular_timer_style_combobox = QComboBox(parent)
-        self.circular_timer_style_combobox.addItems(
-            [style.value for style in list_timer_styles()]
-        )
-        self.circular_timer_style_combobox.setCurrentText(
-            self.config.circular_timer_style
-        )
+        self.circular_timer_style_combobox.setIconSize(QSize(24, 24))
+        style_entries = list_timer_styles()
+        for style_entry in style_entries:
+            self.circular_timer_style_combobox.addItem(
+                style_entry.display_name, style_entry.style_id
+            )
+        # 缩略图在对话框显示后逐个加载
+        self._thumbnail_loader = StyleThumbnailLoader(parent)
+        self._thumbnail_loader.thumbnail_ready.connect(self._set_style_thumbnail)
+        self._thumbnail_loader.request(style_entries, parent.window())
+        configured_style = self.config.circular_timer_style
+        style_index = self.circular_timer_style_combobox.findData(configured_style)
+        missing_style = style_index < 0
+        if missing_style:
+            # 配置的样式已不存在（如第三方样式被删除），改用默认样式
+            print(f"警告: 计时器样式 '{configured_style}' 不存在，使用默认样式")
+            style_index = self.circular_timer_style_combobox.findData(
+                CircularTimerStyle.DEFAULT.value
+            )
+        self.circular_timer_style_combobox.setCurrentIndex(style_index)
         grid_layout.addWidget(circular_style_label, row, 0)
         grid_layout.addWidget(self.circular_timer_style_combobox, row, 1)
         row += 1
+        if missing_style:
+            missing_style_hint = QLabel(
+                _("所配置的样式 {style} 不存在，保存后将使用默认样式").format(
+                    style=configured_style
+                ),
+                parent,
+            )
+            missing_style_hint.setWordWrap(True)
+            missing_style_hint.setStyleSheet("font-style: italic; color: grey;")
+            grid_layout.addWidget(missing_style_hint, row, 0, 1, 2)
+            row += 1
+
+        # 圆形计时器动画帧率上限
+        max_fps_label = QLabel(_("动画帧率上限:"), parent)
+        self.circular_timer_max_fps_spinbox = QSpinBox(parent)
+        self.circular_timer_max_fps_spinbox.setMinimum(1)
+        self.circular_timer_max_fps_spinbox.setMaximum(60)
+        self.circular_timer_max_fps_spinbox.setValue(self.config.circular_timer_max_fps)
+        max_fps_unit_label = QLabel(_("帧/秒"), parent)
+        max_fps_layout = QHBoxLayout()
+        max_fps_layout.addWidget(self.circular_timer_max_fps_spinbox)
+        max_fps_layout.addWidget(max_fps_unit_label)
+        grid_layout.addWidget(max_fps_label, row, 0)
+        grid_layout.addLayout(max_fps_layout, row, 1)
+        row += 1
+
+        # 平滑进度弧
+        self.circular_timer_smooth_checkbox = QCheckBox(_("平滑显示进度"), parent)
+        self.circular_timer_smooth_checkbox.setChecked(
+            self.config.circular_timer_smooth
+        )
+        grid_layout.addWidget(self.circular_timer_smooth_checkbox, row, 0, 1, 2)
+        row += 1
+
+        # 系统托盘计时器
+        self.show_tray_timer_checkbox = QCheckBox(_("在系统托盘中显示计时器"), parent)
+        self.show_tray_timer_checkbox.setChecked(self.config.show_tray_timer)
+        grid_layout.addWidget(self.show_tray_timer_checkbox, row, 0, 1, 2)
+        row += 1
+
+        # 复习界面中的倒计时
+        self.show_reviewer_overlay_checkbox = QCheckBox(
+            _("在复习界面中显示倒计时"), parent
+        )
+        self.show_reviewer_overlay_checkbox.setChecked(
+            self.config.show_reviewer_overlay
+        )
+        grid_layout.addWidget(self.show_reviewer_overlay_checkbox, row, 0, 1, 2)
+        row += 1
+
+        # 牌组列表中的番茄钟摘要
+        self.show_deck_browser_summary_checkbox = QCheckBox(
+            _("在牌组列表中显示番茄钟摘要"), parent
+        )
+        self.show_deck_browser_summary_checkbox.setChecked(
+            self.config.show_deck_browser_summary
+        )
+        grid_layout.addWidget(self.show_deck_browser_summary_checkbox, row, 0, 1, 2)
+        row += 1
 
         # 计时器窗口位置
         position_label = QLabel(_("计时器窗口位置:"), parent)
@@ -222,6 +307,21 @@ class GeneralSettings:
         group.setLayout(main_layout)
         return group
 
+    def _set_style_thumbnail(self, style_id: str, pixmap: QPixmap, path: str):
+        """在下拉框中显示样式缩略图，悬停时显示大图（没有缓存文件时显示样式名称）"""
+        combobox = self.circular_timer_style_combobox
+        if combobox is None:
+            return
+        index = combobox.findData(style_id)
+        if index < 0:
+            return
+        combobox.setItemIcon(index, QIcon(pixmap))
+        if path:
+            tooltip = f'<img src="{QUrl.fromLocalFile(path).toString()}">'
+        else:
+            tooltip = combobox.itemText(index)
+        combobox.setItemData(index, tooltip, Qt.ItemDataRole.ToolTipRole)
+
     def get_values(self) -> dict[str, Any]:
         """从常规设置获取值"""
         assert self.language_combobox is not None
@@ -229,6 +329,11 @@ class GeneralSettings:
         assert self.enable_checkbox is not None
         assert self.show_timer_checkbox is not None
         assert self.circular_timer_style_combobox is not None
+        assert self.circular_timer_max_fps_spinbox is not None
+        assert self.circular_timer_smooth_checkbox is not None
+        assert self.show_tray_timer_checkbox is not None
+        assert self.show_reviewer_overlay_checkbox is not None
+        assert self.show_deck_browser_summary_checkbox is not None
         assert self.streak_spinbox is not None
         assert self.progress_display_threshold_spinbox is not None
         assert self.pomodoro_spinbox is not None
@@ -250,7 +355,14 @@ class GeneralSettings:
         return {
             "enabled": self.enable_checkbox.isChecked(),
             "show_circular_timer": self.show_timer_checkbox.isChecked(),
-            "circular_timer_style": self.circular_timer_style_combobox.currentText(),
+            "circular_timer_style": self.circular_timer_style_combobox.currentData(),
+            "circular_timer_max_fps": self.circular_timer_max_fps_spinbox.value(),
+            "circular_timer_smooth": self.circular_timer_smooth_checkbox.isChecked(),
+            "show_tray_timer": self.show_tray_timer_checkbox.isChecked(),
+            "show_reviewer_overlay": self.show_reviewer_overlay_checkbox.isChecked(),
+            "show_deck_browser_summary": (
+                self.show_deck_browser_summary_checkbox.isChecked()
+            ),
             "timer_position": position_key,
             "pomodoros_before_long_break": self.streak_spinbox.value(),
             "progress_display_threshold": self.progress_display_threshold_spinbox.value(),
@@ -0,0 +1,87 @@
+from html import escape
+
+from aqt.deckbrowser import DeckBrowser, DeckBrowserContent
+
+from ..config.constants import Defaults
+from ..pomodoro.streak import current_streak
+from ..state import get_app_state
+from ..translator import _
+
+_SUMMARY_CSS = """
+<style>
+.pomodoro-summary {
+  display: inline-flex;
+  gap: 1.5em;
+  margin: 1em auto 0;
+  padding: 0.5em 1em;
+  border-radius: 6px;
+  background: rgba(128, 128, 128, 0.1);
+  font-variant-numeric: tabular-nums;
+}
+.pomodoro-summary .pomodoro-summary-value {
+  font-weight: bold;
+}
+</style>
+"""
+
+# 上一次生成的 HTML 及其对应的计数器
+_cached_key: tuple[object, ...] | None = None
+_cached_html = ""
+
+
+def _render_summary(
+    focus_minutes: int, streak_days: int, completed: int, target: int, threshold: int
+) -> str:
+    """生成摘要的 HTML 片段"""
+    hours, mins = divmod(focus_minutes, 60)
+    completed_display = completed % target
+    progress = Defaults.StatusBar.FILLED_TOMATO * completed_display + (
+        Defaults.StatusBar.EMPTY_TOMATO * (target - completed_display)
+    )
+    if target > threshold:
+        progress = f"{completed_display}/{target}"
+
+    items = [
+        (_("今日专注"), _("{hours}小时{mins}分钟").format(hours=hours, mins=mins)),
+        (_("连续专注"), _("{days}天").format(days=streak_days)),
+        (_("距离长休息"), progress),
+    ]
+    cells = "".join(
+        f"<div>{escape(label)}: "
+        f'<span class="pomodoro-summary-value">{escape(value)}</span></div>'
+        for label, value in items
+    )
+    return f'{_SUMMARY_CSS}<div class="pomodoro-summary">{cells}</div>'
+
+
+def get_summary_html() -> str:
+    """
+    获取摘要 HTML。只读取内存中的配置，
+    仅在显示的计数器（或语言）改变时重新生成。
+    """
+    global _cached_key, _cached_html
+
+    config = get_app_state().config
+    counters = (
+        config.daily_pomodoro_seconds // 60,
+        current_streak(config),
+        config.completed_pomodoros,
+        max(1, config.pomodoros_before_long_break),
+        config.progress_display_threshold,
+    )
+    # 切换语言后需要重新翻译
+    key = (*counters, config.language)
+    if key != _cached_key:
+        _cached_html = _render_summary(*counters)
+        _cached_key = key
+    return _cached_html
+
+
+def on_deck_browser_will_render_content(
+    deck_browser: DeckBrowser, content: DeckBrowserContent
+) -> None:
+    """在牌组列表下方显示番茄钟摘要"""
+    config = get_app_state().config
+    if not config.enabled or not config.show_deck_browser_summary:
+        return
+    content.stats += get_summary_html()
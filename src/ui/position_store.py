@@ -0,0 +1,122 @@
+import time
+from collections import OrderedDict
+
+from aqt import QObject, QPoint, QTimer
+
+from ..state import get_app_state
+
+# 紧凑格式中各字段的位置: [x, y, 宽, 高, DPI_X, DPI_Y, 最近使用时间]
+_X, _Y, _WIDTH, _HEIGHT, _DPI_X, _DPI_Y, _LAST_USED = range(7)
+ENTRY_LENGTH = 7
+
+
+def make_entry(
+    pos: QPoint,
+    resolution: tuple[int, int],
+    logical_dpi: tuple[float, float],
+    last_used: int = 0,
+) -> list[int]:
+    """生成一条紧凑格式的位置记录"""
+    return [
+        pos.x(),
+        pos.y(),
+        resolution[0],
+        resolution[1],
+        round(logical_dpi[0]),
+        round(logical_dpi[1]),
+        last_used,
+    ]
+
+
+class TimerPositionStore(QObject):
+    """
+    计时器窗口在各屏幕上的保存位置。
+
+    拖动窗口时只更新内存，短时间内的多次修改合并为一次配置写入；
+    记录数超过上限时淘汰最久未使用的屏幕。
+    """
+
+    MAX_ENTRIES = 16
+    SAVE_DELAY_MS = 1500
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        saved = get_app_state().config.saved_timer_positions
+        # 按最近使用时间排序，最久未使用的在最前面
+        self._entries: OrderedDict[str, list[int]] = OrderedDict(
+            sorted(
+                (
+                    (identifier, list(entry))
+                    for identifier, entry in saved.items()
+                    if len(entry) == ENTRY_LENGTH
+                ),
+                key=lambda item: item[1][_LAST_USED],
+            )
+        )
+        self._evict()
+
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(self.SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self.flush)
+
+    def get(
+        self,
+        identifier: str,
+        resolution: tuple[int, int],
+        logical_dpi: tuple[float, float],
+    ) -> QPoint | None:
+        """获取屏幕上保存的位置，分辨率或 DPI 不一致时返回 None"""
+        entry = self._entries.get(identifier)
+        if entry is None:
+            return None
+        if (entry[_WIDTH], entry[_HEIGHT]) != resolution or (
+            entry[_DPI_X],
+            entry[_DPI_Y],
+        ) != (round(logical_dpi[0]), round(logical_dpi[1])):
+            return None
+
+        # 只更新内存中的使用时间，随下一次写入一起保存
+        entry[_LAST_USED] = int(time.time())
+        self._entries.move_to_end(identifier)
+        return QPoint(entry[_X], entry[_Y])
+
+    def put(
+        self,
+        identifier: str,
+        pos: QPoint,
+        resolution: tuple[int, int],
+        logical_dpi: tuple[float, float],
+    ) -> None:
+        """记录屏幕上的窗口位置，并安排一次延迟写入"""
+        self._entries[identifier] = make_entry(
+            pos, resolution, logical_dpi, int(time.time())
+        )
+        self._entries.move_to_end(identifier)
+        self._evict()
+        # 重新计时，连续拖动时只在停止后写入一次
+        self._save_timer.start()
+
+    def flush(self) -> None:
+        """立即写入尚未保存的修改"""
+        if not self._save_timer.isActive() and self._is_saved():
+            return
+        self._save_timer.stop()
+        get_app_state().update_config_value(
+            "saved_timer_positions",
+            {identifier: list(entry) for identifier, entry in self._entries.items()},
+        )
+
+    def _is_saved(self) -> bool:
+        saved = get_app_state().config.saved_timer_positions
+        return saved.keys() == self._entries.keys() and all(
+            list(saved[identifier]) == entry
+            for identifier, entry in self._entries.items()
+        )
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.MAX_ENTRIES:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
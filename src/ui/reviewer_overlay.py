@@ -0,0 +1,175 @@
+import json
+from typing import Any
+
+from aqt import mw
+from aqt.reviewer import Reviewer
+from aqt.webview import WebContent
+
+from ..config.constants import AnkiStates
+from ..pomodoro.timer_manager import TimerManager, TimerState
+from ..state import get_app_state, get_pomodoro_manager
+from ..translator import _
+
+OVERLAY_ID = "pomodoro-overlay"
+
+_OVERLAY_CSS = """
+#pomodoro-overlay {
+  position: fixed;
+  top: 8px;
+  right: 8px;
+  z-index: 1000;
+  min-width: 72px;
+  padding: 4px 8px 6px;
+  border-radius: 6px;
+  font: 600 13px/1.2 sans-serif;
+  font-variant-numeric: tabular-nums;
+  text-align: center;
+  color: #282828;
+  background: rgba(240, 240, 240, 0.85);
+  pointer-events: none;
+}
+.nightMode #pomodoro-overlay {
+  color: #f0f0f0;
+  background: rgba(50, 50, 60, 0.85);
+}
+#pomodoro-overlay[hidden] {
+  display: none;
+}
+#pomodoro-overlay .pomodoro-overlay-track {
+  height: 3px;
+  margin-top: 4px;
+  border-radius: 2px;
+  overflow: hidden;
+  background: rgba(128, 128, 128, 0.3);
+}
+#pomodoro-overlay .pomodoro-overlay-bar {
+  height: 100%;
+  transform-origin: left;
+  background: #2d9cdb;
+}
+#pomodoro-overlay[data-kind="long_break"] .pomodoro-overlay-bar {
+  background: #2ea05a;
+}
+#pomodoro-overlay[data-kind="max_break"] .pomodoro-overlay-bar {
+  background: #e67e22;
+}
+"""
+
+# 倒计时完全在页面中运行: 进度条由 CSS 过渡驱动，文本只在整秒边界更新。
+# Python 只在计时器状态改变时调用 pomodoroOverlay.set()。
+_OVERLAY_JS = """
+window.pomodoroOverlay = (function () {
+  let timeout = null;
+
+  function format(ms) {
+    const total = Math.ceil(ms / 1000);
+    const mins = String(Math.floor(total / 60)).padStart(2, "0");
+    const secs = String(total % 60).padStart(2, "0");
+    return mins + ":" + secs;
+  }
+
+  function set(state) {
+    const root = document.getElementById("pomodoro-overlay");
+    if (!root) {
+      return;
+    }
+    clearTimeout(timeout);
+    if (!state.active) {
+      root.hidden = true;
+      return;
+    }
+
+    root.hidden = false;
+    root.dataset.kind = state.kind;
+    root.querySelector(".pomodoro-overlay-label").textContent = state.label;
+
+    const deadline = performance.now() + state.remaining_ms;
+    const bar = root.querySelector(".pomodoro-overlay-bar");
+    const fraction = state.total_ms > 0 ? state.remaining_ms / state.total_ms : 0;
+    bar.style.transition = "none";
+    bar.style.transform = "scaleX(" + fraction + ")";
+    bar.getBoundingClientRect();
+    bar.style.transition = "transform " + state.remaining_ms + "ms linear";
+    bar.style.transform = "scaleX(0)";
+
+    const text = root.querySelector(".pomodoro-overlay-time");
+    function tick() {
+      const left = Math.max(0, deadline - performance.now());
+      text.textContent = format(left);
+      if (left > 0) {
+        timeout = setTimeout(tick, left % 1000 || 1000);
+      }
+    }
+    tick();
+  }
+
+  return { set: set };
+})();
+"""
+
+_OVERLAY_HTML = f"""
+<div id="{OVERLAY_ID}" hidden>
+  <div class="pomodoro-overlay-label"></div>
+  <div class="pomodoro-overlay-time"></div>
+  <div class="pomodoro-overlay-track"><div class="pomodoro-overlay-bar"></div></div>
+</div>
+"""
+
+# 计时器状态 → (页面中的类型, 标签)
+_STATE_KINDS: dict[TimerState, tuple[str, str]] = {
+    TimerState.WORKING: ("working", _("专注")),
+    TimerState.LONG_BREAK: ("long_break", _("休息")),
+    TimerState.MAX_BREAK_COUNTDOWN: ("max_break", _("休息上限")),
+}
+
+
+def overlay_state(timer_manager: TimerManager | None) -> dict[str, Any]:
+    """生成传给页面的计时器状态"""
+    config = get_app_state().config
+    if (
+        timer_manager is None
+        or not config.enabled
+        or not config.show_reviewer_overlay
+        or timer_manager.state not in _STATE_KINDS
+    ):
+        return {"active": False}
+
+    kind, label = _STATE_KINDS[timer_manager.state]
+    return {
+        "active": True,
+        "kind": kind,
+        "label": label,
+        "remaining_ms": timer_manager.remaining_seconds * 1000,
+        "total_ms": timer_manager.total_seconds * 1000,
+    }
+
+
+def _set_state_js(state: dict[str, Any]) -> str:
+    return f"window.pomodoroOverlay && pomodoroOverlay.set({json.dumps(state)});"
+
+
+def on_webview_will_set_content(web_content: WebContent, context: object | None):
+    """复习界面加载时注入倒计时元素，并带上当前的计时器状态"""
+    if not isinstance(context, Reviewer):
+        return
+    if not get_app_state().config.show_reviewer_overlay:
+        return
+
+    pomodoro_manager = get_pomodoro_manager()
+    timer_manager = pomodoro_manager.timer_manager if pomodoro_manager else None
+
+    web_content.head += f"<style>{_OVERLAY_CSS}</style>"
+    web_content.body += (
+        f"{_OVERLAY_HTML}<script>{_OVERLAY_JS}"
+        f"{_set_state_js(overlay_state(timer_manager))}</script>"
+    )
+
+
+def sync_reviewer_overlay(timer_manager: TimerManager | None) -> None:
+    """
+    将计时器状态推送到复习界面。
+    只应在状态改变时调用（开始、停止、结束），页面会自行倒计时。
+    """
+    if mw is None or mw.state != AnkiStates.REVIEW or mw.reviewer.web is None:
+        return
+    mw.reviewer.web.eval(_set_state_js(overlay_state(timer_manager)))
@@ -0,0 +1,134 @@
+from dataclasses import dataclass
+
+from aqt import QApplication, QObject, QPoint, QRect, QScreen, pyqtSignal
+
+from .position_store import TimerPositionStore
+from .utils import get_screen_identifier
+
+
+@dataclass(frozen=True)
+class ScreenInfo:
+    """已连接屏幕的几何信息快照"""
+
+    identifier: str
+    screen: QScreen
+    available_geometry: QRect
+    resolution: tuple[int, int]
+    logical_dpi: tuple[float, float]
+
+
+class ScreenIndex(QObject):
+    """
+    已连接屏幕的内存索引（标识符 → 几何信息、DPI），以及各屏幕上保存的窗口位置。
+    只在屏幕增删或几何变化时更新，窗口定位时直接查表。
+    """
+
+    screens_changed = pyqtSignal()
+
+    def __init__(self, app: QApplication):
+        super().__init__(app)
+        self._by_identifier: dict[str, ScreenInfo] = {}
+        self._by_screen: dict[QScreen, ScreenInfo] = {}
+        self.positions = TimerPositionStore(self)
+
+        for screen in app.screens():
+            self._watch_screen(screen)
+        self._rebuild()
+
+        app.screenAdded.connect(self._on_screen_added)
+        app.screenRemoved.connect(self._on_screen_removed)
+
+    def _watch_screen(self, screen: QScreen) -> None:
+        screen.geometryChanged.connect(self._on_geometry_changed)
+        screen.availableGeometryChanged.connect(self._on_geometry_changed)
+        screen.logicalDotsPerInchChanged.connect(self._on_geometry_changed)
+
+    def _rebuild(self, removed: QScreen | None = None) -> None:
+        """重新生成索引"""
+        app = QApplication.instance()
+        screens = app.screens() if isinstance(app, QApplication) else []
+
+        self._by_identifier.clear()
+        self._by_screen.clear()
+        for screen in screens:
+            # screenRemoved 发出时被移除的屏幕可能仍在列表中
+            if screen is removed:
+                continue
+            size = screen.size()
+            info = ScreenInfo(
+                identifier=get_screen_identifier(screen),
+                screen=screen,
+                available_geometry=screen.availableGeometry(),
+                resolution=(size.width(), size.height()),
+                logical_dpi=(
+                    screen.logicalDotsPerInchX(),
+                    screen.logicalDotsPerInchY(),
+                ),
+            )
+            self._by_identifier[info.identifier] = info
+            self._by_screen[screen] = info
+
+    def _on_screen_added(self, screen: QScreen) -> None:
+        self._watch_screen(screen)
+        self._rebuild()
+        self.screens_changed.emit()
+
+    def _on_screen_removed(self, screen: QScreen) -> None:
+        self._rebuild(removed=screen)
+        self.screens_changed.emit()
+
+    def _on_geometry_changed(self, *_args: object) -> None:
+        self._rebuild()
+        self.screens_changed.emit()
+
+    # --- 查询 ---
+
+    def info_for(self, screen: QScreen | None) -> ScreenInfo | None:
+        """获取指定屏幕的信息，screen 为 None 时返回主屏幕"""
+        if screen is not None and screen in self._by_screen:
+            return self._by_screen[screen]
+        primary = QApplication.primaryScreen()
+        if primary is not None:
+            return self._by_screen.get(primary)
+        return None
+
+    def info_at(self, point: QPoint) -> ScreenInfo | None:
+        """获取包含指定全局坐标的屏幕"""
+        for info in self._by_identifier.values():
+            if info.available_geometry.contains(point):
+                return info
+        return None
+
+    def contains(self, rect: QRect) -> bool:
+        """矩形是否完整地位于某个屏幕的可用区域内"""
+        return any(
+            info.available_geometry.contains(rect)
+            for info in self._by_identifier.values()
+        )
+
+    def anchor_for(self, info: ScreenInfo) -> QPoint | None:
+        """获取该屏幕上保存的窗口位置（分辨率和 DPI 需一致）"""
+        return self.positions.get(info.identifier, info.resolution, info.logical_dpi)
+
+    def remember_anchor(self, info: ScreenInfo, pos: QPoint) -> None:
+        """记录该屏幕上的窗口位置，稍后合并写入配置"""
+        self.positions.put(info.identifier, pos, info.resolution, info.logical_dpi)
+
+
+_screen_index_instance: ScreenIndex | None = None
+
+
+def flush_saved_positions() -> None:
+    """写入尚未保存的窗口位置（索引未创建时不做任何事）"""
+    if _screen_index_instance is not None:
+        _screen_index_instance.positions.flush()
+
+
+def get_screen_index() -> ScreenIndex:
+    """获取屏幕索引的单例实例（在首次使用时创建）"""
+    global _screen_index_instance
+    if _screen_index_instance is None:
+        app = QApplication.instance()
+        assert isinstance(app, QApplication)
+        _screen_index_instance = ScreenIndex(app)
+    return _screen_index_instance
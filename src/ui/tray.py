@@ -0,0 +1,174 @@
+import math
+
+from aqt import (
+    QBrush,
+    QColor,
+    QIcon,
+    QPainter,
+    QPen,
+    QPixmap,
+    QRectF,
+    QSystemTrayIcon,
+    Qt,
+    mw,
+    theme,
+)
+
+from ..pomodoro.timer_manager import TimerState
+from ..translator import _
+from .circularTimer.constants import (
+    BG_COLOR_END_DARK,
+    BG_COLOR_END_LIGHT,
+    PROGRESS_COLOR_START_DARK,
+    PROGRESS_COLOR_START_LIGHT,
+)
+
+# 每种状态预渲染的进度图标数量
+ICON_STEPS = 60
+# 图标的像素尺寸，由系统托盘缩放到实际大小
+ICON_SIZE = 64
+
+# 各状态的进度颜色: {state: (浅色主题, 深色主题)}
+STATE_COLORS: dict[TimerState, tuple[QColor, QColor]] = {
+    TimerState.WORKING: (PROGRESS_COLOR_START_LIGHT, PROGRESS_COLOR_START_DARK),
+    TimerState.LONG_BREAK: (QColor(46, 160, 90), QColor(80, 200, 120)),
+    TimerState.MAX_BREAK_COUNTDOWN: (QColor(230, 126, 34), QColor(245, 160, 60)),
+}
+
+
+def render_progress_icon(color: QColor, dark: bool, step: int) -> QPixmap:
+    """绘制一个进度环图标，step 为 0 到 ICON_STEPS 之间的量化进度"""
+    pixmap = QPixmap(ICON_SIZE, ICON_SIZE)
+    pixmap.fill(Qt.GlobalColor.transparent)
+
+    pen_width = ICON_SIZE / 8
+    rect = QRectF(0, 0, ICON_SIZE, ICON_SIZE).adjusted(
+        pen_width / 2, pen_width / 2, -pen_width / 2, -pen_width / 2
+    )
+
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+    # 背景和轨道
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.setBrush(QBrush(BG_COLOR_END_DARK if dark else BG_COLOR_END_LIGHT))
+    painter.drawEllipse(rect)
+    track_color = QColor(color)
+    track_color.setAlpha(70)
+    painter.setBrush(Qt.BrushStyle.NoBrush)
+    painter.setPen(QPen(track_color, pen_width))
+    painter.drawArc(rect, 0, 360 * 16)
+
+    # 进度弧
+    if step > 0:
+        painter.setPen(QPen(color, pen_width, cap=Qt.PenCapStyle.FlatCap))
+        span_angle = -round(step / ICON_STEPS * 360 * 16)
+        painter.drawArc(rect, 90 * 16, span_angle)
+
+    painter.end()
+    return pixmap
+
+
+class TrayIconAtlas:
+    """
+    预渲染的托盘图标集: 每个主题、每种运行状态各 ICON_STEPS + 1 个进度图标。
+    每个主题只在第一次使用时渲染一次。
+    """
+
+    def __init__(self):
+        self._icons: dict[tuple[bool, TimerState | None, int], QIcon] = {}
+        self._rendered_themes: set[bool] = set()
+
+    def _render_theme(self, dark: bool) -> None:
+        for state, colors in STATE_COLORS.items():
+            color = colors[1] if dark else colors[0]
+            for step in range(ICON_STEPS + 1):
+                self._icons[(dark, state, step)] = QIcon(
+                    render_progress_icon(color, dark, step)
+                )
+        # 空闲状态: 只有轨道
+        idle_colors = STATE_COLORS[TimerState.WORKING]
+        self._icons[(dark, None, 0)] = QIcon(
+            render_progress_icon(idle_colors[1] if dark else idle_colors[0], dark, 0)
+        )
+        self._rendered_themes.add(dark)
+
+    def icon(self, dark: bool, state: TimerState | None, step: int) -> QIcon:
+        if dark not in self._rendered_themes:
+            self._render_theme(dark)
+        return self._icons[(dark, state, step)]
+
+
+# 图标集在计时器重建时复用
+_atlas = TrayIconAtlas()
+
+
+def quantize_progress(remaining: int, total: int) -> int:
+    """
+    将剩余进度量化为 0 到 ICON_STEPS 之间的步数。
+    向上取整，剩余时间不为 0 时不会显示空环。
+    """
+    if total <= 0 or remaining <= 0:
+        return 0
+    return min(ICON_STEPS, math.ceil(remaining / total * ICON_STEPS))
+
+
+class TrayTimer:
+    """
+    在系统托盘中显示番茄钟进度。
+    只有量化后的进度步数变化时才更换图标，精确的剩余时间放在提示文字中。
+    """
+
+    def __init__(self):
+        self._icon_key: tuple[bool, TimerState | None, int] | None = None
+        self._tooltip = ""
+
+        self._tray = QSystemTrayIcon(mw)
+        self._tray.activated.connect(self._on_activated)
+
+    @staticmethod
+    def is_available() -> bool:
+        return QSystemTrayIcon.isSystemTrayAvailable()
+
+    def update(self, state: TimerState, remaining: int, total: int, text: str):
+        """
+        根据计时器状态更新托盘。
+
+        Args:
+            state: 计时器状态
+            remaining: 剩余秒数
+            total: 总秒数
+            text: 提示文字（与状态栏文本相同）
+        """
+        dark = theme.theme_manager.night_mode
+        if state in STATE_COLORS:
+            icon_key = (dark, state, quantize_progress(remaining, total))
+        else:
+            icon_key = (dark, None, 0)
+
+        if icon_key != self._icon_key:
+            self._tray.setIcon(_atlas.icon(*icon_key))
+            self._icon_key = icon_key
+
+        tooltip = f"{_('番茄钟')}\n{text}"
+        if tooltip != self._tooltip:
+            self._tray.setToolTip(tooltip)
+            self._tooltip = tooltip
+
+        if not self._tray.isVisible():
+            self._tray.show()
+
+    def _on_activated(self, reason: QSystemTrayIcon.ActivationReason) -> None:
+        if reason == QSystemTrayIcon.ActivationReason.Trigger and mw:
+            if mw.isMinimized():
+                mw.showNormal()
+            mw.show()
+            mw.raise_()
+            mw.activateWindow()
+
+    def close(self) -> None:
+        """隐藏并释放托盘图标，之后不能再使用此实例"""
+        self._tray.hide()
+        self._tray.deleteLater()
+        self._icon_key = None
+        self._tooltip = ""
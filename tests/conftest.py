@@ -0,0 +1,34 @@
+import sys
+import types
+from pathlib import Path
+
+import pytest
+from aqt import QApplication
+
+# 插件入口 __init__.py 需要运行中的 Anki，测试时把 src 作为一个空的包导入
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+PACKAGE_NAME = "pomodoro_addon"
+if PACKAGE_NAME not in sys.modules:
+    package = types.ModuleType(PACKAGE_NAME)
+    package.__path__ = [str(SRC_DIR)]
+    sys.modules[PACKAGE_NAME] = package
+
+
+@pytest.fixture(scope="session")
+def qapp() -> QApplication:
+    app = QApplication.instance()
+    if not isinstance(app, QApplication):
+        app = QApplication([])
+    return app
+
+
+@pytest.fixture
+def app_config(tmp_path, monkeypatch):
+    """使用临时目录中的默认配置，不读写插件目录下的 user_files"""
+    from pomodoro_addon.config import config
+    from pomodoro_addon.state import get_app_state
+
+    monkeypatch.setattr(
+        config, "_get_config_file_path", lambda: tmp_path / "config.json"
+    )
+    return get_app_state().reload_config()
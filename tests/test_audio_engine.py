@@ -0,0 +1,40 @@
+from aqt import QEventLoop, QTimer
+from pomodoro_addon.audio.engine import AudioEngine
+from pomodoro_addon.audio.pcm import PcmBuffer
+from PyQt6.QtMultimedia import QAudioFormat, QMediaDevices
+
+
+def _silence(audio_format: QAudioFormat, seconds: float) -> PcmBuffer:
+    frames = round(audio_format.sampleRate() * seconds)
+    return PcmBuffer(
+        data=bytes(frames * audio_format.bytesPerFrame()),
+        sample_rate=audio_format.sampleRate(),
+        channels=audio_format.channelCount(),
+        sample_format=audio_format.sampleFormat(),
+    )
+
+
+def _process_deferred_deletes() -> None:
+    """deleteLater() 的对象在事件循环中才会真正删除"""
+    loop = QEventLoop()
+    QTimer.singleShot(0, loop.quit)
+    loop.exec()
+
+
+def test_held_voice_survives_device_change(qapp):
+    """切换输出设备后，训练中持有的提示音声部仍然可以停止和再次使用"""
+    engine = AudioEngine()
+    try:
+        pcm = _silence(engine.audio_format, 0.5)
+        voice = engine.play_buffer(pcm)
+
+        engine.set_output_device(QMediaDevices.defaultAudioOutput())
+        _process_deferred_deletes()
+
+        voice.stop()
+        assert not voice.is_active
+        pcm = _silence(engine.audio_format, 0.5)
+        assert engine.play_buffer(pcm) is voice
+        voice.stop()
+    finally:
+        engine.shutdown()
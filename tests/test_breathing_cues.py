@@ -0,0 +1,42 @@
+import time
+
+import pytest
+from pomodoro_addon.audio.engine import AudioEngine, Voice
+from pomodoro_addon.breathing_easing import phase_envelope
+from pomodoro_addon.config.enums import BreathingEasing, BreathingPhase
+
+pytest.importorskip("numpy")
+
+DURATION = 4.0
+
+
+@pytest.mark.parametrize("phase", [BreathingPhase.INHALE, BreathingPhase.EXHALE])
+@pytest.mark.parametrize("easing", list(BreathingEasing))
+def test_synth_cue_follows_envelope(qapp, easing, phase):
+    """合成的提示音在整个阶段内按动画的幅度曲线调整音量"""
+    engine = AudioEngine()
+    try:
+        pcm = engine.synthesized_cue(phase, DURATION, easing)
+        assert pcm is not None
+        envelope = phase_envelope(phase, easing)
+        started_at = time.monotonic()
+        voice = engine.play_buffer(pcm, envelope, started_at, DURATION)
+
+        for fraction in (0.0, 0.25, 0.5, 0.75, 1.0):
+            voice.apply_envelope(started_at + fraction * DURATION)
+            expected = Voice.MIN_ENVELOPE_VOLUME + (
+                1.0 - Voice.MIN_ENVELOPE_VOLUME
+            ) * envelope.at(fraction)
+            assert voice.volume == pytest.approx(expected)
+
+        # 吸气由弱到强，呼气由强到弱
+        volumes = [Voice.MIN_ENVELOPE_VOLUME, 1.0]
+        if phase == BreathingPhase.EXHALE:
+            volumes.reverse()
+        voice.apply_envelope(started_at)
+        assert voice.volume == pytest.approx(volumes[0])
+        voice.apply_envelope(started_at + DURATION)
+        assert voice.volume == pytest.approx(volumes[1])
+        voice.stop()
+    finally:
+        engine.shutdown()
@@ -0,0 +1,255 @@
+"""
+圆形计时器样式的离屏渲染基准测试与金样图回归测试。
+
+在 QT_QPA_PLATFORM=offscreen 下把 TIMER_STYLES 中注册的每种样式按不同的尺寸、
+设备像素比、主题和进度渲染到 QImage 中，统计每帧绘制耗时的百分位数，
+并可与金样图（golden image）按容差进行比较，用于验证渲染优化没有改变输出。
+
+需要安装开发依赖（aqt、koda-validate），在项目根目录运行：
+
+    python tools/timer_bench.py                    # 基准测试并与金样图比较
+    python tools/timer_bench.py --update-golden    # 重新生成金样图
+"""
+
+import argparse
+import logging
+import os
+import statistics
+import sys
+import time
+import types
+from dataclasses import dataclass
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+ADDON_DIR = ROOT_DIR / "src"
+ADDON_PACKAGE = "src"
+DEFAULT_GOLDEN_DIR = ROOT_DIR / "tools" / "golden"
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+
+def load_addon_package() -> None:
+    """
+    注册插件包但不执行其 __init__.py。
+    插件入口依赖运行中的 Anki 主窗口，这里只需要计时器样式模块。
+    """
+    if ADDON_PACKAGE in sys.modules:
+        return
+    package = types.ModuleType(ADDON_PACKAGE)
+    package.__path__ = [str(ADDON_DIR)]
+    sys.modules[ADDON_PACKAGE] = package
+
+
+@dataclass(frozen=True)
+class RenderCase:
+    """一次渲染的参数组合"""
+
+    style: str
+    size: int
+    dpr: float
+    dark: bool
+    progress: float
+
+    @property
+    def name(self) -> str:
+        theme_name = "dark" if self.dark else "light"
+        return (
+            f"{self.style}-{theme_name}-{self.size}px"
+            f"@{self.dpr:g}x-p{round(self.progress * 100):03d}"
+        )
+
+
+@dataclass
+class CaseResult:
+    case: RenderCase
+    frame_ms: list[float]
+    golden_status: str = "-"
+
+    def percentile(self, pct: float) -> float:
+        ordered = sorted(self.frame_ms)
+        index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+def compare_images(actual, expected, tolerance: int) -> tuple[int, int]:
+    """
+    逐像素比较两张图像。
+
+    Returns:
+        (差异超过容差的像素数, 像素总数)
+    """
+    from aqt import QImage
+
+    if actual.size() != expected.size():
+        total = max(actual.width() * actual.height(), 1)
+        return total, total
+
+    fmt = QImage.Format.Format_ARGB32_Premultiplied
+    a = actual.convertToFormat(fmt)
+    b = expected.convertToFormat(fmt)
+    a_bytes = bytes(a.constBits().asarray(a.sizeInBytes()))
+    b_bytes = bytes(b.constBits().asarray(b.sizeInBytes()))
+    total = a.width() * a.height()
+    if a_bytes == b_bytes:
+        return 0, total
+
+    differing = 0
+    for i in range(0, len(a_bytes), 4):
+        if (
+            abs(a_bytes[i] - b_bytes[i]) > tolerance
+            or abs(a_bytes[i + 1] - b_bytes[i + 1]) > tolerance
+            or abs(a_bytes[i + 2] - b_bytes[i + 2]) > tolerance
+            or abs(a_bytes[i + 3] - b_bytes[i + 3]) > tolerance
+        ):
+            differing += 1
+    return differing, total
+
+
+def render_case(case: RenderCase, frames: int) -> tuple[list[float], object]:
+    """渲染一个参数组合，返回每帧耗时（毫秒）和最后一帧图像"""
+    from aqt import QImage, Qt, theme
+
+    from src.ui.circularTimer import get_timer_class
+
+    theme.theme_manager.night_mode = case.dark
+    timer_class = get_timer_class(case.style)
+    widget = timer_class(None)
+    # 固定动画时钟，保证动画样式的输出可复现
+    widget.animation_time = lambda: 0.0  # type: ignore[method-assign]
+    widget.update_theme_colors()
+    widget.resize(case.size, case.size)
+    total = 1500
+    widget.set_progress(round(total * case.progress), total)
+
+    pixels = round(case.size * case.dpr)
+    image = QImage(pixels, pixels, QImage.Format.Format_ARGB32_Premultiplied)
+    image.setDevicePixelRatio(case.dpr)
+
+    frame_ms: list[float] = []
+    # 预热一帧，使缓存（字形图集等）就绪
+    for i in range(frames + 1):
+        image.fill(Qt.GlobalColor.transparent)
+        start = time.perf_counter()
+        widget.render(image)
+        if i > 0:
+            frame_ms.append((time.perf_counter() - start) * 1000)
+
+    widget.deleteLater()
+    return frame_ms, image
+
+
+def parse_list(value: str, cast):
+    return [cast(v) for v in value.split(",") if v.strip()]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="圆形计时器样式的离屏渲染基准测试与金样图比较。"
+    )
+    parser.add_argument("--frames", type=int, default=100, help="每个组合渲染的帧数")
+    parser.add_argument("--sizes", default="150,300,600", help="控件尺寸（像素）")
+    parser.add_argument("--dprs", default="1,2", help="设备像素比")
+    parser.add_argument("--themes", default="light,dark", help="主题")
+    parser.add_argument("--progress", default="0,0.5,1", help="进度值（0-1）")
+    parser.add_argument("--styles", default="", help="只测试指定样式，默认全部")
+    parser.add_argument(
+        "--golden-dir", type=Path, default=DEFAULT_GOLDEN_DIR, help="金样图目录"
+    )
+    parser.add_argument(
+        "--update-golden", action="store_true", help="用当前输出覆盖金样图"
+    )
+    parser.add_argument(
+        "--tolerance", type=int, default=8, help="单个颜色通道允许的最大差值"
+    )
+    parser.add_argument(
+        "--max-diff-ratio",
+        type=float,
+        default=0.002,
+        help="允许超出容差的像素比例",
+    )
+    args = parser.parse_args()
+
+    from aqt import QApplication
+
+    _app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    load_addon_package()
+    from src.ui.circularTimer import TIMER_STYLES
+
+    styles = parse_list(args.styles, str) or list(TIMER_STYLES)
+    themes = parse_list(args.themes, str)
+    cases = [
+        RenderCase(style, size, dpr, theme_name == "dark", progress)
+        for style in styles
+        for theme_name in themes
+        for size in parse_list(args.sizes, int)
+        for dpr in parse_list(args.dprs, float)
+        for progress in parse_list(args.progress, float)
+    ]
+
+    if args.update_golden:
+        args.golden_dir.mkdir(parents=True, exist_ok=True)
+
+    results: list[CaseResult] = []
+    failures = 0
+    for case in cases:
+        frame_ms, image = render_case(case, max(1, args.frames))
+        result = CaseResult(case, frame_ms)
+        golden_path = args.golden_dir / f"{case.name}.png"
+
+        if args.update_golden:
+            image.save(str(golden_path))
+            result.golden_status = "updated"
+        elif golden_path.exists():
+            from aqt import QImage
+
+            differing, total = compare_images(
+                image, QImage(str(golden_path)), args.tolerance
+            )
+            ratio = differing / total
+            if ratio > args.max_diff_ratio:
+                failures += 1
+                result.golden_status = f"FAIL ({ratio:.2%})"
+                image.save(str(golden_path.with_suffix(".actual.png")))
+            else:
+                result.golden_status = "ok" if differing == 0 else f"ok ({ratio:.2%})"
+        else:
+            result.golden_status = "missing"
+
+        results.append(result)
+
+    header = f"{'case':<36} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}  golden"
+    logging.info(header)
+    logging.info("-" * len(header))
+    for result in results:
+        logging.info(
+            f"{result.case.name:<36} "
+            f"{result.percentile(50):>8.3f} {result.percentile(90):>8.3f} "
+            f"{result.percentile(99):>8.3f} {max(result.frame_ms):>8.3f}  "
+            f"{result.golden_status}"
+        )
+
+    for style in styles:
+        style_frames = [
+            ms
+            for result in results
+            if result.case.style == style
+            for ms in result.frame_ms
+        ]
+        if style_frames:
+            logging.info(
+                f"{style}: 中位数 {statistics.median(style_frames):.3f} ms/帧，"
+                f"共 {len(style_frames)} 帧"
+            )
+
+    if failures:
+        logging.error(f"{failures} 个组合与金样图不一致（差异图已保存为 *.actual.png）")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())